@@ -0,0 +1,9 @@
+"""
+URL configuration of IMDB.settings_api: the API without the admin.
+"""
+from django.urls import path, include
+
+urlpatterns = [
+    path('', include('watchlist.urls')),
+    path('async/', include('watchlist.async_urls')),
+]
@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/4.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -42,6 +43,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'watchlist.middleware.PerformanceMiddleware',
+    'watchlist.middleware.ReplicaRoutingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -72,16 +75,102 @@ TEMPLATES = [
 WSGI_APPLICATION = 'IMDB.wsgi.application'
 
 
+# Django REST framework
+# https://www.django-rest-framework.org/api-guide/settings/
+
+REST_FRAMEWORK = {
+    'DEFAULT_RENDERER_CLASSES': [
+        # Uses orjson when installed, the stdlib encoder otherwise.
+        'watchlist.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    # Cost units per client and endpoint; see watchlist.throttling.CostRateThrottle.
+    # Counters live in the WATCHLIST_CACHE_ALIAS cache, which must be shared
+    # (Redis, Memcached) for limits to hold across worker processes. An empty
+    # rate disables throttling for that scope. A request costing more than a
+    # whole window, e.g. a bulk write of over 1200 items at 120/min, gets 413.
+    'DEFAULT_THROTTLE_CLASSES': [
+        'watchlist.throttling.CostRateThrottle',
+    ],
+    'DEFAULT_THROTTLE_RATES': {
+        'read': os.environ.get('WATCHLIST_THROTTLE_READ_RATE', '600/min') or None,
+        'write': os.environ.get('WATCHLIST_THROTTLE_WRITE_RATE', '120/min') or None,
+    },
+}
+
+
 # Database
 # https://docs.djangoproject.com/en/4.2/ref/settings/#databases
 
+# Configured from the environment. Defaults to a local SQLite file; set
+# DJANGO_DB_ENGINE (e.g. django.db.backends.postgresql) and the other
+# DJANGO_DB_* variables for a server database, and DJANGO_DB_REPLICA_HOSTS to a
+# comma-separated list of read replica hosts sharing the primary's credentials.
+
+DB_ENGINE = os.environ.get('DJANGO_DB_ENGINE', 'django.db.backends.sqlite3')
+
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+        'ENGINE': DB_ENGINE,
+        'NAME': os.environ.get('DJANGO_DB_NAME', BASE_DIR / 'db.sqlite3'),
+        'USER': os.environ.get('DJANGO_DB_USER', ''),
+        'PASSWORD': os.environ.get('DJANGO_DB_PASSWORD', ''),
+        'HOST': os.environ.get('DJANGO_DB_HOST', ''),
+        'PORT': os.environ.get('DJANGO_DB_PORT', ''),
+        # Keep connections open between requests and check them before reuse.
+        'CONN_MAX_AGE': int(os.environ.get('DJANGO_DB_CONN_MAX_AGE', 60)),
+        'CONN_HEALTH_CHECKS': True,
     }
 }
 
+DATABASE_REPLICAS = []
+for index, host in enumerate(filter(None, os.environ.get('DJANGO_DB_REPLICA_HOSTS', '').split(',')), 1):
+    alias = f'replica{index}'
+    DATABASES[alias] = {**DATABASES['default'], 'HOST': host.strip(), 'TEST': {'MIRROR': 'default'}}
+    DATABASE_REPLICAS.append(alias)
+
+DATABASE_ROUTERS = ['watchlist.db.ReplicaRouter']
+
+# Applied to every new SQLite connection by watchlist.db.configure_sqlite.
+WATCHLIST_SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'busy_timeout': 5000,
+    'cache_size': -64000,
+    'temp_store': 'MEMORY',
+    'mmap_size': 134217728,
+}
+
+
+# Cache
+# https://docs.djangoproject.com/en/4.2/topics/cache/
+# Local memory by default; point DJANGO_CACHE_BACKEND at e.g.
+# django.core.cache.backends.redis.RedisCache to share it across workers.
+
+CACHES = {
+    'default': {
+        'BACKEND': os.environ.get('DJANGO_CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.environ.get('DJANGO_CACHE_LOCATION', 'watchlist'),
+    }
+}
+
+# Cache alias and timeout (seconds) for cached watchlist and platform responses.
+WATCHLIST_CACHE_ALIAS = 'default'
+WATCHLIST_CACHE_TIMEOUT = int(os.environ.get('WATCHLIST_CACHE_TIMEOUT', 300))
+
+
+# Reviews from the last this many days count towards the trending leaderboards.
+WATCHLIST_TRENDING_DAYS = int(os.environ.get('WATCHLIST_TRENDING_DAYS', 7))
+
+
+# prune_changes keeps this many days of change feed entries.
+WATCHLIST_CHANGES_RETENTION_DAYS = int(os.environ.get('WATCHLIST_CHANGES_RETENTION_DAYS', 30))
+
+
+# Requests slower than this many milliseconds are logged with their SQL by
+# watchlist.middleware.PerformanceMiddleware.
+WATCHLIST_SLOW_REQUEST_MS = int(os.environ.get('WATCHLIST_SLOW_REQUEST_MS', 500))
+
 
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
@@ -0,0 +1,46 @@
+"""
+API-only settings for JSON workers, selected with
+DJANGO_SETTINGS_MODULE=IMDB.settings_api.
+
+Everything not needed to serve the watchlist API is left out: the admin,
+sessions, messages, static files and templates, session and CSRF
+middleware, authentication, i18n, the browsable API and form parsers.
+Each of these adds imports at boot or work on the first request. Run the
+admin from a separate process using IMDB.settings.
+``manage.py startup_benchmark`` compares both profiles.
+"""
+
+from IMDB.settings import *  # noqa: F401,F403
+from IMDB.settings import REST_FRAMEWORK
+
+INSTALLED_APPS = [
+    'watchlist',
+]
+
+MIDDLEWARE = [
+    'watchlist.middleware.PerformanceMiddleware',
+    'watchlist.middleware.ReplicaRoutingMiddleware',
+    'django.middleware.security.SecurityMiddleware',
+    'django.middleware.common.CommonMiddleware',
+]
+
+ROOT_URLCONF = 'IMDB.api_urls'
+
+TEMPLATES = []
+
+# Nothing is translated, so skip loading translation catalogs.
+USE_I18N = False
+
+REST_FRAMEWORK = {
+    **REST_FRAMEWORK,
+    'DEFAULT_RENDERER_CLASSES': [
+        'watchlist.renderers.FastJSONRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'rest_framework.parsers.JSONParser',
+    ],
+    # Requests are anonymous: throttles key on the client address and
+    # request.user is None, so django.contrib.auth is not needed.
+    'DEFAULT_AUTHENTICATION_CLASSES': [],
+    'UNAUTHENTICATED_USER': None,
+}
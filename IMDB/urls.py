@@ -19,5 +19,6 @@ from django.urls import path, include
 
 urlpatterns = [
     path('', include('watchlist.urls')),
+    path('async/', include('watchlist.async_urls')),
     path('admin/', admin.site.urls),
 ]
@@ -1,7 +1,88 @@
 from django.contrib import admin
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
 from watchlist.models import WatchList, StreamPlatform, Review
+from watchlist.search import search_movie_ids
 
 
-admin.site.register(WatchList)
-admin.site.register(StreamPlatform)
-admin.site.register(Review)
+def estimated_count(queryset):
+    """
+    Row count of an unfiltered queryset from the PostgreSQL planner
+    statistics, or None where no estimate is available.
+    """
+    connection = connections[queryset.db]
+    if connection.vendor != 'postgresql' or queryset.query.where:
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT reltuples FROM pg_class WHERE oid = %s::regclass",
+            [queryset.model._meta.db_table],
+        )
+        row = cursor.fetchone()
+    # reltuples is -1 for tables that were never analyzed.
+    return int(row[0]) if row and row[0] >= 0 else None
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator that skips ``COUNT(*)`` over large unfiltered tables and uses
+    the planner's estimate instead, so changelists of millions of rows open
+    without a full scan. Small tables and filtered changelists are counted
+    exactly.
+    """
+    exact_count_limit = 100000
+
+    @cached_property
+    def count(self):
+        estimate = estimated_count(self.object_list)
+        if estimate is not None and estimate > self.exact_count_limit:
+            return estimate
+        return super().count
+
+
+class LargeTableAdmin(admin.ModelAdmin):
+    paginator = EstimatedCountPaginator
+    # Avoids a second COUNT(*) of the whole table on filtered changelists.
+    show_full_result_count = False
+    list_per_page = 50
+
+
+@admin.register(StreamPlatform)
+class StreamPlatformAdmin(admin.ModelAdmin):
+    list_display = ('id', 'name', 'website')
+    search_fields = ('name',)
+    ordering = ('id',)
+
+
+@admin.register(WatchList)
+class WatchListAdmin(LargeTableAdmin):
+    list_display = ('id', 'title', 'platform', 'active', 'avg_rating', 'number_rating', 'created')
+    list_select_related = ('platform',)
+    # Backed by watchlist_platform_active_idx and watchlist_created_id_idx.
+    list_filter = ('platform', 'active', 'created')
+    ordering = ('-created', '-id')
+    autocomplete_fields = ('platform',)
+    readonly_fields = ('avg_rating', 'number_rating', 'rating_sum', 'trending')
+    search_fields = ('title',)
+    search_result_limit = 1000
+
+    def get_search_results(self, request, queryset, search_term):
+        """
+        Search through the full-text index instead of ``LIKE`` scans.
+        """
+        if not search_term:
+            return queryset, False
+        ids = search_movie_ids(search_term, self.search_result_limit)
+        return queryset.filter(pk__in=ids), False
+
+
+@admin.register(Review)
+class ReviewAdmin(LargeTableAdmin):
+    list_display = ('id', 'watchlist', 'rating', 'active', 'created')
+    # Review.__str__ and the watchlist column read the movie title.
+    list_select_related = ('watchlist',)
+    # Backed by review_created_id_idx.
+    list_filter = ('created',)
+    ordering = ('-created', '-id')
+    raw_id_fields = ('watchlist',)
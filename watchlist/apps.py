@@ -1,6 +1,14 @@
 from django.apps import AppConfig
+from django.db.backends.signals import connection_created
 
 
 class WatchlistConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'watchlist'
+
+    def ready(self):
+        from watchlist.db import configure_sqlite
+        from watchlist.middleware import install_query_recorder
+
+        connection_created.connect(install_query_recorder, dispatch_uid='watchlist_query_recorder')
+        connection_created.connect(configure_sqlite, dispatch_uid='watchlist_configure_sqlite')
@@ -0,0 +1,18 @@
+from django.urls import path
+from watchlist.async_views import (
+                                AsyncWatchListView,
+                                AsyncMovieDetailView,
+                                AsyncStreamPlatformListView,
+                                AsyncStreamPlatformDetailView,
+                                AsyncReviewListView,
+                                AsyncReviewDetailView
+                            )
+
+urlpatterns = [
+    path('', AsyncWatchListView.as_view(), name = 'async-watch-list'),
+    path('<int:pk>/', AsyncMovieDetailView.as_view(), name = 'async-movie-detail'),
+    path('platform/', AsyncStreamPlatformListView.as_view(), name = 'async-platform-list'),
+    path('platform/<int:pk>/', AsyncStreamPlatformDetailView.as_view(), name = 'async-platform-detail'),
+    path('review/', AsyncReviewListView.as_view(), name = 'async-review-list'),
+    path('review/<int:pk>', AsyncReviewDetailView.as_view(), name = 'async-review-detail'),
+]
@@ -0,0 +1,268 @@
+"""
+Async read endpoints for ASGI deployments.
+
+They return the same JSON as the read paths of the views in
+``watchlist.views`` but are plain Django async views, so under ASGI a request
+waiting on the database does not hold a worker thread. Detail lookups use the
+async ORM; cursor pagination still evaluates its page through
+``sync_to_async`` because DRF paginators are synchronous.
+
+Each view runs the throttles of the view it mirrors, with the same cost, so
+the async paths draw from a request budget like the sync ones. Responses carry
+an ETag and the mirrored view's ``Last-Modified`` and are answered with 304
+for matching conditional requests; the views the sync side caches are cached
+here too, under the same namespace versions.
+"""
+import hashlib
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseNotModified, JsonResponse
+from django.utils.http import quote_etag
+from django.views import View
+from rest_framework.exceptions import APIException, ValidationError
+from rest_framework.request import Request
+from rest_framework.utils.encoders import JSONEncoder
+
+from watchlist.cache import etag_matches, get_cache, get_versions, not_modified_since, set_last_modified
+from watchlist.db import read_from_primary
+from watchlist.models import WatchList, StreamPlatform, Review
+from watchlist.serializers import WatchListSerializer, StreamPlatformSerializer, ReviewSerializer
+from watchlist.views import (
+    WatchListView, MovieDetailView, SparsePlatformMixin, StreamPlatformListView,
+    StreamPlatformDetailView, ReviewListView, ReviewDetailView,
+)
+
+
+def json_response(data, status=200):
+    return JsonResponse(data, status=status, encoder=JSONEncoder, safe=False)
+
+
+def not_found():
+    return json_response({'detail': "Not found."}, status=404)
+
+
+def not_modified(etag=None, last_modified=None):
+    response = HttpResponseNotModified()
+    if etag is not None:
+        response['ETag'] = etag
+    return set_last_modified(response, last_modified)
+
+
+def conditional(request, response, last_modified):
+    """
+    Add the ETag of the rendered body and ``Last-Modified`` to a 200
+    response, or answer 304 if ``If-None-Match`` matches the ETag.
+    """
+    if response.status_code != 200:
+        return response
+    etag = quote_etag(hashlib.md5(response.content).hexdigest())
+    if etag_matches(request, etag):
+        return not_modified(etag, last_modified)
+    response['ETag'] = etag
+    return set_last_modified(response, last_modified)
+
+
+def cache_response(*namespaces):
+    """
+    Async counterpart of :func:`watchlist.cache.cache_response`.
+
+    The rendered body of 200 responses is cached per URL and namespace
+    versions with its ETag and the ``Last-Modified`` of the mirrored view,
+    filled from the primary database. Cache and timestamp lookups run through
+    ``sync_to_async``.
+    """
+    def decorator(method):
+        @wraps(method)
+        async def wrapper(view, request, *args, **kwargs):
+            def lookup():
+                fingerprint = ':'.join([*map(str, get_versions(namespaces)), request.get_full_path()])
+                key = f'watchlist:async-response:{hashlib.md5(fingerprint.encode()).hexdigest()}'
+                return key, get_cache().get(key)
+
+            key, entry = await sync_to_async(lookup)()
+            if entry is not None:
+                etag, last_modified, content = entry
+                if etag_matches(request, etag) or not_modified_since(request, last_modified):
+                    return not_modified(etag, last_modified)
+                response = HttpResponse(content, content_type='application/json')
+                response['ETag'] = etag
+                return set_last_modified(response, last_modified)
+
+            with read_from_primary():
+                last_modified = await view.get_last_modified(request, *args, **kwargs)
+                if not_modified_since(request, last_modified):
+                    return not_modified(last_modified=last_modified)
+                response = await method(view, request, *args, **kwargs)
+            if response.status_code != 200:
+                return response
+            content = response.content
+            response = conditional(request, response, last_modified)
+            timeout = getattr(settings, 'WATCHLIST_CACHE_TIMEOUT', 300)
+            await sync_to_async(get_cache().set)(key, (response['ETag'], last_modified, content), timeout=timeout)
+            return response
+        return wrapper
+    return decorator
+
+
+class MirroredViewMixin:
+    """
+    Checks the throttles of ``sync_view``, using its throttle cost, before
+    dispatching, and takes ``Last-Modified`` from its ``get_last_modified``.
+    """
+    sync_view = None
+
+    async def dispatch(self, request, *args, **kwargs):
+        try:
+            await sync_to_async(self.check_throttles)(request, *args, **kwargs)
+        except APIException as exc:
+            response = json_response({'detail': exc.detail}, status=exc.status_code)
+            if getattr(exc, 'wait', None) is not None:
+                response['Retry-After'] = '%d' % exc.wait
+            return response
+        return await super().dispatch(request, *args, **kwargs)
+
+    async def get_last_modified(self, request, *args, **kwargs):
+        view = self.sync_view(args=args, kwargs=kwargs)
+        return await sync_to_async(view.get_last_modified)(request, *args, **kwargs)
+
+    def check_throttles(self, request, *args, **kwargs):
+        view = self.sync_view(args=args, kwargs=kwargs)
+        request = view.initialize_request(request, *args, **kwargs)
+        # Costs may depend on the negotiated format, e.g. streaming.
+        request.accepted_renderer, request.accepted_media_type = view.perform_content_negotiation(
+            request, force=True
+        )
+        view.check_throttles(request)
+
+
+class AsyncListMixin:
+    """
+    Applies the sync view's filter backends and cursor pagination.
+    """
+    filter_backends = []
+
+    def filter_queryset(self, request, queryset):
+        for backend in self.filter_backends:
+            queryset = backend().filter_queryset(request, queryset, self)
+        return queryset
+
+    async def paginate(self, request, queryset, serialize):
+        paginator = self.pagination_class()
+        page = await sync_to_async(paginator.paginate_queryset)(queryset, request, view=self)
+        return json_response(paginator.get_paginated_response(serialize(page)).data)
+
+
+class AsyncWatchListView(MirroredViewMixin, AsyncListMixin, View):
+    """
+    Async counterpart of ``WatchListView.get``.
+    """
+    sync_view = WatchListView
+    pagination_class = WatchListView.pagination_class
+    filter_backends = WatchListView.filter_backends
+    filter_fields = WatchListView.filter_fields
+    ordering_fields = WatchListView.ordering_fields
+    ordering = WatchListView.ordering
+
+    @cache_response('watchlist')
+    async def get(self, request):
+        request = Request(request)
+        try:
+            queryset = self.filter_queryset(request, WatchList.objects.with_reviews())
+        except ValidationError as exc:
+            return json_response(exc.detail, status=400)
+        return await self.paginate(
+            request, queryset, lambda page: WatchListSerializer(page, many=True).data
+        )
+
+
+class AsyncMovieDetailView(MirroredViewMixin, View):
+    """
+    Async counterpart of ``MovieDetailView.get``.
+    """
+    sync_view = MovieDetailView
+
+    @cache_response('watchlist')
+    async def get(self, request, pk):
+        try:
+            movie = await WatchList.objects.with_reviews().aget(pk=pk)
+        except WatchList.DoesNotExist:
+            return not_found()
+        return json_response(WatchListSerializer(movie).data)
+
+
+class AsyncStreamPlatformListView(MirroredViewMixin, SparsePlatformMixin, AsyncListMixin, View):
+    """
+    Async counterpart of ``StreamPlatformListView.get``.
+    """
+    sync_view = StreamPlatformListView
+    pagination_class = StreamPlatformListView.pagination_class
+
+    @cache_response('platform', 'watchlist')
+    async def get(self, request):
+        request = Request(request)
+        context = self.get_serializer_context(request)
+        return await self.paginate(
+            request, self.get_queryset(context),
+            lambda page: StreamPlatformSerializer(page, many=True, context=context).data,
+        )
+
+
+class AsyncStreamPlatformDetailView(MirroredViewMixin, SparsePlatformMixin, View):
+    """
+    Async counterpart of ``StreamPlatformDetailView.get``.
+    """
+    sync_view = StreamPlatformDetailView
+
+    @cache_response('platform', 'watchlist')
+    async def get(self, request, pk):
+        request = Request(request)
+        context = self.get_serializer_context(request)
+        try:
+            platform = await self.get_queryset(context).aget(pk=pk)
+        except StreamPlatform.DoesNotExist:
+            return not_found()
+        return json_response(StreamPlatformSerializer(platform, context=context).data)
+
+
+class AsyncReviewListView(MirroredViewMixin, AsyncListMixin, View):
+    """
+    Async counterpart of ``ReviewListView.get``.
+    """
+    sync_view = ReviewListView
+    pagination_class = ReviewListView.pagination_class
+    filter_backends = ReviewListView.filter_backends
+    filter_fields = ReviewListView.filter_fields
+    ordering_fields = ReviewListView.ordering_fields
+    ordering = ReviewListView.ordering
+
+    async def get(self, request):
+        last_modified = await self.get_last_modified(request)
+        if not_modified_since(request, last_modified):
+            return not_modified(last_modified=last_modified)
+        drf_request = Request(request)
+        try:
+            queryset = self.filter_queryset(drf_request, Review.objects.all())
+        except ValidationError as exc:
+            return json_response(exc.detail, status=400)
+        response = await self.paginate(
+            drf_request, queryset, lambda page: ReviewSerializer(page, many=True).data
+        )
+        return conditional(request, response, last_modified)
+
+
+class AsyncReviewDetailView(MirroredViewMixin, View):
+    """
+    Async counterpart of ``ReviewDetailView.get``.
+    """
+    sync_view = ReviewDetailView
+
+    async def get(self, request, pk):
+        try:
+            review = await Review.objects.aget(pk=pk)
+        except Review.DoesNotExist:
+            return not_found()
+        if not_modified_since(request, review.updated):
+            return not_modified(last_modified=review.updated)
+        return conditional(request, json_response(ReviewSerializer(review).data), review.updated)
@@ -0,0 +1,61 @@
+"""
+Helpers shared by the benchmark management commands.
+"""
+import math
+
+
+def percentile(sorted_values, fraction):
+    """
+    Nearest-rank percentile of an already sorted list.
+    """
+    if not sorted_values:
+        return 0.0
+    rank = max(math.ceil(fraction * len(sorted_values)) - 1, 0)
+    return sorted_values[rank]
+
+
+def summarize(latencies, elapsed):
+    """
+    Throughput and latency percentiles (in milliseconds) for one run.
+    """
+    latencies = sorted(latencies)
+    return {
+        'requests': len(latencies),
+        'requests_per_second': round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        'p50_ms': round(percentile(latencies, 0.50) * 1000, 2),
+        'p95_ms': round(percentile(latencies, 0.95) * 1000, 2),
+        'p99_ms': round(percentile(latencies, 0.99) * 1000, 2),
+    }
+
+
+def seed_catalog(platforms, movies, reviews_per_movie):
+    """
+    Fill the (test) database with synthetic platforms, movies and reviews
+    using bulk inserts, then rebuild the movie rating aggregates.
+    """
+    from watchlist.models import WatchList, StreamPlatform, Review
+
+    StreamPlatform.objects.bulk_create(
+        StreamPlatform(name=f"Platform {i}", about="About", website=f"https://platform{i}.example.com")
+        for i in range(platforms)
+    )
+    platform_ids = list(StreamPlatform.objects.values_list('id', flat=True))
+    WatchList.objects.bulk_create(
+        (
+            WatchList(
+                title=f"Movie {i}", storyline=f"Storyline of movie {i}",
+                platform_id=platform_ids[i % len(platform_ids)],
+            )
+            for i in range(movies)
+        ),
+        batch_size=1000,
+    )
+    movie_ids = list(WatchList.objects.values_list('id', flat=True))
+    Review.objects.bulk_create(
+        (
+            Review(rating=j % 5 + 1, description="Review", watchlist_id=movie_id)
+            for movie_id in movie_ids for j in range(reviews_per_movie)
+        ),
+        batch_size=1000,
+    )
+    WatchList.objects.recompute_ratings()
@@ -0,0 +1,201 @@
+import hashlib
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.utils import timezone
+from django.utils.http import http_date, parse_etags, parse_http_date_safe, quote_etag
+from rest_framework import status
+from rest_framework.response import Response
+
+from watchlist.db import read_from_primary
+from watchlist.renderers import dumps
+
+
+def get_cache():
+    return caches[getattr(settings, 'WATCHLIST_CACHE_ALIAS', 'default')]
+
+
+def version_key(namespace):
+    return f'watchlist:version:{namespace}'
+
+
+def get_versions(namespaces):
+    """
+    Return the current version counter of each namespace, initialising
+    missing counters to a time-based value so evicted counters never
+    reuse an old version number.
+    """
+    cache = get_cache()
+    keys = [version_key(namespace) for namespace in namespaces]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            cache.add(key, time.time_ns(), timeout=None)
+            versions[key] = cache.get(key)
+    return [versions[key] for key in keys]
+
+
+def bump_versions(*namespaces):
+    """
+    Invalidate every cached response of the given namespaces once the
+    current transaction commits.
+    """
+    def bump():
+        cache = get_cache()
+        for namespace in namespaces:
+            try:
+                cache.incr(version_key(namespace))
+            except ValueError:
+                cache.set(version_key(namespace), time.time_ns(), timeout=None)
+
+    transaction.on_commit(bump)
+
+
+def deletion_key(namespace):
+    return f'watchlist:deleted:{namespace}'
+
+
+def record_deletion(*namespaces):
+    """
+    Note that rows shown by the given namespaces were deleted, once the
+    current transaction commits. Timestamps cannot reveal a deletion, so
+    list endpoints include this time in their ``Last-Modified``.
+    """
+    def record():
+        get_cache().set_many({deletion_key(namespace): timezone.now() for namespace in namespaces}, timeout=None)
+
+    transaction.on_commit(record)
+
+
+def last_deletion(*namespaces):
+    """
+    Time of the latest recorded deletion in the given namespaces. Missing
+    entries are initialised to now, so an evicted entry can never hide one.
+    """
+    cache = get_cache()
+    keys = [deletion_key(namespace) for namespace in namespaces]
+    times = cache.get_many(keys)
+    for key in keys:
+        if key not in times:
+            cache.add(key, timezone.now(), timeout=None)
+            times[key] = cache.get(key)
+    return max(times.values())
+
+
+def latest(*times):
+    """
+    The latest of the given datetimes, ignoring None.
+    """
+    return max((time for time in times if time is not None), default=None)
+
+
+def not_modified_since(request, last_modified):
+    """
+    Whether ``If-Modified-Since`` shows the client has the current version.
+    It is ignored when ``If-None-Match`` is present, as RFC 9110 requires.
+    """
+    if last_modified is None or 'HTTP_IF_NONE_MATCH' in request.META:
+        return False
+    since = parse_http_date_safe(request.META.get('HTTP_IF_MODIFIED_SINCE'))
+    return since is not None and int(last_modified.timestamp()) <= since
+
+
+def set_last_modified(response, last_modified):
+    if last_modified is not None:
+        response['Last-Modified'] = http_date(last_modified.timestamp())
+    return response
+
+
+def not_modified(etag=None, last_modified=None):
+    headers = {'ETag': etag} if etag is not None else {}
+    return set_last_modified(Response(status=status.HTTP_304_NOT_MODIFIED, headers=headers), last_modified)
+
+
+def representation_etag(data, media_type):
+    """
+    Strong ETag of response data as rendered for ``media_type``.
+    """
+    digest = hashlib.md5((media_type or '').encode() + b'\n' + dumps(data))
+    return quote_etag(digest.hexdigest())
+
+
+def etag_matches(request, etag):
+    header = request.META.get('HTTP_IF_NONE_MATCH')
+    if not header:
+        return False
+    candidates = parse_etags(header)
+    return '*' in candidates or etag in (tag.removeprefix('W/') for tag in candidates)
+
+
+def if_match_fails(request, etag):
+    """
+    Whether the request has an ``If-Match`` header that ``etag`` does not
+    satisfy. Weak validators never match, as RFC 9110 requires.
+    """
+    header = request.META.get('HTTP_IF_MATCH')
+    if not header:
+        return False
+    candidates = parse_etags(header)
+    return '*' not in candidates and etag not in candidates
+
+
+def cache_response(*namespaces):
+    """
+    Cache the data of successful GET responses per URL and namespace versions.
+
+    The data is stored with its representation ETag, so a matching
+    ``If-None-Match`` is answered with 304 from the cache without touching
+    the database, and clients keep getting 304s after writes that did not
+    change this particular response.
+
+    Views with a ``get_last_modified(request, *args, **kwargs)`` method also
+    send ``Last-Modified``. It is computed before the view runs on a cache
+    miss, so a satisfied ``If-Modified-Since`` skips serialization, and is
+    stored with the cached data.
+
+    Cache misses read from the primary database, even for requests served
+    from read replicas: a lagging replica would otherwise store data older
+    than the writes that bumped the namespace versions under the new key.
+    """
+    def decorator(method):
+        @wraps(method)
+        def wrapper(view, request, *args, **kwargs):
+            versions = get_versions(namespaces)
+            fingerprint = ':'.join([
+                *map(str, versions),
+                request.get_full_path(),
+                request.accepted_media_type or '',
+            ])
+            cache = get_cache()
+            key = f'watchlist:response:{hashlib.md5(fingerprint.encode()).hexdigest()}'
+            entry = cache.get(key)
+            if entry is not None:
+                etag, last_modified, data = entry
+                if etag_matches(request, etag) or not_modified_since(request, last_modified):
+                    return not_modified(etag, last_modified)
+                response = Response(data, status=status.HTTP_200_OK, headers={'ETag': etag})
+                return set_last_modified(response, last_modified)
+
+            with read_from_primary():
+                last_modified = None
+                get_last_modified = getattr(view, 'get_last_modified', None)
+                if get_last_modified is not None:
+                    last_modified = get_last_modified(request, *args, **kwargs)
+                    if not_modified_since(request, last_modified):
+                        return not_modified(last_modified=last_modified)
+
+                response = method(view, request, *args, **kwargs)
+            if isinstance(response, Response) and response.status_code == status.HTTP_200_OK:
+                etag = representation_etag(response.data, request.accepted_media_type)
+                timeout = getattr(settings, 'WATCHLIST_CACHE_TIMEOUT', 300)
+                cache.set(key, (etag, last_modified, response.data), timeout=timeout)
+                if etag_matches(request, etag):
+                    return not_modified(etag, last_modified)
+                response['ETag'] = etag
+                set_last_modified(response, last_modified)
+            return response
+        return wrapper
+    return decorator
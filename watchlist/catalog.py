@@ -0,0 +1,70 @@
+"""
+Streaming readers and writers for catalog import/export.
+
+A catalog is a directory holding one file per table (platforms, watchlist,
+reviews) in CSV or NDJSON format. Movies reference their platform by name and
+reviews reference their movie by its exported id, so files can be produced by
+other systems as well as by ``export_catalog``.
+"""
+import csv
+import json
+from itertools import islice
+
+from rest_framework.utils.encoders import JSONEncoder
+
+FORMATS = ('ndjson', 'csv')
+
+PLATFORM_FIELDS = ['name', 'about', 'website']
+WATCHLIST_FIELDS = ['id', 'title', 'storyline', 'platform', 'active', 'created']
+REVIEW_FIELDS = ['id', 'rating', 'description', 'watchlist', 'active', 'created', 'updated']
+
+
+def catalog_path(directory, table, fmt):
+    return directory / f'{table}.{fmt}'
+
+
+def write_rows(stream, rows, fields, fmt):
+    """
+    Write an iterable of dicts to an open text stream and return the row count.
+    """
+    count = 0
+    if fmt == 'csv':
+        writer = csv.DictWriter(stream, fieldnames=fields, extrasaction='ignore')
+        writer.writeheader()
+        for row in rows:
+            writer.writerow(row)
+            count += 1
+    else:
+        for row in rows:
+            stream.write(json.dumps(row, cls=JSONEncoder, ensure_ascii=False))
+            stream.write('\n')
+            count += 1
+    return count
+
+
+def read_rows(stream, fmt):
+    """
+    Lazily yield dicts from an open text stream.
+    """
+    if fmt == 'csv':
+        yield from csv.DictReader(stream)
+    else:
+        for line in stream:
+            if line.strip():
+                yield json.loads(line)
+
+
+def batched(iterable, size):
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def to_python(field, value):
+    """
+    Convert a raw CSV/NDJSON value with the model field, mapping empty CSV
+    cells of nullable fields to None.
+    """
+    if value == '' and field.null:
+        return None
+    return field.to_python(value)
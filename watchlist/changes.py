@@ -0,0 +1,185 @@
+"""
+Change log behind the ``/changes/`` delta feed.
+
+Triggers on the movie, review and platform tables insert a ``Change`` row
+for every insert, update and delete, so every write path (ORM saves,
+bulk_create, queryset updates and cascading deletes) is logged in the
+writing transaction. Updates of movie columns outside the API (``trending``)
+are not logged. Triggers exist on SQLite and PostgreSQL; other backends log
+nothing.
+
+Change ids follow commit order, so a cursor never passes a change that is
+not visible yet. SQLite runs one write transaction at a time. On PostgreSQL
+the triggers are deferred to commit and serialized by an advisory lock, which
+is held until the transaction's changes are visible.
+
+Like the search triggers, the SQLite triggers are dropped when a migration
+rebuilds one of these tables, so such migrations run
+:func:`install_change_log` again.
+"""
+from django.db.models import Max, Min
+
+TABLES = {
+    'watchlist': 'watchlist_watchlist',
+    'review': 'watchlist_review',
+    'platform': 'watchlist_streamplatform',
+}
+
+# Columns whose updates are logged, or None for all of them.
+LOGGED_COLUMNS = {
+    'watchlist': ['title', 'storyline', 'platform_id', 'active', 'avg_rating',
+                  'number_rating', 'rating_sum', 'updated'],
+    'review': None,
+    'platform': None,
+}
+
+
+def _update_of(model):
+    columns = LOGGED_COLUMNS[model]
+    return f"UPDATE OF {', '.join(columns)}" if columns else "UPDATE"
+
+
+def _sqlite_statements(model, table):
+    now = "strftime('%Y-%m-%d %H:%M:%f', 'now')"
+    insert = "INSERT INTO watchlist_change (model, object_id, deleted, created)"
+    return [
+        f"""CREATE TRIGGER IF NOT EXISTS watchlist_change_{model}_insert AFTER INSERT ON {table} BEGIN
+            {insert} VALUES ('{model}', new.id, 0, {now});
+        END""",
+        f"""CREATE TRIGGER IF NOT EXISTS watchlist_change_{model}_update AFTER {_update_of(model)} ON {table} BEGIN
+            {insert} VALUES ('{model}', new.id, 0, {now});
+        END""",
+        f"""CREATE TRIGGER IF NOT EXISTS watchlist_change_{model}_delete AFTER DELETE ON {table} BEGIN
+            {insert} VALUES ('{model}', old.id, 1, {now});
+        END""",
+    ]
+
+
+SQLITE_INSTALL = [
+    statement for model, table in TABLES.items() for statement in _sqlite_statements(model, table)
+]
+
+SQLITE_UNINSTALL = [
+    f"DROP TRIGGER IF EXISTS watchlist_change_{model}_{event}"
+    for model in TABLES for event in ('insert', 'update', 'delete')
+]
+
+POSTGRES_INSTALL = [
+    """CREATE OR REPLACE FUNCTION watchlist_record_change() RETURNS trigger LANGUAGE plpgsql AS $$
+    BEGIN
+        PERFORM pg_advisory_xact_lock(hashtext('watchlist_change'));
+        IF TG_OP = 'DELETE' THEN
+            INSERT INTO watchlist_change (model, object_id, deleted, created)
+            VALUES (TG_ARGV[0], OLD.id, TRUE, clock_timestamp());
+        ELSE
+            INSERT INTO watchlist_change (model, object_id, deleted, created)
+            VALUES (TG_ARGV[0], NEW.id, FALSE, clock_timestamp());
+        END IF;
+        RETURN NULL;
+    END
+    $$""",
+    *[
+        statement
+        for model, table in TABLES.items()
+        for statement in (
+            f"DROP TRIGGER IF EXISTS watchlist_change_{model} ON {table}",
+            f"""CREATE CONSTRAINT TRIGGER watchlist_change_{model}
+                AFTER INSERT OR DELETE OR {_update_of(model)} ON {table}
+                DEFERRABLE INITIALLY DEFERRED
+                FOR EACH ROW EXECUTE FUNCTION watchlist_record_change('{model}')""",
+        )
+    ],
+]
+
+POSTGRES_UNINSTALL = [
+    *[f"DROP TRIGGER IF EXISTS watchlist_change_{model} ON {table}" for model, table in TABLES.items()],
+    "DROP FUNCTION IF EXISTS watchlist_record_change()",
+]
+
+
+def _execute(schema_editor, statements):
+    for statement in statements:
+        schema_editor.execute(statement, params=None)
+
+
+def install_change_log(apps, schema_editor):
+    """
+    Migration operation creating the change log triggers for the current
+    backend. It is idempotent, like :func:`watchlist.search.install_search_index`.
+    """
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        _execute(schema_editor, SQLITE_INSTALL)
+    elif vendor == 'postgresql':
+        _execute(schema_editor, POSTGRES_INSTALL)
+
+
+def uninstall_change_log(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        _execute(schema_editor, SQLITE_UNINSTALL)
+    elif vendor == 'postgresql':
+        _execute(schema_editor, POSTGRES_UNINSTALL)
+
+
+def change_bounds():
+    """
+    The ids of the oldest retained and of the newest change, both None while
+    the log is empty.
+    """
+    from watchlist.models import Change
+
+    bounds = Change.objects.aggregate(oldest=Min('id'), newest=Max('id'))
+    return bounds['oldest'], bounds['newest']
+
+
+def read_changes(since, until, batch_size=1000):
+    """
+    Yield the changes with ids in ``(since, until]`` in id order, fetching
+    ``batch_size`` log rows and their current data per round trip.
+
+    Within a batch only the last change of each object is kept, carrying the
+    object's current row. An object changed and then deleted after the batch
+    was read is reported as deleted; its tombstone follows later.
+    """
+    from watchlist.models import Change, Review, StreamPlatform, WatchList
+    from watchlist.serializers import (
+        ReviewValuesSerializer, StreamPlatformChangeSerializer, WatchListChangeSerializer,
+    )
+
+    sources = {
+        Change.WATCHLIST: (WatchList, WatchListChangeSerializer),
+        Change.REVIEW: (Review, ReviewValuesSerializer),
+        Change.PLATFORM: (StreamPlatform, StreamPlatformChangeSerializer),
+    }
+    log = Change.objects.order_by('id').values_list('id', 'model', 'object_id', 'deleted')
+    while since < until:
+        batch = list(log.filter(id__gt=since, id__lte=until)[:batch_size])
+        if not batch:
+            return
+        since = batch[-1][0]
+
+        latest = {}
+        for change in batch:
+            # Re-inserting moves the object to its last position.
+            latest.pop(change[1:3], None)
+            latest[change[1:3]] = change
+        wanted = {}
+        for _, model, object_id, deleted in latest.values():
+            if not deleted:
+                wanted.setdefault(model, []).append(object_id)
+        rows = {}
+        for model, ids in wanted.items():
+            source, serializer_class = sources[model]
+            queryset = serializer_class.values(source.objects.filter(pk__in=ids))
+            rows[model] = {row['id']: row for row in serializer_class(queryset, many=True).data}
+
+        for change_id, model, object_id, deleted in latest.values():
+            data = None if deleted else rows[model].get(object_id)
+            yield {
+                'cursor': change_id,
+                'model': model,
+                'object_id': object_id,
+                'deleted': data is None,
+                'data': data,
+            }
@@ -0,0 +1,89 @@
+"""
+Database helpers: read-replica routing and SQLite connection tuning.
+"""
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+
+# Alias of the replica serving reads of the current request, or None.
+replica_alias = ContextVar('watchlist_replica_alias', default=None)
+
+
+def choose_replica():
+    """
+    A random alias from ``DATABASE_REPLICAS``, or None if there are none.
+    """
+    replicas = getattr(settings, 'DATABASE_REPLICAS', [])
+    return random.choice(replicas) if replicas else None
+
+
+@contextmanager
+def read_from_replicas():
+    """
+    Route reads made inside the block to one of the configured read
+    replicas, the same one for the whole block.
+    """
+    token = replica_alias.set(choose_replica())
+    try:
+        yield
+    finally:
+        replica_alias.reset(token)
+
+
+@contextmanager
+def read_from_primary():
+    """
+    Route reads made inside the block to ``default``, also within
+    :func:`read_from_replicas`.
+    """
+    token = replica_alias.set(None)
+    try:
+        yield
+    finally:
+        replica_alias.reset(token)
+
+
+class ReplicaRouter:
+    """
+    Sends reads inside :func:`read_from_replicas` to the replica chosen for
+    the block, and everything else to ``default``. Reads through a model
+    instance, such as related lookups, go to the database it was loaded from.
+
+    ReplicaRoutingMiddleware picks one replica per safe-method request to
+    watchlist views, so a page and its prefetched rows share one replica's
+    lag, and a request that writes always reads its own writes from the
+    primary.
+    """
+
+    def db_for_read(self, model, **hints):
+        instance = hints.get('instance')
+        if instance is not None and instance._state.db:
+            return instance._state.db
+        return replica_alias.get() or 'default'
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {'default', *getattr(settings, 'DATABASE_REPLICAS', [])}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == 'default'
+
+
+def configure_sqlite(sender, connection, **kwargs):
+    """
+    ``connection_created`` receiver applying ``WATCHLIST_SQLITE_PRAGMAS`` to
+    new SQLite connections (WAL journal, relaxed fsync, larger page cache).
+    """
+    if connection.vendor != 'sqlite':
+        return
+    pragmas = getattr(settings, 'WATCHLIST_SQLITE_PRAGMAS', {})
+    with connection.cursor() as cursor:
+        for name, value in pragmas.items():
+            cursor.execute(f'PRAGMA {name} = {value}')
@@ -0,0 +1,65 @@
+from django.core.exceptions import FieldDoesNotExist, ValidationError as DjangoValidationError
+from django.db import models
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend, OrderingFilter
+
+TRUE_VALUES = {'true', '1', 'yes', 't'}
+FALSE_VALUES = {'false', '0', 'no', 'f'}
+
+
+class QueryParamFilter(BaseFilterBackend):
+    """
+    Filters a queryset by the query parameters listed in the view's
+    ``filter_fields``, e.g. ``['platform', 'active', 'created__gte']``.
+
+    Each parameter is an ORM lookup; its value is parsed with the model field
+    so malformed values are rejected with 400 instead of reaching the database.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        filters = {}
+        errors = {}
+        for lookup in getattr(view, 'filter_fields', []):
+            if lookup not in request.query_params:
+                continue
+            field = self.get_field(queryset.model, lookup)
+            try:
+                filters[lookup] = self.parse(field, request.query_params[lookup])
+            except DjangoValidationError as exc:
+                errors[lookup] = exc.messages
+        if errors:
+            raise ValidationError(errors)
+        return queryset.filter(**filters)
+
+    def get_field(self, model, lookup):
+        name = lookup.split('__', 1)[0]
+        try:
+            return model._meta.get_field(name)
+        except FieldDoesNotExist:
+            raise AssertionError(f"{model.__name__} has no field {name!r} for filter {lookup!r}.")
+
+    def parse(self, field, value):
+        if isinstance(field, models.BooleanField):
+            lowered = value.lower()
+            if lowered in TRUE_VALUES:
+                return True
+            if lowered in FALSE_VALUES:
+                return False
+            raise DjangoValidationError(f"{value!r} is not a valid boolean.")
+        return field.to_python(value)
+
+
+class StableOrderingFilter(OrderingFilter):
+    """
+    Ordering filter that appends the primary key as a tie-breaker, so
+    orderings on non-unique fields are deterministic across cursor pages.
+    """
+
+    def get_ordering(self, request, queryset, view):
+        ordering = super().get_ordering(request, queryset, view)
+        if not ordering:
+            return ordering
+        ordering = list(ordering)
+        if not any(field.lstrip('-') in ('id', 'pk') for field in ordering):
+            ordering.append('-id' if ordering[0].startswith('-') else 'id')
+        return ordering
@@ -0,0 +1,115 @@
+"""
+Database-backed queue for write side effects.
+
+Views call :func:`enqueue` inside their write transaction, so a job exists
+exactly when the write committed, and return without doing the work. The
+``run_jobs`` worker claims due jobs in batches and calls each task once with
+all the keys of the batch, so side effects are processed set-based. A failing
+batch is retried key by key; failing keys are retried with exponential
+backoff until ``max_attempts`` and then kept as failed jobs.
+"""
+import logging
+from collections import defaultdict
+from datetime import timedelta
+
+from django.db import transaction
+from django.utils import timezone
+
+from watchlist.cache import bump_versions
+from watchlist.models import Job, WatchList
+
+logger = logging.getLogger('watchlist.jobs')
+
+TASKS = {}
+
+
+def task(name):
+    """
+    Register a function taking a list of string keys as the task ``name``.
+    """
+    def decorator(func):
+        TASKS[name] = func
+        return func
+    return decorator
+
+
+def enqueue(name, keys):
+    """
+    Add a pending job per key, skipping keys that already have one.
+    """
+    if name not in TASKS:
+        raise KeyError(f"Unknown task {name!r}.")
+    Job.objects.bulk_create(
+        [Job(task=name, key=str(key)) for key in keys], ignore_conflicts=True,
+    )
+
+
+def run_pending(batch_size=500, max_attempts=5):
+    """
+    Run up to ``batch_size`` due jobs and return how many were claimed.
+
+    Jobs are claimed with ``SELECT ... FOR UPDATE SKIP LOCKED`` where the
+    database supports it, so several workers can drain the queue together.
+    Each job row is deleted in the transaction that ran it, which keeps a
+    write that enqueues the same key meanwhile from being lost, as long as
+    the task reads after locking the rows it rebuilds (see
+    :func:`refresh_ratings`).
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        jobs = list(
+            Job.objects.select_for_update(skip_locked=True)
+            .filter(failed=False, run_after__lte=now)
+            .order_by('run_after', 'id')[:batch_size]
+        )
+        by_task = defaultdict(list)
+        for job in jobs:
+            by_task[job.task].append(job)
+        for name, group in by_task.items():
+            if not run_task(name, group) and len(group) > 1:
+                for job in group:
+                    run_task(name, [job])
+        retries = [job for job in jobs if job.attempts and job.pk is not None]
+        for job in retries:
+            job.failed = job.attempts >= max_attempts
+            job.run_after = now + timedelta(seconds=2 ** job.attempts)
+        Job.objects.bulk_update(retries, ['attempts', 'run_after', 'failed', 'last_error'])
+    return len(jobs)
+
+
+def run_task(name, jobs):
+    """
+    Run one task for the keys of ``jobs`` in a savepoint, deleting the jobs on
+    success and counting an attempt on failure.
+    """
+    try:
+        with transaction.atomic():
+            TASKS[name]([job.key for job in jobs])
+            Job.objects.filter(pk__in=[job.pk for job in jobs]).delete()
+    except Exception as exc:
+        logger.exception("Job %s failed for %d keys", name, len(jobs))
+        if len(jobs) == 1:
+            jobs[0].attempts += 1
+            jobs[0].last_error = repr(exc)
+        return False
+    for job in jobs:
+        job.pk = None
+    return True
+
+
+@task('refresh_ratings')
+def refresh_ratings(keys):
+    """
+    Rebuild rating aggregates and histograms of the given movies.
+
+    The movie rows are locked by a statement of their own first. A writer
+    holding one of them may have re-enqueued it while this job ran; on
+    PostgreSQL, an UPDATE that waited for that writer would re-check the row
+    but still count reviews in its old snapshot, and the job row would be
+    deleted without the writer's reviews counted. The recompute statements
+    that follow the lock see the writer's reviews.
+    """
+    movies = WatchList.objects.filter(pk__in=[int(key) for key in keys])
+    list(movies.select_for_update().order_by('pk').values_list('pk', flat=True))
+    movies.recompute_ratings()
+    bump_versions('watchlist')
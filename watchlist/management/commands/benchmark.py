@@ -0,0 +1,184 @@
+import json
+import platform as platform_module
+import subprocess
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+
+import django
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.test.utils import (
+    CaptureQueriesContext, override_settings, setup_databases, setup_test_environment,
+    teardown_databases, teardown_test_environment,
+)
+from django.urls import reverse
+from watchlist import urls as watchlist_urls
+from watchlist.benchmarks import seed_catalog, summarize
+from watchlist.models import WatchList, StreamPlatform, Review
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed a throwaway test database and benchmark every route in watchlist/urls.py: "
+        "throughput, p50/p95/p99 latency, query count and peak memory. Results can be "
+        "written as JSON and compared against a previous run."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--platforms', type=int, default=5)
+        parser.add_argument('--movies', type=int, default=1000)
+        parser.add_argument('--reviews', type=int, default=5, help="Reviews per movie.")
+        parser.add_argument('--iterations', type=int, default=50, help="Timed requests per route.")
+        parser.add_argument('--warm-cache', action='store_true',
+                            help="Keep the response cache between requests instead of clearing it.")
+        parser.add_argument('--route', action='append', dest='routes',
+                            help="Only benchmark the given route name (may be repeated).")
+        parser.add_argument('--output', type=Path, help="Write results to this JSON file.")
+        parser.add_argument('--compare', type=Path, help="Compare against a previous JSON result.")
+        parser.add_argument('--threshold', type=float, default=0.2,
+                            help="Relative p50 slowdown reported as a regression.")
+
+    def handle(self, *args, **options):
+        setup_test_environment()
+        old_config = setup_databases(verbosity=0, interactive=False)
+        # Measure the views, not the rate limits.
+        unthrottled = override_settings(REST_FRAMEWORK={
+            **settings.REST_FRAMEWORK,
+            'DEFAULT_THROTTLE_RATES': {'read': None, 'write': None},
+        })
+        unthrottled.enable()
+        try:
+            seed_catalog(options['platforms'], options['movies'], options['reviews'])
+            scenarios = self.scenarios()
+            missing = {p.name for p in watchlist_urls.urlpatterns} - {name for name, *_ in scenarios}
+            if missing:
+                raise CommandError(f"No benchmark scenario for routes: {', '.join(sorted(missing))}")
+            if options['routes']:
+                scenarios = [s for s in scenarios if s[0] in options['routes']]
+            results = {
+                f'{method} {name}': self.measure(method, url, payload, options)
+                for name, method, url, payload in scenarios
+            }
+        finally:
+            unthrottled.disable()
+            teardown_databases(old_config, verbosity=0)
+            teardown_test_environment()
+
+        report = {'meta': self.meta(options), 'results': results}
+        for key, result in results.items():
+            self.stdout.write(
+                f"{key:32} {result['requests_per_second']:>8} req/s  p50 {result['p50_ms']:>8}ms  "
+                f"p99 {result['p99_ms']:>8}ms  {result['queries']:>3} queries  "
+                f"{result['peak_memory_kb']:>8} KiB"
+            )
+        if options['output']:
+            options['output'].write_text(json.dumps(report, indent=2))
+        if options['compare']:
+            self.compare(json.loads(options['compare'].read_text()), report, options['threshold'])
+
+    def scenarios(self):
+        """
+        (route name, method, url, payload) for every route in watchlist/urls.py.
+        """
+        movie = WatchList.objects.order_by('id').first()
+        platform = StreamPlatform.objects.order_by('id').first()
+        review = Review.objects.order_by('id').first()
+        movie_payload = {'title': movie.title, 'storyline': movie.storyline, 'platform': platform.pk}
+        review_payload = {'rating': 3, 'description': "Benchmark", 'watchlist': movie.pk}
+        return [
+            ('watch-list', 'GET', reverse('watch-list'), None),
+            ('watch-list', 'POST', reverse('watch-list'), movie_payload),
+            ('watch-list-bulk', 'POST', reverse('watch-list-bulk'), [movie_payload] * 100),
+            ('movie-detail', 'GET', reverse('movie-detail', args=[movie.pk]), None),
+            ('movie-detail', 'PUT', reverse('movie-detail', args=[movie.pk]), movie_payload),
+            ('movie-detail', 'PATCH', reverse('movie-detail', args=[movie.pk]), {'title': movie.title}),
+            ('movie-review-summary', 'GET', reverse('movie-review-summary', args=[movie.pk]), None),
+            ('watch-list-search', 'GET', reverse('watch-list-search') + '?q=movie', None),
+            ('platform-list', 'GET', reverse('platform-list'), None),
+            ('platform-detail', 'GET', reverse('platform-detail', args=[platform.pk]), None),
+            ('platform-summary', 'GET', reverse('platform-summary', args=[platform.pk]), None),
+            ('platform-top-rated', 'GET', reverse('platform-top-rated', args=[platform.pk]), None),
+            ('platform-trending', 'GET', reverse('platform-trending', args=[platform.pk]), None),
+            ('review-list', 'GET', reverse('review-list'), None),
+            ('review-list', 'POST', reverse('review-list'), review_payload),
+            ('review-detail', 'GET', reverse('review-detail', args=[review.pk]), None),
+            ('review-detail', 'PUT', reverse('review-detail', args=[review.pk]), review_payload),
+            ('review-bulk', 'POST', reverse('review-bulk'), [review_payload] * 100),
+            ('change-feed', 'GET', reverse('change-feed') + '?since=0', None),
+            ('metrics', 'GET', reverse('metrics'), None),
+        ]
+
+    def measure(self, method, url, payload, options):
+        client = Client()
+
+        def request():
+            if not options['warm_cache']:
+                cache.clear()
+            if payload is None:
+                response = client.generic(method, url)
+            else:
+                response = client.generic(method, url, json.dumps(payload), content_type='application/json')
+            if response.status_code >= 400:
+                raise CommandError(f"{method} {url} returned {response.status_code}.")
+            if response.streaming:
+                b''.join(response.streaming_content)
+
+        request()
+        with CaptureQueriesContext(connection) as queries:
+            request()
+        # The captured log is reset by the next request, so count it now.
+        query_count = len(queries)
+        tracemalloc.start()
+        request()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        latencies = []
+        started = time.perf_counter()
+        for _ in range(options['iterations']):
+            request_started = time.perf_counter()
+            request()
+            latencies.append(time.perf_counter() - request_started)
+        result = summarize(latencies, time.perf_counter() - started)
+        result['queries'] = query_count
+        result['peak_memory_kb'] = round(peak / 1024, 1)
+        return result
+
+    def meta(self, options):
+        try:
+            commit = subprocess.run(
+                ['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True,
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            commit = None
+        return {
+            'commit': commit,
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'python': platform_module.python_version(),
+            'django': django.get_version(),
+            'database': connection.vendor,
+            'platforms': options['platforms'],
+            'movies': options['movies'],
+            'reviews_per_movie': options['reviews'],
+            'iterations': options['iterations'],
+            'warm_cache': options['warm_cache'],
+        }
+
+    def compare(self, baseline, report, threshold):
+        regressions = []
+        for key, result in report['results'].items():
+            before = baseline.get('results', {}).get(key)
+            if before is None:
+                continue
+            if before['p50_ms'] and result['p50_ms'] > before['p50_ms'] * (1 + threshold):
+                regressions.append(f"{key}: p50 {before['p50_ms']}ms -> {result['p50_ms']}ms")
+            if result['queries'] > before['queries']:
+                regressions.append(f"{key}: queries {before['queries']} -> {result['queries']}")
+        if regressions:
+            raise CommandError("Performance regressions:\n" + '\n'.join(regressions))
+        self.stdout.write(self.style.SUCCESS("No regressions against baseline."))
@@ -0,0 +1,49 @@
+import time
+from pathlib import Path
+
+from django.core.management.base import BaseCommand
+from django.db.models import F
+from watchlist.catalog import (
+    FORMATS, PLATFORM_FIELDS, WATCHLIST_FIELDS, REVIEW_FIELDS, catalog_path, write_rows,
+)
+from watchlist.models import WatchList, StreamPlatform, Review
+
+
+class Command(BaseCommand):
+    help = "Stream the platform, movie and review tables to CSV or NDJSON files in a directory."
+
+    def add_arguments(self, parser):
+        parser.add_argument('directory', type=Path)
+        parser.add_argument('--format', choices=FORMATS, default='ndjson')
+        parser.add_argument('--chunk-size', type=int, default=5000,
+                            help="Rows fetched per database round trip.")
+
+    def handle(self, *args, **options):
+        directory = options['directory']
+        directory.mkdir(parents=True, exist_ok=True)
+        chunk_size = options['chunk_size']
+        tables = [
+            ('platforms', PLATFORM_FIELDS,
+             StreamPlatform.objects.order_by('id').values(*PLATFORM_FIELDS)),
+            ('watchlist', WATCHLIST_FIELDS,
+             WatchList.objects.order_by('id')
+             .values('id', 'title', 'storyline', 'active', 'created', platform_name=F('platform__name'))),
+            ('reviews', REVIEW_FIELDS,
+             Review.objects.order_by('id').values(*REVIEW_FIELDS)),
+        ]
+        for table, fields, queryset in tables:
+            rows = (self.rename(row) for row in queryset.iterator(chunk_size=chunk_size))
+            path = catalog_path(directory, table, options['format'])
+            started = time.perf_counter()
+            with open(path, 'w', newline='', encoding='utf-8') as stream:
+                count = write_rows(stream, rows, fields, options['format'])
+            self.report(table, count, time.perf_counter() - started)
+
+    def rename(self, row):
+        if 'platform_name' in row:
+            row['platform'] = row.pop('platform_name')
+        return row
+
+    def report(self, table, count, elapsed):
+        rate = count / elapsed if elapsed else 0
+        self.stdout.write(f"{table}: {count} rows in {elapsed:.2f}s ({rate:,.0f} rows/s)")
@@ -0,0 +1,74 @@
+import json
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand, CommandError
+from watchlist.benchmarks import summarize
+
+
+class Command(BaseCommand):
+    help = (
+        "Load-test running servers over HTTP and report req/s and p50/p95/p99 latency. "
+        "To compare deployments, start e.g. `gunicorn IMDB.wsgi -w 4` and "
+        "`uvicorn IMDB.asgi:application --workers 4` on different ports and pass "
+        "--target wsgi=http://127.0.0.1:8000/ --target asgi=http://127.0.0.1:8001/async/. "
+        "Both paths are throttled per client, so a load test from one address mostly "
+        "measures 429 responses; start the servers with WATCHLIST_THROTTLE_READ_RATE= "
+        "(empty) to disable read throttling. Throttled responses are reported separately "
+        "and left out of the latencies."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--target', action='append', required=True,
+                            help="label=url of an endpoint to load (may be repeated).")
+        parser.add_argument('--requests', type=int, default=1000)
+        parser.add_argument('--concurrency', type=int, default=32)
+        parser.add_argument('--warmup', type=int, default=50)
+        parser.add_argument('--json', action='store_true', help="Print results as JSON.")
+
+    def handle(self, *args, **options):
+        targets = []
+        for target in options['target']:
+            label, sep, url = target.partition('=')
+            if not sep:
+                raise CommandError(f"Expected label=url, got {target!r}.")
+            targets.append((label, url))
+
+        results = {}
+        for label, url in targets:
+            self.run(url, options['warmup'], options['concurrency'])
+            results[label] = self.run(url, options['requests'], options['concurrency'])
+
+        if options['json']:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+        for label, result in results.items():
+            self.stdout.write(
+                f"{label}: {result['requests_per_second']} req/s, p50 {result['p50_ms']}ms, "
+                f"p95 {result['p95_ms']}ms, p99 {result['p99_ms']}ms, {result['errors']} errors, "
+                f"{result['throttled']} throttled"
+            )
+
+    def run(self, url, count, concurrency):
+        def fetch(_):
+            started = time.perf_counter()
+            try:
+                with urllib.request.urlopen(url) as response:
+                    response.read()
+                outcome = 'ok'
+            except urllib.error.HTTPError as exc:
+                outcome = 'throttled' if exc.code == 429 else 'error'
+            except (urllib.error.URLError, OSError):
+                outcome = 'error'
+            return time.perf_counter() - started, outcome
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            outcomes = list(pool.map(fetch, range(count)))
+        elapsed = time.perf_counter() - started
+        result = summarize([latency for latency, outcome in outcomes if outcome == 'ok'], elapsed)
+        result['errors'] = sum(1 for _, outcome in outcomes if outcome == 'error')
+        result['throttled'] = sum(1 for _, outcome in outcomes if outcome == 'throttled')
+        return result
@@ -0,0 +1,135 @@
+import time
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from watchlist.cache import bump_versions, record_deletion
+from watchlist.catalog import FORMATS, batched, catalog_path, read_rows, to_python
+from watchlist.models import WatchList, StreamPlatform, Review
+
+
+class Command(BaseCommand):
+    help = (
+        "Load platforms, movies and reviews from CSV or NDJSON files in a directory, "
+        "in fixed-size bulk_create batches. Exported created/updated times are kept; "
+        "reviews must reference a movie in the same export."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('directory', type=Path)
+        parser.add_argument('--format', choices=FORMATS, default='ndjson')
+        parser.add_argument('--batch-size', type=int, default=5000,
+                            help="Rows inserted per bulk_create call.")
+
+    def handle(self, *args, **options):
+        directory = options['directory']
+        if not directory.is_dir():
+            raise CommandError(f"{directory} is not a directory.")
+        self.fmt = options['format']
+        self.batch_size = options['batch_size']
+
+        platform_ids = dict(StreamPlatform.objects.values_list('name', 'id'))
+        self.load(directory, 'platforms', lambda batch: self.import_platforms(batch, platform_ids))
+
+        # Exported movie id -> id of the imported row, so reviews can follow.
+        movie_ids = {}
+        try:
+            self.load(directory, 'watchlist', lambda batch: self.import_movies(batch, platform_ids, movie_ids))
+            self.load(directory, 'reviews', lambda batch: self.import_reviews(batch, movie_ids))
+        finally:
+            # Batches commit one by one, so count the reviews imported before a failure too.
+            self.recompute_ratings(movie_ids.values())
+            # Imported rows keep their exported timestamps, which may be older
+            # than a Last-Modified time clients already hold.
+            record_deletion('watchlist', 'platform')
+            bump_versions('watchlist', 'platform')
+
+    def load(self, directory, table, import_batch):
+        path = catalog_path(directory, table, self.fmt)
+        if not path.exists():
+            return 0
+        count = 0
+        started = time.perf_counter()
+        with open(path, newline='', encoding='utf-8') as stream:
+            for batch in batched(read_rows(stream, self.fmt), self.batch_size):
+                with transaction.atomic():
+                    import_batch(batch)
+                count += len(batch)
+        elapsed = time.perf_counter() - started
+        rate = count / elapsed if elapsed else 0
+        self.stdout.write(f"{table}: {count} rows in {elapsed:.2f}s ({rate:,.0f} rows/s)")
+        return count
+
+    def recompute_ratings(self, movie_ids):
+        """
+        Rebuild the rating aggregates of the imported movies, ``batch_size``
+        movies per transaction.
+        """
+        for batch in batched(movie_ids, self.batch_size):
+            with transaction.atomic():
+                WatchList.objects.filter(pk__in=batch).recompute_ratings()
+
+    def build(self, model, row, exclude=()):
+        """
+        Build an unsaved instance from the row's concrete, non-automatic fields.
+        """
+        values = {}
+        for field in model._meta.concrete_fields:
+            if field.primary_key or field.name in exclude or field.name not in row:
+                continue
+            if getattr(field, 'auto_now', False) or getattr(field, 'auto_now_add', False):
+                continue
+            values[field.attname] = to_python(field, row[field.name])
+        return model(**values)
+
+    def restore_timestamps(self, model, batch, instances):
+        """
+        Put back the exported ``auto_now``/``auto_now_add`` values, which
+        bulk_create replaces with the current time.
+        """
+        fields = [
+            field for field in model._meta.concrete_fields
+            if getattr(field, 'auto_now', False) or getattr(field, 'auto_now_add', False)
+        ]
+        restored = set()
+        for row, instance in zip(batch, instances):
+            for field in fields:
+                if row.get(field.name) not in (None, ''):
+                    setattr(instance, field.attname, to_python(field, row[field.name]))
+                    restored.add(field.name)
+        if restored:
+            model.objects.bulk_update(instances, sorted(restored), batch_size=self.batch_size)
+
+    def import_platforms(self, batch, platform_ids):
+        new = {}
+        for row in batch:
+            if row['name'] not in platform_ids and row['name'] not in new:
+                new[row['name']] = self.build(StreamPlatform, row)
+        for platform in StreamPlatform.objects.bulk_create(list(new.values()), batch_size=self.batch_size):
+            platform_ids[platform.name] = platform.pk
+
+    def import_movies(self, batch, platform_ids, movie_ids):
+        movies = []
+        for row in batch:
+            if row['platform'] not in platform_ids:
+                raise CommandError(f"Movie {row.get('id')!r} references unknown platform {row['platform']!r}.")
+            movie = self.build(WatchList, row, exclude=['platform', 'avg_rating', 'number_rating', 'rating_sum'])
+            movie.platform_id = platform_ids[row['platform']]
+            movies.append(movie)
+        created = WatchList.objects.bulk_create(movies, batch_size=self.batch_size)
+        self.restore_timestamps(WatchList, batch, created)
+        for row, movie in zip(batch, created):
+            if row.get('id') not in (None, ''):
+                movie_ids[int(row['id'])] = movie.pk
+
+    def import_reviews(self, batch, movie_ids):
+        reviews = []
+        for row in batch:
+            movie_id = int(row['watchlist'])
+            if movie_id not in movie_ids:
+                raise CommandError(f"Review {row.get('id')!r} references unknown movie {movie_id!r}.")
+            review = self.build(Review, row, exclude=['watchlist'])
+            review.watchlist_id = movie_ids[movie_id]
+            reviews.append(review)
+        created = Review.objects.bulk_create(reviews, batch_size=self.batch_size)
+        self.restore_timestamps(Review, batch, created)
@@ -0,0 +1,26 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from watchlist.models import Change, delete_in_batches
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete change feed entries older than the retention period. Replicas whose "
+        "cursor is older get 410 Gone and copy the catalog again. Run periodically, e.g. daily."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=getattr(settings, 'WATCHLIST_CHANGES_RETENTION_DAYS', 30),
+                            help="Days of changes to keep.")
+        parser.add_argument('--batch-size', type=int, default=10000, help="Changes deleted per transaction.")
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(days=options['days'])
+        # The newest change is always kept, so an expired cursor stays detectable.
+        newest = Change.objects.order_by('-id').values_list('id', flat=True).first()
+        queryset = Change.objects.filter(created__lt=cutoff).exclude(id=newest)
+        deleted = delete_in_batches(queryset, options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted['watchlist.Change']} changes."))
@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Q
+from watchlist.cache import bump_versions
+from watchlist.models import WatchList, Review, trending_since
+
+
+class Command(BaseCommand):
+    help = (
+        "Recount the trending window of the platform leaderboards, dropping reviews that "
+        "have aged out of it. Run periodically, e.g. hourly from cron."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--all', action='store_true',
+                            help="Rebuild every movie instead of only those trending or recently reviewed.")
+
+    def handle(self, *args, **options):
+        since = trending_since()
+        queryset = WatchList.objects.all()
+        if not options['all']:
+            recent = Review.objects.filter(created__gte=since).values('watchlist')
+            queryset = queryset.filter(Q(trending__gt=0) | Q(pk__in=recent))
+        with transaction.atomic():
+            updated = queryset.recompute_trending(since)
+            bump_versions('watchlist')
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt trending counts for {updated} movies."))
@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from watchlist.cache import bump_versions
+from watchlist.models import WatchList
+
+
+class Command(BaseCommand):
+    help = "Recompute avg_rating, number_rating and rating_sum for every movie from its reviews."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--movie', type=int, action='append', dest='movies',
+            help="Only rebuild the given movie id (may be repeated).",
+        )
+
+    def handle(self, *args, **options):
+        queryset = WatchList.objects.all()
+        if options['movies']:
+            queryset = queryset.filter(pk__in=options['movies'])
+        with transaction.atomic():
+            updated = queryset.recompute_ratings()
+            bump_versions('watchlist')
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt rating aggregates for {updated} movies."))
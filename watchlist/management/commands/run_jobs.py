@@ -0,0 +1,34 @@
+import time
+
+from django.core.management.base import BaseCommand
+from watchlist.jobs import run_pending
+
+
+class Command(BaseCommand):
+    help = (
+        "Process queued background jobs in batches, polling for new ones until "
+        "interrupted. Several workers may run at once on databases with SKIP LOCKED."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500, help="Jobs claimed per transaction.")
+        parser.add_argument('--max-attempts', type=int, default=5,
+                            help="Attempts before a job is marked as failed.")
+        parser.add_argument('--sleep', type=float, default=1.0,
+                            help="Seconds to wait when the queue is empty.")
+        parser.add_argument('--once', action='store_true', help="Exit once no job is due.")
+
+    def handle(self, *args, **options):
+        total = 0
+        try:
+            while True:
+                claimed = run_pending(options['batch_size'], options['max_attempts'])
+                total += claimed
+                if claimed:
+                    continue
+                if options['once']:
+                    break
+                time.sleep(options['sleep'])
+        except KeyboardInterrupt:
+            pass
+        self.stdout.write(self.style.SUCCESS(f"Processed {total} jobs."))
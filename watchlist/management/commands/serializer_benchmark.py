@@ -0,0 +1,65 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.test.utils import setup_databases, teardown_databases
+from rest_framework.renderers import JSONRenderer
+from watchlist.benchmarks import seed_catalog
+from watchlist.models import WatchList, StreamPlatform, Review
+from watchlist.renderers import FastJSONRenderer, orjson
+from watchlist.serializers import (
+    WatchListSerializer, StreamPlatformSerializer, ReviewSerializer,
+    WatchListValuesSerializer, StreamPlatformValuesSerializer, ReviewValuesSerializer,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare rows/sec of the ModelSerializers against the .values() serializers, "
+        "and of DRF's JSONRenderer against FastJSONRenderer, on a seeded test database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--movies', type=int, default=2000)
+        parser.add_argument('--reviews', type=int, default=5, help="Reviews per movie.")
+        parser.add_argument('--repeat', type=int, default=3, help="Runs per case; the best is reported.")
+
+    def handle(self, *args, **options):
+        old_config = setup_databases(verbosity=0, interactive=False)
+        try:
+            seed_catalog(10, options['movies'], options['reviews'])
+            cases = [
+                ('WatchList', WatchListSerializer, lambda: WatchList.objects.with_reviews(),
+                 WatchListValuesSerializer, lambda: WatchListValuesSerializer.values(WatchList.objects.all())),
+                ('Review', ReviewSerializer, lambda: Review.objects.all(),
+                 ReviewValuesSerializer, lambda: ReviewValuesSerializer.values(Review.objects.all())),
+                ('StreamPlatform', StreamPlatformSerializer, lambda: StreamPlatform.objects.with_watchlist(),
+                 StreamPlatformValuesSerializer,
+                 lambda: StreamPlatformValuesSerializer.values(StreamPlatform.objects.all())),
+            ]
+            for name, model_serializer, model_rows, values_serializer, values_rows in cases:
+                rows = len(model_rows())
+                model_time, data = self.best(options['repeat'], lambda: model_serializer(model_rows(), many=True).data)
+                values_time, _ = self.best(options['repeat'], lambda: values_serializer(values_rows(), many=True).data)
+                self.report(f"{name} serialization", rows, model_time, values_time)
+
+                stdlib_time, _ = self.best(options['repeat'], lambda: JSONRenderer().render(data))
+                fast_time, _ = self.best(options['repeat'], lambda: FastJSONRenderer().render(data))
+                self.report(f"{name} rendering", rows, stdlib_time, fast_time)
+        finally:
+            teardown_databases(old_config, verbosity=0)
+        if orjson is None:
+            self.stdout.write("orjson is not installed; FastJSONRenderer used the stdlib encoder.")
+
+    def best(self, repeat, func):
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            result = func()
+            timings.append(time.perf_counter() - started)
+        return min(timings), result
+
+    def report(self, label, rows, baseline, fast):
+        self.stdout.write(
+            f"{label:30} {rows / baseline:>12,.0f} -> {rows / fast:>12,.0f} rows/s "
+            f"({baseline / fast:.1f}x)"
+        )
@@ -0,0 +1,129 @@
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# Run in a fresh interpreter per sample: boot the WSGI application the way a
+# worker does, then serve one request through it.
+WORKER = """
+import time
+started = time.perf_counter()
+import json, sys
+from wsgiref.util import setup_testing_defaults
+from IMDB.wsgi import application
+booted = time.perf_counter()
+environ = {'PATH_INFO': sys.argv[1], 'REQUEST_METHOD': 'GET'}
+setup_testing_defaults(environ)
+statuses = []
+b''.join(application(environ, lambda status, headers, exc_info=None: statuses.append(status)))
+finished = time.perf_counter()
+print(json.dumps({
+    'status': statuses[0],
+    'boot_ms': (booted - started) * 1000,
+    'first_request_ms': (finished - booted) * 1000,
+    'modules': len(sys.modules),
+}))
+"""
+
+IMPORT_LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$')
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare worker cold starts of settings profiles: WSGI boot time, first-request "
+        "latency, loaded modules and total import time measured with -X importtime. "
+        "Each sample runs in a fresh interpreter against a freshly migrated SQLite file."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--settings-module', action='append', dest='profiles',
+                            help="Settings module to compare (may be repeated). "
+                                 "Defaults to IMDB.settings and IMDB.settings_api.")
+        parser.add_argument('--path', default='/', help="Path of the first request.")
+        parser.add_argument('--runs', type=int, default=5, help="Cold starts per profile.")
+        parser.add_argument('--top', type=int, default=10, help="Slowest imports listed per profile.")
+        parser.add_argument('--output', type=Path, help="Write results to this JSON file.")
+
+    def handle(self, *args, **options):
+        profiles = options['profiles'] or ['IMDB.settings', 'IMDB.settings_api']
+        with tempfile.TemporaryDirectory() as directory:
+            env = {
+                **os.environ,
+                'DJANGO_DB_ENGINE': 'django.db.backends.sqlite3',
+                'DJANGO_DB_NAME': str(Path(directory) / 'db.sqlite3'),
+            }
+            self.run([sys.executable, 'manage.py', 'migrate', '--no-input'],
+                     {**env, 'DJANGO_SETTINGS_MODULE': 'IMDB.settings'})
+            envs = {profile: {**env, 'DJANGO_SETTINGS_MODULE': profile} for profile in profiles}
+            samples = {profile: [] for profile in profiles}
+            # Interleaved, so drift in machine load affects every profile alike.
+            for _ in range(options['runs']):
+                for profile in profiles:
+                    samples[profile].append(self.sample(envs[profile], options['path']))
+            results = {
+                profile: {
+                    **self.summarize(samples[profile]),
+                    **self.import_times(envs[profile], options['path'], options['top']),
+                }
+                for profile in profiles
+            }
+
+        for profile, result in results.items():
+            self.stdout.write(
+                f"{profile:24} boot {result['boot_ms']:>8}ms  first request {result['first_request_ms']:>8}ms  "
+                f"process {result['process_ms']:>8}ms  imports {result['import_ms']:>8}ms  "
+                f"{result['modules']:>5} modules"
+            )
+            for name, self_ms in result['slowest_imports']:
+                self.stdout.write(f"    {self_ms:>8}ms  {name}")
+        if options['output']:
+            options['output'].write_text(json.dumps({'path': options['path'], 'results': results}, indent=2))
+
+    def run(self, command, env):
+        completed = subprocess.run(command, env=env, cwd=settings.BASE_DIR, capture_output=True, text=True)
+        if completed.returncode:
+            raise CommandError(f"{' '.join(command)} failed:\n{completed.stderr}")
+        return completed
+
+    def sample(self, env, path):
+        started = time.perf_counter()
+        completed = self.run([sys.executable, '-c', WORKER, path], env)
+        sample = json.loads(completed.stdout.splitlines()[-1])
+        sample['process_ms'] = (time.perf_counter() - started) * 1000
+        if not sample['status'].startswith('2'):
+            raise CommandError(f"GET {path} returned {sample['status']}.")
+        return sample
+
+    def summarize(self, samples):
+        return {
+            **{
+                key: round(statistics.median(sample[key] for sample in samples), 2)
+                for key in ('boot_ms', 'first_request_ms', 'process_ms')
+            },
+            'modules': samples[0]['modules'],
+        }
+
+    def import_times(self, env, path, top):
+        """
+        Total and slowest self import times, from a separate run as
+        ``-X importtime`` slows imports down.
+        """
+        stderr = self.run([sys.executable, '-X', 'importtime', '-c', WORKER, path], env).stderr
+        imports = []
+        for line in stderr.splitlines():
+            match = IMPORT_LINE.match(line)
+            if match:
+                imports.append((match[4], int(match[1])))
+        slowest = sorted(imports, key=lambda item: item[1], reverse=True)[:top]
+        return {
+            'import_ms': round(sum(self_us for _, self_us in imports) / 1000, 2),
+            'slowest_imports': [(name, round(self_us / 1000, 2)) for name, self_us in slowest],
+        }
@@ -0,0 +1,105 @@
+"""
+In-process request metrics rendered in the Prometheus text exposition format.
+
+Each worker process keeps its own registry; scrape every worker (or run a
+single worker per scrape target) to get complete numbers.
+"""
+import threading
+from bisect import bisect_left
+from collections import defaultdict
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class _Series:
+    __slots__ = ('count', 'duration', 'db_queries', 'db_duration', 'app_duration',
+                 'render_duration', 'response_bytes', 'buckets')
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.db_queries = 0
+        self.db_duration = 0.0
+        self.app_duration = 0.0
+        self.render_duration = 0.0
+        self.response_bytes = 0
+        self.buckets = [0] * len(DURATION_BUCKETS)
+
+
+class MetricsRegistry:
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._series = defaultdict(_Series)
+
+    def observe(self, view, method, status, duration, db_queries, db_duration,
+                app_duration, render_duration, response_bytes):
+        with self._lock:
+            series = self._series[(view, method, str(status))]
+            series.count += 1
+            series.duration += duration
+            series.db_queries += db_queries
+            series.db_duration += db_duration
+            series.app_duration += app_duration
+            series.render_duration += render_duration
+            series.response_bytes += response_bytes
+            index = bisect_left(DURATION_BUCKETS, duration)
+            if index < len(series.buckets):
+                series.buckets[index] += 1
+
+    def clear(self):
+        with self._lock:
+            self._series.clear()
+
+    def render(self):
+        with self._lock:
+            items = sorted((key, self._copy(series)) for key, series in self._series.items())
+        lines = []
+        counters = [
+            ('watchlist_requests_total', 'counter', 'Requests handled.', 'count'),
+            ('watchlist_db_queries_total', 'counter', 'Database queries issued.', 'db_queries'),
+            ('watchlist_db_duration_seconds_total', 'counter', 'Time spent in the database.', 'db_duration'),
+            ('watchlist_app_duration_seconds_total', 'counter',
+             'Time spent in views outside the database, mostly serialization.', 'app_duration'),
+            ('watchlist_render_duration_seconds_total', 'counter', 'Time spent rendering responses.',
+             'render_duration'),
+            ('watchlist_response_bytes_total', 'counter', 'Response body bytes sent.', 'response_bytes'),
+        ]
+        for name, kind, help_text, attr in counters:
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} {kind}')
+            for key, series in items:
+                lines.append(f'{name}{{{_labels(key)}}} {getattr(series, attr)}')
+
+        name = 'watchlist_request_duration_seconds'
+        lines.append(f'# HELP {name} Request wall time.')
+        lines.append(f'# TYPE {name} histogram')
+        for key, series in items:
+            labels = _labels(key)
+            cumulative = 0
+            for bound, count in zip(DURATION_BUCKETS, series.buckets):
+                cumulative += count
+                lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {series.count}')
+            lines.append(f'{name}_sum{{{labels}}} {series.duration}')
+            lines.append(f'{name}_count{{{labels}}} {series.count}')
+        return '\n'.join(lines) + '\n'
+
+    def _copy(self, series):
+        copy = _Series()
+        for attr in _Series.__slots__:
+            value = getattr(series, attr)
+            setattr(copy, attr, list(value) if isinstance(value, list) else value)
+        return copy
+
+
+def _escape(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(key):
+    view, method, status = key
+    return f'view="{_escape(view)}",method="{_escape(method)}",status="{status}"'
+
+
+registry = MetricsRegistry()
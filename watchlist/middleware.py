@@ -0,0 +1,216 @@
+import logging
+import time
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+
+from watchlist.db import choose_replica, replica_alias
+from watchlist.metrics import registry
+
+logger = logging.getLogger('watchlist.performance')
+
+_current_recorder = ContextVar('watchlist_query_recorder', default=None)
+
+
+class QueryRecorder:
+    """
+    Counts and times the queries of one request.
+    """
+    max_queries = 200
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.queries = []
+
+    def record(self, sql, elapsed):
+        self.count += 1
+        self.duration += elapsed
+        if len(self.queries) < self.max_queries:
+            self.queries.append((sql, elapsed))
+
+
+def record_query(execute, sql, params, many, context):
+    """
+    ``execute_wrapper`` installed on every connection. It reports to the
+    recorder of the current request, found through a context variable so it
+    works for sync views and for ORM calls made from async views alike.
+    """
+    recorder = _current_recorder.get()
+    if recorder is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        recorder.record(sql, time.perf_counter() - started)
+
+
+def install_query_recorder(sender, connection, **kwargs):
+    """
+    ``connection_created`` receiver adding :func:`record_query` to new connections.
+    """
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+class RequestTiming:
+    __slots__ = ('view_started', 'view_finished', 'db_before_view', 'db_after_view', 'render_finished')
+
+    def __init__(self):
+        self.view_started = None
+        self.view_finished = None
+        self.db_before_view = 0.0
+        self.db_after_view = None
+        self.render_finished = None
+
+
+class PerformanceMiddleware:
+    """
+    Records wall time, database query count and time, time spent in the view
+    outside the database (serialization), render time and response size.
+
+    The numbers are sent as a ``Server-Timing`` header, aggregated per view for
+    the ``/metrics`` endpoint, and requests slower than
+    ``WATCHLIST_SLOW_REQUEST_MS`` are logged with their SQL. The middleware
+    runs natively under both WSGI and ASGI.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.slow_request_ms = getattr(settings, 'WATCHLIST_SLOW_REQUEST_MS', 500)
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+            # Coroutine hooks keep Django from hopping to a thread to call them.
+            self.process_view = self.aprocess_view
+            self.process_template_response = self.aprocess_template_response
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        recorder, timing, token, started = self.start(request)
+        try:
+            response = self.get_response(request)
+        finally:
+            _current_recorder.reset(token)
+        return self.finish(request, response, recorder, timing, started)
+
+    async def __acall__(self, request):
+        recorder, timing, token, started = self.start(request)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current_recorder.reset(token)
+        return self.finish(request, response, recorder, timing, started)
+
+    def start(self, request):
+        recorder = QueryRecorder()
+        timing = RequestTiming()
+        request._timing = (recorder, timing)
+        token = _current_recorder.set(recorder)
+        return recorder, timing, token, time.perf_counter()
+
+    def finish(self, request, response, recorder, timing, started):
+        finished = time.perf_counter()
+        duration = finished - started
+
+        app = render = 0.0
+        if timing.view_started is not None:
+            # Responses that are not rendered lazily finish with the view.
+            view_finished = timing.view_finished or finished
+            db_after_view = timing.db_after_view
+            if db_after_view is None:
+                db_after_view = recorder.duration
+            db_in_view = db_after_view - timing.db_before_view
+            app = max(view_finished - timing.view_started - db_in_view, 0.0)
+            if timing.render_finished is not None:
+                render = timing.render_finished - view_finished
+        size = 0 if response.streaming else len(response.content)
+
+        response['Server-Timing'] = ', '.join([
+            f'db;dur={recorder.duration * 1000:.2f};desc="{recorder.count} queries"',
+            f'app;dur={app * 1000:.2f}',
+            f'render;dur={render * 1000:.2f}',
+            f'total;dur={duration * 1000:.2f}',
+        ])
+
+        match = request.resolver_match
+        view = (match.view_name or match.route) if match else 'unmatched'
+        registry.observe(
+            view, request.method, response.status_code, duration,
+            recorder.count, recorder.duration, app, render, size,
+        )
+        if self.slow_request_ms is not None and duration * 1000 >= self.slow_request_ms:
+            logger.warning(
+                "Slow request %s %s: %.1fms, %d queries in %.1fms\n%s",
+                request.method, request.get_full_path(), duration * 1000,
+                recorder.count, recorder.duration * 1000,
+                '\n'.join(f'  [{elapsed * 1000:.2f}ms] {sql}' for sql, elapsed in recorder.queries),
+            )
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        recorder, timing = request._timing
+        timing.view_started = time.perf_counter()
+        timing.db_before_view = recorder.duration
+
+    def process_template_response(self, request, response):
+        # Called after the view returns and before the response is rendered.
+        recorder, timing = request._timing
+        timing.view_finished = time.perf_counter()
+        timing.db_after_view = recorder.duration
+
+        def rendered(response):
+            timing.render_finished = time.perf_counter()
+
+        response.add_post_render_callback(rendered)
+        return response
+
+    async def aprocess_view(self, request, view_func, view_args, view_kwargs):
+        return PerformanceMiddleware.process_view(self, request, view_func, view_args, view_kwargs)
+
+    async def aprocess_template_response(self, request, response):
+        return PerformanceMiddleware.process_template_response(self, request, response)
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Serves GET, HEAD and OPTIONS requests to watchlist views from one of the
+    read replicas configured in ``DATABASE_REPLICAS``, chosen per request; all
+    other requests read and write on the primary.
+    """
+    sync_capable = True
+    async_capable = True
+    safe_methods = ('GET', 'HEAD', 'OPTIONS')
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+            self.process_view = self.aprocess_view
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        token = replica_alias.set(None)
+        try:
+            return self.get_response(request)
+        finally:
+            replica_alias.reset(token)
+
+    async def __acall__(self, request):
+        token = replica_alias.set(None)
+        try:
+            return await self.get_response(request)
+        finally:
+            replica_alias.reset(token)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if request.method in self.safe_methods and view_func.__module__.startswith('watchlist.'):
+            replica_alias.set(choose_replica())
+
+    async def aprocess_view(self, request, view_func, view_args, view_kwargs):
+        return ReplicaRoutingMiddleware.process_view(self, request, view_func, view_args, view_kwargs)
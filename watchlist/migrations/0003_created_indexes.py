@@ -0,0 +1,21 @@
+# Generated by Django 4.2.30 on 2026-10-17 11:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('watchlist', '0002_review'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['created', 'id'], name='review_created_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='watchlist',
+            index=models.Index(fields=['created', 'id'], name='watchlist_created_id_idx'),
+        ),
+    ]
@@ -0,0 +1,56 @@
+# Generated by Django 4.2.30 on 2026-10-17 11:20
+
+from django.db import migrations, models
+from django.db.models import Avg, Count, FloatField, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+
+
+def populate_rating_aggregates(apps, schema_editor):
+    WatchList = apps.get_model('watchlist', 'WatchList')
+    Review = apps.get_model('watchlist', 'Review')
+
+    def per_movie(aggregate, output_field):
+        reviews = (
+            Review.objects.filter(watchlist=OuterRef('pk'))
+            .order_by()
+            .values('watchlist')
+            .annotate(value=aggregate)
+            .values('value')
+        )
+        return Coalesce(Subquery(reviews, output_field=output_field), Value(0), output_field=output_field)
+
+    WatchList.objects.update(
+        rating_sum=per_movie(Sum('rating'), models.PositiveIntegerField()),
+        number_rating=per_movie(Count('id'), models.PositiveIntegerField()),
+        avg_rating=per_movie(Avg('rating'), FloatField()),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('watchlist', '0003_created_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='watchlist',
+            name='avg_rating',
+            field=models.FloatField(default=0, verbose_name='Average rating'),
+        ),
+        migrations.AddField(
+            model_name='watchlist',
+            name='number_rating',
+            field=models.PositiveIntegerField(default=0, verbose_name='Number of ratings'),
+        ),
+        migrations.AddField(
+            model_name='watchlist',
+            name='rating_sum',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name='watchlist',
+            index=models.Index(fields=['avg_rating', 'id'], name='watchlist_avg_rating_idx'),
+        ),
+        migrations.RunPython(populate_rating_aggregates, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,14 @@
+from django.db import migrations
+
+from watchlist.search import install_search_index, uninstall_search_index
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('watchlist', '0004_watchlist_rating_aggregates'),
+    ]
+
+    operations = [
+        migrations.RunPython(install_search_index, uninstall_search_index),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.30 on 2026-10-17 11:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('watchlist', '0005_watchlist_search'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['watchlist', 'active', 'rating'], name='review_movie_active_rating_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='watchlist',
+            index=models.Index(fields=['platform', 'active'], name='watchlist_platform_active_idx'),
+        ),
+    ]
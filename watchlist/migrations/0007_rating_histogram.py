@@ -0,0 +1,41 @@
+# Generated by Django 4.2.30 on 2026-10-17 11:33
+
+from django.db import migrations, models
+from django.db.models import Count, Q
+import django.db.models.deletion
+
+
+def populate_histograms(apps, schema_editor):
+    Review = apps.get_model('watchlist', 'Review')
+    RatingHistogram = apps.get_model('watchlist', 'RatingHistogram')
+    rows = (
+        Review.objects.order_by()
+        .values('watchlist')
+        .annotate(**{f'rating_{n}': Count('id', filter=Q(rating=n)) for n in range(1, 6)})
+    )
+    RatingHistogram.objects.bulk_create(
+        [RatingHistogram(watchlist_id=row.pop('watchlist'), **row) for row in rows],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('watchlist', '0006_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RatingHistogram',
+            fields=[
+                ('watchlist', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='rating_histogram', serialize=False, to='watchlist.watchlist')),
+                ('rating_1', models.PositiveIntegerField(default=0)),
+                ('rating_2', models.PositiveIntegerField(default=0)),
+                ('rating_3', models.PositiveIntegerField(default=0)),
+                ('rating_4', models.PositiveIntegerField(default=0)),
+                ('rating_5', models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.RunPython(populate_histograms, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,52 @@
+# Generated by Django 4.2.30 on 2026-10-17 11:43
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from watchlist.search import install_search_index
+
+
+def populate_trending(apps, schema_editor):
+    WatchList = apps.get_model('watchlist', 'WatchList')
+    Review = apps.get_model('watchlist', 'Review')
+    recent = (
+        Review.objects.filter(watchlist=OuterRef('pk'), created__gte=timezone.now() - timedelta(days=getattr(settings, 'WATCHLIST_TRENDING_DAYS', 7)))
+        .order_by()
+        .values('watchlist')
+        .annotate(value=Count('id'))
+        .values('value')
+    )
+    WatchList.objects.update(trending=Coalesce(Subquery(recent), Value(0)))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('watchlist', '0008_job'),
+    ]
+
+    operations = [
+        # Adding the column rebuilds the table on SQLite, dropping the search
+        # triggers; they are installed again below (and on the way back).
+        migrations.RunPython(migrations.RunPython.noop, install_search_index),
+        migrations.AddField(
+            model_name='watchlist',
+            name='trending',
+            field=models.PositiveIntegerField(default=0, verbose_name='Reviews in trending window'),
+        ),
+        migrations.AddIndex(
+            model_name='watchlist',
+            index=models.Index(fields=['platform', '-avg_rating', '-id'], name='watchlist_platform_top_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='watchlist',
+            index=models.Index(fields=['platform', '-trending', '-id'], name='watchlist_platform_trend_idx'),
+        ),
+        migrations.RunPython(populate_trending, migrations.RunPython.noop),
+        migrations.RunPython(install_search_index, migrations.RunPython.noop),
+    ]
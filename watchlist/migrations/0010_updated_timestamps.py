@@ -0,0 +1,38 @@
+from django.db import migrations, models
+import django.utils.timezone
+
+from watchlist.search import install_search_index
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('watchlist', '0009_watchlist_trending'),
+    ]
+
+    operations = [
+        # Adding the column rebuilds the watchlist table on SQLite, dropping
+        # the search triggers; they are installed again below (and on the way back).
+        migrations.RunPython(migrations.RunPython.noop, install_search_index),
+        migrations.AddField(
+            model_name='streamplatform',
+            name='updated',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='watchlist',
+            name='updated',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+        migrations.AddIndex(
+            model_name='watchlist',
+            index=models.Index(fields=['updated'], name='watchlist_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['updated'], name='review_updated_idx'),
+        ),
+        migrations.RunPython(install_search_index, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 4.2.30 on 2026-10-17 11:53
+
+from django.db import migrations, models
+import django.utils.timezone
+
+from watchlist.changes import install_change_log, uninstall_change_log
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('watchlist', '0010_updated_timestamps'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Change',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('model', models.CharField(choices=[('watchlist', 'Movie'), ('review', 'Review'), ('platform', 'Stream platform')], max_length=10)),
+                ('object_id', models.BigIntegerField()),
+                ('deleted', models.BooleanField(default=False)),
+                ('created', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['created'], name='change_created_idx')],
+            },
+        ),
+        migrations.RunPython(install_change_log, uninstall_change_log),
+    ]
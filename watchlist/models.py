@@ -1,25 +1,232 @@
-from django.db import models
+from collections import Counter
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, connections, models, router, transaction
+from django.db.models import Avg, Case, Count, F, FloatField, OuterRef, Prefetch, Q, Subquery, Sum, Value, When
+from django.db.models.functions import Cast, Coalesce, Now
+from django.db.models.lookups import GreaterThan
 from django.core.validators import MinValueValidator, MaxValueValidator
+from django.utils import timezone
+
+def delete_in_batches(queryset, batch_size=1000):
+    """
+    Delete the rows of ``queryset`` in batches of ``batch_size`` primary keys,
+    each batch in its own short transaction. Rows related to a batch cascade
+    with set-based deletes, so at most one batch is held in memory. Returns
+    the number of deleted rows per model label, as ``QuerySet.delete()`` does.
+    """
+    pks = queryset.order_by().values_list('pk', flat=True)
+    deleted = Counter()
+    while True:
+        with transaction.atomic():
+            batch = list(pks[:batch_size])
+            if not batch:
+                return deleted
+            deleted.update(queryset.model.objects.filter(pk__in=batch).delete()[1])
+
+
+RATINGS = range(1, 6)
+RATING_COLUMNS = tuple(f'rating_{rating}' for rating in RATINGS)
+
+
+class StreamPlatformQuerySet(models.QuerySet):
+    def with_watchlist(self, *fields):
+        """
+        Prefetch related movies in one extra query, loading only the given
+        columns (just the id by default).
+        """
+        movies = WatchList.objects.only('platform', *(fields or ('id',))).order_by('id')
+        return self.prefetch_related(Prefetch('watchlist', queryset=movies))
+
+    def with_rating_histogram(self):
+        """
+        Annotate the summed rating histograms of each platform's movies, as
+        ``rating_1`` .. ``rating_5``, grouped in the same query.
+        """
+        return self.annotate(**{
+            column: Coalesce(Sum(f'watchlist__rating_histogram__{column}'), 0)
+            for column in RATING_COLUMNS
+        })
+
+    def touch(self):
+        """
+        Mark the platforms as changed when a movie leaves them, which no
+        remaining movie's ``updated`` shows.
+        """
+        return self.update(updated=Now())
+
 
 class StreamPlatform(models.Model):
     name = models.CharField(max_length=30)
     about = models.CharField(max_length=150)
     website = models.URLField(max_length=100)
+    updated = models.DateTimeField(auto_now=True)
+
+    objects = StreamPlatformQuerySet.as_manager()
     
     def __str__(self):
         return self.name
+
+    def delete_related_in_batches(self, batch_size=1000):
+        """
+        Remove the platform's movies, and their reviews, ``batch_size``
+        movies at a time.
+        """
+        return delete_in_batches(WatchList.objects.filter(platform=self), batch_size)
+
+    def delete_in_batches(self, batch_size=1000):
+        """
+        Delete the platform after removing its movies in batches.
+        """
+        deleted = self.delete_related_in_batches(batch_size)
+        deleted.update(self.delete()[1])
+        return deleted
     
-    
+
+class WatchListQuerySet(models.QuerySet):
+    def with_reviews(self, reviews=None):
+        """
+        Load the platform in the same query and all reviews in one extra query,
+        so serializing nested reviews costs a constant number of queries.
+        """
+        if reviews is None:
+            reviews = Review.objects.order_by('id')
+        return self.select_related('platform').prefetch_related(
+            Prefetch('reviews', queryset=reviews)
+        )
+
+    def touch(self):
+        """
+        Mark the movies as changed, for review writes whose aggregates are
+        rebuilt later.
+        """
+        return self.update(updated=Now())
+
+    def with_rating_histogram(self):
+        """
+        Annotate each movie's rating histogram, as ``rating_1`` .. ``rating_5``,
+        joined in the same query.
+        """
+        return self.annotate(**{
+            column: Coalesce(F(f'rating_histogram__{column}'), 0)
+            for column in RATING_COLUMNS
+        })
+
+    def apply_rating_change(self, pk, rating_delta, count_delta, trending_delta=0):
+        """
+        Atomically shift the running rating sum, count and trending count of
+        one movie and recompute its average in the same UPDATE statement,
+        marking the movie as updated.
+        """
+        new_sum = F('rating_sum') + rating_delta
+        new_count = F('number_rating') + count_delta
+        changes = {}
+        if trending_delta:
+            changes['trending'] = F('trending') + trending_delta
+        return self.filter(pk=pk).update(
+            rating_sum=new_sum,
+            number_rating=new_count,
+            avg_rating=Case(
+                When(GreaterThan(new_count, 0), then=Cast(new_sum, FloatField()) / new_count),
+                default=Value(0.0),
+                output_field=FloatField(),
+            ),
+            updated=Now(),
+            **changes,
+        )
+
+    def recompute_ratings(self):
+        """
+        Rebuild rating aggregates, trending counts and rating histograms for
+        every movie in the queryset from the Review table with set-based queries.
+        """
+        count = self.update(
+            rating_sum=per_movie_reviews(Sum('rating'), models.PositiveIntegerField()),
+            number_rating=per_movie_reviews(Count('id'), models.PositiveIntegerField()),
+            avg_rating=per_movie_reviews(Avg('rating'), FloatField()),
+            trending=per_movie_reviews(
+                Count('id', filter=Q(created__gte=trending_since())), models.PositiveIntegerField()
+            ),
+            updated=Now(),
+        )
+        RatingHistogram.objects.rebuild(self.values('pk'))
+        return count
+
+    def recompute_trending(self, since=None):
+        """
+        Recount the reviews each movie in the queryset received since the
+        start of the trending window, with a single set-based UPDATE.
+        """
+        since = since or trending_since()
+        return self.update(trending=per_movie_reviews(
+            Count('id'), models.PositiveIntegerField(), created__gte=since,
+        ))
+
+
+def per_movie_reviews(aggregate, output_field, **filters):
+    """
+    Correlated subquery aggregating the reviews of the outer movie row,
+    0 when it has none.
+    """
+    reviews = (
+        Review.objects.filter(watchlist=OuterRef('pk'), **filters)
+        .order_by()
+        .values('watchlist')
+        .annotate(value=aggregate)
+        .values('value')
+    )
+    return Coalesce(Subquery(reviews, output_field=output_field), Value(0), output_field=output_field)
+
+
+def trending_since(now=None):
+    """
+    Start of the trending window, ``WATCHLIST_TRENDING_DAYS`` before now.
+    """
+    days = getattr(settings, 'WATCHLIST_TRENDING_DAYS', 7)
+    return (now or timezone.now()) - timedelta(days=days)
+
+
 class WatchList(models.Model):
     title = models.CharField(max_length=50, verbose_name="Movie title")
     storyline = models.CharField(max_length=200, verbose_name="Storyline")
     platform = models.ForeignKey(StreamPlatform, on_delete=models.CASCADE ,related_name="watchlist")
     active = models.BooleanField(default=True, verbose_name="Active")
     created = models.DateTimeField(auto_now_add=True)
-    
+    avg_rating = models.FloatField(default=0, verbose_name="Average rating")
+    number_rating = models.PositiveIntegerField(default=0, verbose_name="Number of ratings")
+    rating_sum = models.PositiveIntegerField(default=0)
+    trending = models.PositiveIntegerField(default=0, verbose_name="Reviews in trending window")
+    updated = models.DateTimeField(auto_now=True)
+
+    objects = WatchListQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['created', 'id'], name='watchlist_created_id_idx'),
+            models.Index(fields=['avg_rating', 'id'], name='watchlist_avg_rating_idx'),
+            models.Index(fields=['platform', 'active'], name='watchlist_platform_active_idx'),
+            models.Index(fields=['platform', '-avg_rating', '-id'], name='watchlist_platform_top_idx'),
+            models.Index(fields=['platform', '-trending', '-id'], name='watchlist_platform_trend_idx'),
+            models.Index(fields=['updated'], name='watchlist_updated_idx'),
+        ]
     
     def __str__(self): 
         return self.title
+
+    def delete_related_in_batches(self, batch_size=10000):
+        """
+        Remove the movie's reviews ``batch_size`` at a time.
+        """
+        return delete_in_batches(Review.objects.filter(watchlist=self), batch_size)
+
+    def delete_in_batches(self, batch_size=10000):
+        """
+        Delete the movie after removing its reviews in batches.
+        """
+        deleted = self.delete_related_in_batches(batch_size)
+        deleted.update(self.delete()[1])
+        return deleted
     
 class Review(models.Model):
     rating = models.PositiveIntegerField(validators=[MinValueValidator(1), MaxValueValidator(5)], verbose_name="Rating")
@@ -28,6 +235,171 @@ class Review(models.Model):
     active = models.BooleanField(default=True)
     created = models.DateTimeField(auto_now_add=True)
     updated = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['created', 'id'], name='review_created_id_idx'),
+            models.Index(fields=['watchlist', 'active', 'rating'], name='review_movie_active_rating_idx'),
+            models.Index(fields=['updated'], name='review_updated_idx'),
+        ]
     
     def __str__(self):
-        return str(self.rating) + "-" + str(self.watchlist.title)
\ No newline at end of file
+        return str(self.rating) + "-" + str(self.watchlist.title)
+
+
+class RatingHistogramQuerySet(models.QuerySet):
+    def apply_rating_change(self, watchlist_id, rating, delta):
+        """
+        Atomically add ``delta`` to one movie's count of ``rating``, creating
+        its histogram row on first use.
+        """
+        column = f'rating_{rating}'
+        if self.filter(pk=watchlist_id).update(**{column: F(column) + delta}):
+            return
+        try:
+            with transaction.atomic():
+                self.create(watchlist_id=watchlist_id, **{column: max(delta, 0)})
+        except IntegrityError:
+            # Created concurrently; apply the change to that row instead.
+            self.filter(pk=watchlist_id).update(**{column: F(column) + delta})
+
+    def rebuild(self, movies=None):
+        """
+        Recompute histograms from the Review table with one set-based
+        ``INSERT ... SELECT`` of grouped aggregates, for the given movie ids
+        (or id subquery) or for every movie, so no rows pass through Python.
+        """
+        db = router.db_for_write(self.model)
+        reviews = Review.objects.using(db)
+        histograms = self.using(db)
+        if movies is not None:
+            reviews = reviews.filter(watchlist__in=movies)
+            histograms = histograms.filter(watchlist__in=movies)
+        rows = (
+            reviews.order_by()
+            .values('watchlist')
+            .annotate(**{
+                column: Count('id', filter=Q(rating=rating))
+                for rating, column in zip(RATINGS, RATING_COLUMNS)
+            })
+        )
+        histograms.delete()
+        connection = connections[db]
+        sql, params = rows.query.sql_with_params()
+        columns = ', '.join(connection.ops.quote_name(column) for column in ['watchlist_id', *RATING_COLUMNS])
+        table = connection.ops.quote_name(self.model._meta.db_table)
+        with connection.cursor() as cursor:
+            cursor.execute(f'INSERT INTO {table} ({columns}) {sql}', params)
+
+
+def rating_summary(row):
+    """
+    Build the summary payload from a row holding ``rating_1`` .. ``rating_5``.
+    """
+    counts = [row[column] for column in RATING_COLUMNS]
+    total = sum(counts)
+    weighted = sum(rating * count for rating, count in zip(RATINGS, counts))
+    return {
+        'total': total,
+        'mean': round(weighted / total, 2) if total else None,
+        'histogram': {str(rating): count for rating, count in zip(RATINGS, counts)},
+    }
+
+
+class RatingHistogram(models.Model):
+    """
+    Per-movie count of reviews for each rating, kept up to date on review
+    writes so rating distributions never need to aggregate the Review table.
+    """
+    watchlist = models.OneToOneField(WatchList, on_delete=models.CASCADE, primary_key=True,
+                                     related_name="rating_histogram")
+    rating_1 = models.PositiveIntegerField(default=0)
+    rating_2 = models.PositiveIntegerField(default=0)
+    rating_3 = models.PositiveIntegerField(default=0)
+    rating_4 = models.PositiveIntegerField(default=0)
+    rating_5 = models.PositiveIntegerField(default=0)
+
+    objects = RatingHistogramQuerySet.as_manager()
+
+    def __str__(self):
+        return f"Ratings of {self.watchlist_id}"
+
+
+def record_review_change(old=None, new=None, created=None):
+    """
+    Fold a review write into the movie's rating aggregates and histogram.
+
+    ``old`` and ``new`` are ``(watchlist_id, rating)`` of the review before and
+    after the write; ``old`` is None for creates and ``new`` for deletes.
+    ``created`` is the review's creation time, which decides whether it counts
+    towards the trending window.
+    """
+    if old == new:
+        return
+    trending = int(created is not None and created >= trending_since())
+    if old is not None and new is not None and old[0] == new[0]:
+        WatchList.objects.apply_rating_change(new[0], new[1] - old[1], 0)
+    else:
+        if old is not None:
+            WatchList.objects.apply_rating_change(old[0], -old[1], -1, -trending)
+        if new is not None:
+            WatchList.objects.apply_rating_change(new[0], new[1], 1, trending)
+    if old is not None:
+        RatingHistogram.objects.apply_rating_change(old[0], old[1], -1)
+    if new is not None:
+        RatingHistogram.objects.apply_rating_change(new[0], new[1], 1)
+
+
+class Job(models.Model):
+    """
+    A pending background task for one key, run by the ``run_jobs`` worker.
+
+    Enqueueing a task for a key that already has a pending job is a no-op,
+    so repeated writes to the same movie coalesce into a single job.
+    """
+    task = models.CharField(max_length=100)
+    key = models.CharField(max_length=100)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    run_after = models.DateTimeField(default=timezone.now)
+    failed = models.BooleanField(default=False)
+    last_error = models.TextField(blank=True)
+    created = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['task', 'key'], condition=Q(failed=False),
+                                    name='job_pending_task_key_uniq'),
+        ]
+        indexes = [
+            models.Index(fields=['failed', 'run_after'], name='job_failed_run_after_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.task}({self.key})"
+
+
+class Change(models.Model):
+    """
+    One write to a movie, review or platform row, for the ``/changes/`` feed.
+
+    Rows are inserted by database triggers (see :mod:`watchlist.changes`), so
+    every write path is logged, including bulk writes, queryset updates and
+    cascading deletes. Deletes leave a tombstone with ``deleted`` set.
+    """
+    WATCHLIST = 'watchlist'
+    REVIEW = 'review'
+    PLATFORM = 'platform'
+    MODEL_CHOICES = [(WATCHLIST, 'Movie'), (REVIEW, 'Review'), (PLATFORM, 'Stream platform')]
+
+    model = models.CharField(max_length=10, choices=MODEL_CHOICES)
+    object_id = models.BigIntegerField()
+    deleted = models.BooleanField(default=False)
+    created = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['created'], name='change_created_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.model}:{self.object_id}{' deleted' if self.deleted else ''}"
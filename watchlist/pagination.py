@@ -0,0 +1,85 @@
+from collections import OrderedDict
+
+from rest_framework.pagination import BasePagination, CursorPagination, _positive_int
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class CreatedCursorPagination(CursorPagination):
+    """
+    Keyset pagination over (created, id).
+
+    The cursor encodes the last seen position, so every page is an index
+    range scan instead of an OFFSET scan over all previous rows.
+    """
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    ordering = ('-created', '-id')
+
+
+class IdCursorPagination(CursorPagination):
+    """
+    Keyset pagination over the primary key, for models without a created timestamp.
+    """
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    ordering = ('id',)
+
+
+class RankedPagination(BasePagination):
+    """
+    Page-number pagination for ranked results that cannot be keyset paginated.
+
+    ``fetch(limit, offset)`` returns ranked rows; one extra row is requested to
+    tell whether a next page exists, so no COUNT query is needed.
+    """
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    page_query_param = 'page'
+
+    def get_page_size(self, request):
+        try:
+            return _positive_int(
+                request.query_params[self.page_size_query_param],
+                strict=True, cutoff=self.max_page_size,
+            )
+        except (KeyError, ValueError):
+            return self.page_size
+
+    def get_page_number(self, request):
+        try:
+            return _positive_int(request.query_params[self.page_query_param], strict=True)
+        except (KeyError, ValueError):
+            return 1
+
+    def paginate_ranked(self, fetch, request):
+        self.request = request
+        size = self.get_page_size(request)
+        self.page = self.get_page_number(request)
+        rows = fetch(size + 1, (self.page - 1) * size)
+        self.has_next = len(rows) > size
+        return rows[:size]
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.page_query_param, self.page + 1)
+
+    def get_previous_link(self):
+        if self.page == 1:
+            return None
+        url = self.request.build_absolute_uri()
+        if self.page == 2:
+            return remove_query_param(url, self.page_query_param)
+        return replace_query_param(url, self.page_query_param, self.page - 1)
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data),
+        ]))
@@ -0,0 +1,80 @@
+import json
+
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional
+    orjson = None
+
+
+def _default(obj):
+    return JSONEncoder().default(obj)
+
+
+def dumps(data):
+    """
+    Serialize to compact UTF-8 JSON bytes, with orjson when it is installed
+    and the stdlib encoder otherwise.
+    """
+    if orjson is not None:
+        return orjson.dumps(data, default=_default, option=orjson.OPT_UTC_Z)
+    return json.dumps(data, cls=JSONEncoder, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer that encodes with orjson when it is installed.
+
+    Requests asking for indented output, and installs without orjson, fall
+    back to the stdlib encoder.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or data is None:
+            return super().render(data, accepted_media_type, renderer_context)
+        renderer_context = renderer_context or {}
+        if self.get_indent(accepted_media_type or '', renderer_context):
+            return super().render(data, accepted_media_type, renderer_context)
+        return dumps(data)
+
+
+class NDJSONRenderer(BaseRenderer):
+    """
+    Renders a list as newline-delimited JSON, one object per line.
+    """
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        if not isinstance(data, list):
+            data = [data]
+        return b''.join(dump_line(item) for item in data)
+
+
+def dump_line(item):
+    return dumps(item) + b'\n'
+
+
+def stream_ndjson(rows):
+    """
+    Yield each serialized row as an NDJSON line.
+    """
+    for row in rows:
+        yield dump_line(row)
+
+
+def stream_json_array(rows):
+    """
+    Yield serialized rows as the pieces of a single JSON array.
+    """
+    yield b'['
+    separator = b''
+    for row in rows:
+        yield separator + dumps(row)
+        separator = b','
+    yield b']'
@@ -0,0 +1,132 @@
+"""
+Full-text search over movie titles and storylines.
+
+On SQLite an external-content FTS5 table mirrors ``watchlist_watchlist`` and
+is kept in sync by triggers, so every write path (ORM saves, bulk_create,
+queryset updates and deletes) updates the index. On PostgreSQL a GIN index
+over the same ``to_tsvector`` expression that ``SearchVector`` emits is used.
+Other backends fall back to ``icontains`` filtering.
+"""
+import re
+
+from django.db import connection
+from django.db.models import Q
+
+FTS_TABLE = 'watchlist_watchlist_fts'
+TITLE_WEIGHT = 10.0
+STORYLINE_WEIGHT = 1.0
+
+SQLITE_INSTALL = [
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        title, storyline, content='watchlist_watchlist', content_rowid='id'
+    )""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_insert AFTER INSERT ON watchlist_watchlist BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, title, storyline) VALUES (new.id, new.title, new.storyline);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_delete AFTER DELETE ON watchlist_watchlist BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, storyline)
+        VALUES ('delete', old.id, old.title, old.storyline);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_update AFTER UPDATE OF title, storyline ON watchlist_watchlist BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, storyline)
+        VALUES ('delete', old.id, old.title, old.storyline);
+        INSERT INTO {FTS_TABLE}(rowid, title, storyline) VALUES (new.id, new.title, new.storyline);
+    END""",
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')",
+]
+
+SQLITE_UNINSTALL = [
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_insert",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_delete",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_update",
+    f"DROP TABLE IF EXISTS {FTS_TABLE}",
+]
+
+POSTGRES_INSTALL = [
+    """CREATE INDEX IF NOT EXISTS watchlist_watchlist_search_idx ON watchlist_watchlist USING GIN (
+        to_tsvector('english'::regconfig,
+                    COALESCE((title)::text, '') || ' ' || COALESCE((storyline)::text, ''))
+    )""",
+]
+
+POSTGRES_UNINSTALL = [
+    "DROP INDEX IF EXISTS watchlist_watchlist_search_idx",
+]
+
+
+def _execute(schema_editor, statements):
+    for statement in statements:
+        schema_editor.execute(statement)
+
+
+def install_search_index(apps, schema_editor):
+    """
+    Migration operation creating the search index for the current backend.
+    It is idempotent, so migrations that rebuild the watchlist table on
+    SQLite (which drops its triggers) can run it again.
+    """
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        _execute(schema_editor, SQLITE_INSTALL)
+    elif vendor == 'postgresql':
+        _execute(schema_editor, POSTGRES_INSTALL)
+
+
+def uninstall_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        _execute(schema_editor, SQLITE_UNINSTALL)
+    elif vendor == 'postgresql':
+        _execute(schema_editor, POSTGRES_UNINSTALL)
+
+
+def search_terms(text):
+    return re.findall(r'\w+', text or '')
+
+
+def fts5_query(terms):
+    """
+    Build an FTS5 MATCH expression requiring every term, with prefix
+    matching on the last one so partially typed words still match.
+    """
+    quoted = [f'"{term}"' for term in terms]
+    quoted[-1] += '*'
+    return ' '.join(quoted)
+
+
+def search_movie_ids(text, limit, offset=0):
+    """
+    Return the ids of the movies best matching ``text``, best match first.
+    """
+    terms = search_terms(text)
+    if not terms:
+        return []
+
+    if connection.vendor == 'sqlite':
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s "
+                f"ORDER BY bm25({FTS_TABLE}, %s, %s) LIMIT %s OFFSET %s",
+                [fts5_query(terms), TITLE_WEIGHT, STORYLINE_WEIGHT, limit, offset],
+            )
+            return [row[0] for row in cursor.fetchall()]
+
+    from watchlist.models import WatchList
+
+    if connection.vendor == 'postgresql':
+        from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+
+        vector = SearchVector('title', 'storyline', config='english')
+        query = SearchQuery(' '.join(terms), config='english')
+        queryset = (
+            WatchList.objects.annotate(search=vector)
+            .filter(search=query)
+            .annotate(rank=SearchRank(vector, query))
+            .order_by('-rank', 'id')
+        )
+    else:
+        condition = Q()
+        for term in terms:
+            condition &= Q(title__icontains=term) | Q(storyline__icontains=term)
+        queryset = WatchList.objects.filter(condition).order_by('id')
+    return list(queryset.values_list('id', flat=True)[offset:offset + limit])
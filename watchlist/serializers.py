@@ -1,25 +1,329 @@
+from functools import lru_cache
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.urls import reverse
+from django.utils import timezone
 from rest_framework import serializers
 from watchlist.models import WatchList, StreamPlatform, Review 
 
-class ReviewSerializer(serializers.ModelSerializer):
+
+class BulkPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
+    """
+    Primary key field that resolves against objects prefetched by a
+    BulkListSerializer instead of issuing one query per item.
+    """
+    def to_internal_value(self, data):
+        related = getattr(self.root, 'related_objects', None)
+        if related is None or self.field_name not in related:
+            return super().to_internal_value(data)
+        if isinstance(data, bool):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        try:
+            pk = self.get_queryset().model._meta.pk.to_python(data)
+        except DjangoValidationError:
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        obj = related[self.field_name].get(pk)
+        if obj is None:
+            self.fail('does_not_exist', pk_value=data)
+        return obj
+
+
+class BulkListSerializer(serializers.ListSerializer):
+    """
+    List serializer that writes with bulk_create/bulk_update.
+
+    Foreign keys of the whole payload are fetched with one query per
+    relation before the items are validated. For updates, ``instance`` is a
+    mapping of primary key to object and every item must carry its ``id``.
+    """
+    batch_size = 1000
+
+    def to_internal_value(self, data):
+        if isinstance(data, list):
+            self.related_objects = self.fetch_related(data)
+        self.matched_instances = []
+        return super().to_internal_value(data)
+
+    def fetch_related(self, data):
+        related = {}
+        for name, field in self.child.fields.items():
+            if not isinstance(field, BulkPrimaryKeyRelatedField) or field.read_only:
+                continue
+            pk_field = field.get_queryset().model._meta.pk
+            pks = set()
+            for item in data:
+                if not isinstance(item, dict) or isinstance(item.get(name), bool):
+                    continue
+                try:
+                    pks.add(pk_field.to_python(item.get(name)))
+                except DjangoValidationError:
+                    pass
+            pks.discard(None)
+            related[name] = field.get_queryset().in_bulk(pks)
+        return related
+
+    def run_child_validation(self, data):
+        if self.instance is None:
+            return super().run_child_validation(data)
+        instance = None
+        if isinstance(data, dict):
+            try:
+                instance = self.instance.get(self.child.Meta.model._meta.pk.to_python(data.get('id')))
+            except DjangoValidationError:
+                pass
+        if instance is None:
+            raise serializers.ValidationError({'id': ["Object with this id does not exist."]})
+        self.child.instance = instance
+        validated = super().run_child_validation(data)
+        self.matched_instances.append(instance)
+        return validated
+
+    def create(self, validated_data):
+        model = self.child.Meta.model
+        objs = [model(**attrs) for attrs in validated_data]
+        return model.objects.bulk_create(objs, batch_size=self.batch_size)
+
+    def update(self, instance, validated_data):
+        model = self.child.Meta.model
+        auto_now = [f for f in model._meta.concrete_fields if getattr(f, 'auto_now', False)]
+        now = timezone.now()
+        objs = []
+        fields = {f.name for f in auto_now}
+        for obj, attrs in zip(self.matched_instances, validated_data):
+            for attr, value in attrs.items():
+                setattr(obj, attr, value)
+                fields.add(attr)
+            for field in auto_now:
+                setattr(obj, field.attname, now)
+            objs.append(obj)
+        model.objects.bulk_update(objs, sorted(fields), batch_size=self.batch_size)
+        return objs
+
+
+@lru_cache(maxsize=None)
+def url_template(view_name):
+    """
+    Resolve a ``<int:pk>`` detail route once and return the path parts
+    before and after the primary key.
+    """
+    sentinel = 987654321
+    path = reverse(view_name, kwargs={'pk': sentinel})
+    prefix, suffix = path.split(str(sentinel))
+    return prefix, suffix
+
+
+class HyperlinkListField(serializers.Field):
+    """
+    Read-only field rendering related objects as detail URLs.
+
+    Unlike ``HyperlinkedRelatedField(many=True)`` the route is reversed once
+    and each link is built by string formatting, so only the related ids are
+    needed. Links are absolute when a request is in the serializer context.
+    """
+    def __init__(self, view_name, **kwargs):
+        kwargs['read_only'] = True
+        super().__init__(**kwargs)
+        self.view_name = view_name
+        self._template = None
+
+    def get_template(self):
+        if self._template is None:
+            prefix, suffix = url_template(self.view_name)
+            request = self.context.get('request')
+            if request is not None:
+                prefix = request.build_absolute_uri(prefix)
+            self._template = prefix, suffix
+        return self._template
+
+    def to_representation(self, value):
+        prefix, suffix = self.get_template()
+        return [f'{prefix}{obj.pk}{suffix}' for obj in value.all()]
+
+
+class SparseFieldsMixin:
+    """
+    Drops every field not listed in the ``fields`` entry of the serializer
+    context, for ``?fields=`` sparse fieldsets.
+    """
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        fields = self.context.get('fields')
+        if fields:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
+
+class UpdateFieldsMixin:
+    """
+    Saves updates with ``save(update_fields=...)`` listing only the columns
+    whose value changed (plus ``auto_now`` columns), and skips the query
+    entirely when nothing changed.
+    """
+    def update(self, instance, validated_data):
+        opts = instance._meta
+        changed = []
+        for attr, value in validated_data.items():
+            field = opts.get_field(attr)
+            new = value.pk if field.is_relation and value is not None else value
+            if getattr(instance, field.attname) != new:
+                setattr(instance, attr, value)
+                changed.append(attr)
+        if changed:
+            changed += [f.name for f in opts.concrete_fields if getattr(f, 'auto_now', False)]
+            instance.save(update_fields=changed)
+        return instance
+
+
+class ReviewSerializer(UpdateFieldsMixin, serializers.ModelSerializer):
+    serializer_related_field = BulkPrimaryKeyRelatedField
     
     class Meta:
         model = Review 
         fields = "__all__"
+        list_serializer_class = BulkListSerializer
         
-class WatchListSerializer(serializers.ModelSerializer): 
+class WatchListSerializer(UpdateFieldsMixin, serializers.ModelSerializer): 
+    serializer_related_field = BulkPrimaryKeyRelatedField
     reviews = ReviewSerializer(many=True, read_only=True)
     class Meta:
         model = WatchList
-        fields = "__all__"
+        # The trending count backs the leaderboards and is not part of the movie.
+        exclude = ["trending"]
+        read_only_fields = ["avg_rating", "number_rating", "rating_sum"]
+        list_serializer_class = BulkListSerializer
     
-class StreamPlatformSerializer(serializers.ModelSerializer):
+class WatchListSummarySerializer(serializers.ModelSerializer):
+
+    class Meta:
+        model = WatchList
+        fields = ["id", "title", "active", "avg_rating"]
+
+
+class StreamPlatformSerializer(SparseFieldsMixin, UpdateFieldsMixin, serializers.ModelSerializer):
     # watchlist is name which is given in foreign key as related name
-    watchlist = serializers.HyperlinkedRelatedField(many=True, read_only=True, view_name="movie-detail")
+    watchlist = HyperlinkListField(view_name="movie-detail")
     
     class Meta:
         model = StreamPlatform
         fields = "__all__"        
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        if 'watchlist' in self.fields and 'watchlist' in self.context.get('expand', ()):
+            self.fields['watchlist'] = WatchListSummarySerializer(many=True, read_only=True)
+
+
+        
+
+def format_datetime(value):
+    """
+    Format a datetime the way DRF's ``DateTimeField`` does with the default
+    ISO 8601 output format.
+    """
+    if value is None:
+        return None
+    value = timezone.localtime(value) if timezone.is_aware(value) else value
+    value = value.isoformat()
+    if value.endswith('+00:00'):
+        value = value[:-6] + 'Z'
+    return value
+
+
+class ValuesSerializer:
+    """
+    Read-only serializer for ``.values()`` rows.
+
+    Output matches the corresponding ModelSerializer, but rows are plain dicts
+    fetched with :meth:`values`, so there is no model instantiation or
+    per-field dispatch. Use it for read-heavy list endpoints.
+    """
+    fields = ()
+    datetime_fields = ()
+
+    def __init__(self, instance=None, many=False, context=None):
+        self.instance = instance
+        self.many = many
+        self.context = context or {}
+
+    @classmethod
+    def values(cls, queryset):
+        return queryset.values(*cls.fields)
+
+    def load_related(self, rows):
+        """
+        Hook to fetch nested data for all rows at once.
+        """
+
+    def to_representation(self, row):
+        for name in self.datetime_fields:
+            row[name] = format_datetime(row[name])
+        return row
+
+    @property
+    def data(self):
+        rows = list(self.instance) if self.many else [self.instance]
+        self.load_related(rows)
+        data = [self.to_representation(dict(row)) for row in rows]
+        return data if self.many else data[0]
+
+
+class ReviewValuesSerializer(ValuesSerializer):
+    fields = ('id', 'rating', 'description', 'active', 'created', 'updated', 'watchlist')
+    datetime_fields = ('created', 'updated')
+
+
+class WatchListValuesSerializer(ValuesSerializer):
+    fields = ('id', 'title', 'storyline', 'active', 'created',
+              'avg_rating', 'number_rating', 'rating_sum', 'updated', 'platform')
+    datetime_fields = ('created', 'updated')
+
+    def load_related(self, rows):
+        reviews = Review.objects.filter(watchlist__in=[row['id'] for row in rows]).order_by('id')
+        self.reviews = {}
+        for review in ReviewValuesSerializer(ReviewValuesSerializer.values(reviews), many=True).data:
+            self.reviews.setdefault(review['watchlist'], []).append(review)
+
+    def to_representation(self, row):
+        row = super().to_representation(row)
+        pk = row.pop('id')
+        return {'id': pk, 'reviews': self.reviews.get(pk, []), **row}
+
+
+class WatchListChangeSerializer(ValuesSerializer):
+    """
+    Movie rows of the change feed, without nested reviews: they are fed as
+    changes of their own.
+    """
+    fields = WatchListValuesSerializer.fields
+    datetime_fields = WatchListValuesSerializer.datetime_fields
+
+
+class StreamPlatformValuesSerializer(ValuesSerializer):
+    fields = ('id', 'name', 'about', 'website', 'updated')
+    datetime_fields = ('updated',)
+
+    def load_related(self, rows):
+        prefix, suffix = url_template('movie-detail')
+        request = self.context.get('request')
+        if request is not None:
+            prefix = request.build_absolute_uri(prefix)
+        movies = (
+            WatchList.objects.filter(platform__in=[row['id'] for row in rows])
+            .order_by('id')
+            .values_list('platform', 'id')
+        )
+        self.links = {}
+        for platform_id, movie_id in movies:
+            self.links.setdefault(platform_id, []).append(f'{prefix}{movie_id}{suffix}')
+
+    def to_representation(self, row):
+        pk = row.pop('id')
+        return {'id': pk, 'watchlist': self.links.get(pk, []), **row}
+
 
-        
\ No newline at end of file
+class StreamPlatformChangeSerializer(ValuesSerializer):
+    """
+    Platform rows of the change feed, without movie links.
+    """
+    fields = StreamPlatformValuesSerializer.fields
+    datetime_fields = StreamPlatformValuesSerializer.datetime_fields
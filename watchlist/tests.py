@@ -1,3 +1,1104 @@
-from django.test import TestCase
+import json
+import tempfile
+from io import StringIO
+from pathlib import Path
+from unittest import skipUnless
+from datetime import timedelta
+from unittest.mock import patch
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test import RequestFactory, TestCase as DjangoTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from watchlist.db import ReplicaRouter, read_from_replicas, replica_alias
+from watchlist.metrics import registry
+from watchlist.middleware import ReplicaRoutingMiddleware
+from watchlist.jobs import enqueue
+from watchlist.models import WatchList, WatchListQuerySet, StreamPlatform, Review, Job, RatingHistogram, Change
+from watchlist.renderers import FastJSONRenderer
+from watchlist.views import ChangeFeedView
+from watchlist.serializers import (
+    WatchListSerializer, StreamPlatformSerializer, ReviewSerializer,
+    WatchListValuesSerializer, StreamPlatformValuesSerializer, ReviewValuesSerializer,
+)
 
-# Create your tests here.
+
+class TestCase(DjangoTestCase):
+
+    def setUp(self):
+        cache.clear()
+
+    def create_platform(self, name="Netflix", website="https://netflix.com"):
+        return StreamPlatform.objects.create(name=name, about="Streaming platform", website=website)
+
+
+class WatchListQueryCountTests(TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.platform = self.create_platform()
+
+    def create_movies(self, count):
+        for i in range(count):
+            movie = WatchList.objects.create(
+                title=f"Movie {i}", storyline="Storyline", platform=self.platform
+            )
+            Review.objects.create(rating=4, description="Good", watchlist=movie)
+            Review.objects.create(rating=2, description="Bad", watchlist=movie)
+
+    def test_list_query_count_is_constant(self):
+        self.create_movies(1)
+        # Two Last-Modified maxima, the page and its reviews.
+        with self.assertNumQueries(4):
+            response = self.client.get(reverse('watch-list'))
+        self.assertEqual(len(response.json()['results']), 1)
+
+        self.create_movies(10)
+        cache.clear()
+        with self.assertNumQueries(4):
+            response = self.client.get(reverse('watch-list'))
+        self.assertEqual(len(response.json()['results']), 11)
+        self.assertEqual(len(response.json()['results'][0]['reviews']), 2)
+
+    def test_detail_query_count(self):
+        self.create_movies(1)
+        movie = WatchList.objects.get()
+        # Last-Modified, the movie with its platform, its reviews.
+        with self.assertNumQueries(3):
+            response = self.client.get(reverse('movie-detail', args=[movie.pk]))
+        self.assertEqual(len(response.json()['reviews']), 2)
+
+
+class CursorPaginationTests(TestCase):
+
+    def setUp(self):
+        super().setUp()
+        platform = self.create_platform()
+        for i in range(5):
+            WatchList.objects.create(title=f"Movie {i}", storyline="Storyline", platform=platform)
+
+    def test_pages_cover_every_movie_once(self):
+        url = reverse('watch-list') + '?page_size=2'
+        titles = []
+        while url:
+            data = self.client.get(url).json()
+            titles.extend(movie['title'] for movie in data['results'])
+            url = data['next']
+        self.assertEqual(titles, [f"Movie {i}" for i in reversed(range(5))])
+
+
+class StreamingResponseTests(TestCase):
+
+    def setUp(self):
+        super().setUp()
+        platform = self.create_platform()
+        for i in range(3):
+            movie = WatchList.objects.create(title=f"Movie {i}", storyline="Storyline", platform=platform)
+            Review.objects.create(rating=3, watchlist=movie)
+
+    def test_ndjson_stream(self):
+        response = self.client.get(reverse('watch-list'), HTTP_ACCEPT='application/x-ndjson')
+        self.assertTrue(response.streaming)
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        rows = [json.loads(line) for line in lines]
+        self.assertEqual([row['title'] for row in rows], ["Movie 2", "Movie 1", "Movie 0"])
+        self.assertEqual(len(rows[0]['reviews']), 1)
+
+    def test_json_array_stream(self):
+        response = self.client.get(reverse('watch-list') + '?stream=1')
+        self.assertTrue(response.streaming)
+        rows = json.loads(b''.join(response.streaming_content))
+        self.assertEqual(len(rows), 3)
+
+
+class RatingAggregateTests(TestCase):
+
+    def setUp(self):
+        super().setUp()
+        platform = self.create_platform()
+        self.movie = WatchList.objects.create(title="Movie", storyline="Storyline", platform=platform)
+
+    def post_review(self, rating):
+        response = self.client.post(
+            reverse('review-list'), {'rating': rating, 'watchlist': self.movie.pk}
+        )
+        self.assertEqual(response.status_code, 201)
+        return response.json()['id']
+
+    def test_review_writes_update_aggregates(self):
+        first = self.post_review(5)
+        self.post_review(2)
+        self.movie.refresh_from_db()
+        self.assertEqual((self.movie.number_rating, self.movie.avg_rating), (2, 3.5))
+
+        self.client.put(
+            reverse('review-detail', args=[first]),
+            {'rating': 3, 'watchlist': self.movie.pk},
+            content_type='application/json',
+        )
+        self.movie.refresh_from_db()
+        self.assertEqual((self.movie.number_rating, self.movie.avg_rating), (2, 2.5))
+
+        self.client.delete(reverse('review-detail', args=[first]))
+        self.movie.refresh_from_db()
+        self.assertEqual((self.movie.number_rating, self.movie.avg_rating), (1, 2.0))
+
+    def test_rebuild_ratings_command(self):
+        Review.objects.create(rating=4, watchlist=self.movie)
+        Review.objects.create(rating=1, watchlist=self.movie)
+        with CaptureQueriesContext(connection) as queries:
+            call_command('rebuild_ratings', stdout=StringIO())
+        inserts = [q['sql'] for q in queries if q['sql'].startswith('INSERT INTO "watchlist_ratinghistogram"')]
+        # Set-based: one INSERT ... SELECT, whatever the number of movies.
+        self.assertEqual(len(inserts), 1)
+        self.assertIn('SELECT', inserts[0])
+        self.movie.refresh_from_db()
+        self.assertEqual((self.movie.number_rating, self.movie.rating_sum, self.movie.avg_rating), (2, 5, 2.5))
+        self.assertEqual(self.client.get(reverse('movie-review-summary', args=[self.movie.pk])).json(), {
+            'total': 2, 'mean': 2.5, 'histogram': {'1': 1, '2': 0, '3': 0, '4': 1, '5': 0},
+        })
+
+    def test_rating_summaries(self):
+        first = self.post_review(5)
+        self.post_review(2)
+        self.post_review(2)
+        self.client.put(
+            reverse('review-detail', args=[first]),
+            {'rating': 4, 'watchlist': self.movie.pk},
+            content_type='application/json',
+        )
+        other = WatchList.objects.create(title="Other", storyline="Storyline", platform=self.movie.platform)
+        Review.objects.create(rating=1, watchlist=other)
+        WatchList.objects.filter(pk=other.pk).recompute_ratings()
+
+        url = reverse('movie-review-summary', args=[self.movie.pk])
+        with self.assertNumQueries(1):
+            movie = self.client.get(url).json()
+        self.assertEqual(movie, {
+            'total': 3, 'mean': 2.67, 'histogram': {'1': 0, '2': 2, '3': 0, '4': 1, '5': 0},
+        })
+        with self.assertNumQueries(0):
+            self.client.get(url)
+
+        with self.assertNumQueries(1):
+            platform = self.client.get(reverse('platform-summary', args=[self.movie.platform_id])).json()
+        self.assertEqual(platform, {
+            'total': 4, 'mean': 2.25, 'histogram': {'1': 1, '2': 2, '3': 0, '4': 1, '5': 0},
+        })
+
+        empty = WatchList.objects.create(title="Empty", storyline="Storyline", platform=self.movie.platform)
+        self.assertEqual(self.client.get(reverse('movie-review-summary', args=[empty.pk])).json(), {
+            'total': 0, 'mean': None, 'histogram': {'1': 0, '2': 0, '3': 0, '4': 0, '5': 0},
+        })
+        self.assertEqual(self.client.get(reverse('movie-review-summary', args=[0])).status_code, 404)
+        self.assertEqual(self.client.get(reverse('platform-summary', args=[0])).status_code, 404)
+
+
+class ResponseCacheTests(TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.platform = self.create_platform()
+        self.movie = WatchList.objects.create(title="Movie", storyline="Storyline", platform=self.platform)
+
+    def test_cached_read_and_not_modified(self):
+        url = reverse('movie-detail', args=[self.movie.pk])
+        response = self.client.get(url)
+        etag = response['ETag']
+
+        with self.assertNumQueries(0):
+            response = self.client.get(url)
+        self.assertEqual(response.json()['title'], "Movie")
+
+        with self.assertNumQueries(0):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_write_invalidates_cache(self):
+        url = reverse('movie-detail', args=[self.movie.pk])
+        etag = self.client.get(url)['ETag']
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.put(
+                url,
+                {'title': "Renamed", 'storyline': "Storyline", 'platform': self.platform.pk},
+                content_type='application/json',
+            )
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['title'], "Renamed")
+
+
+class BulkWriteTests(TestCase):
+
+    def setUp(self):
+        super().setUp()
+        platform = self.create_platform()
+        self.movies = [
+            WatchList.objects.create(title=f"Movie {i}", storyline="Storyline", platform=platform)
+            for i in range(3)
+        ]
+
+    def test_bulk_create_reviews(self):
+        payload = [{'rating': 4, 'watchlist': movie.pk} for movie in self.movies] * 10
+        # Fetch movies, insert, touch movies, enqueue jobs, savepoint pair.
+        with self.assertNumQueries(6):
+            response = self.client.post(reverse('review-bulk'), payload, content_type='application/json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(len(response.json()['ids']), 30)
+
+        self.client.post(reverse('review-bulk'), payload[:3], content_type='application/json')
+        self.assertEqual(Job.objects.count(), 3)
+        self.movies[0].refresh_from_db()
+        self.assertEqual(self.movies[0].number_rating, 0)
+
+        self.run_jobs()
+        self.assertFalse(Job.objects.exists())
+        self.movies[0].refresh_from_db()
+        self.assertEqual((self.movies[0].number_rating, self.movies[0].avg_rating), (11, 4.0))
+
+    def run_jobs(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command('run_jobs', '--once', stdout=StringIO())
+
+    def test_refresh_locks_movies_before_recomputing(self):
+        enqueue('refresh_ratings', [self.movies[0].pk])
+        with CaptureQueriesContext(connection) as queries:
+            self.run_jobs()
+        statements = [q['sql'] for q in queries if 'watchlist_watchlist' in q['sql']]
+        lock = next(i for i, sql in enumerate(statements) if sql.startswith('SELECT "watchlist_watchlist"."id"'))
+        update = next(i for i, sql in enumerate(statements) if sql.startswith('UPDATE "watchlist_watchlist"'))
+        self.assertLess(lock, update)
+
+    def test_failed_jobs_are_retried(self):
+        enqueue('refresh_ratings', [self.movies[0].pk])
+        with patch.object(WatchListQuerySet, 'recompute_ratings', side_effect=RuntimeError("down")), \
+                self.assertLogs('watchlist.jobs', 'ERROR'):
+            self.run_jobs()
+        job = Job.objects.get()
+        self.assertEqual((job.attempts, job.failed), (1, False))
+        self.assertIn("down", job.last_error)
+        self.assertGreater(job.run_after, timezone.now())
+
+        Job.objects.update(run_after=timezone.now())
+        self.run_jobs()
+        self.assertFalse(Job.objects.exists())
+
+    def test_bulk_create_reports_per_item_errors(self):
+        payload = [
+            {'rating': 4, 'watchlist': self.movies[0].pk},
+            {'rating': 9, 'watchlist': 999},
+        ]
+        response = self.client.post(reverse('review-bulk'), payload, content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+        errors = response.json()
+        self.assertEqual(errors[0], {})
+        self.assertEqual(set(errors[1]), {'rating', 'watchlist'})
+        self.assertFalse(Review.objects.exists())
+
+    def test_bulk_update_and_delete_reviews(self):
+        first = Review.objects.create(rating=1, watchlist=self.movies[0])
+        second = Review.objects.create(rating=1, watchlist=self.movies[0])
+        payload = [
+            {'id': first.pk, 'rating': 5, 'watchlist': self.movies[1].pk},
+            {'id': second.pk, 'rating': 3, 'watchlist': self.movies[0].pk},
+        ]
+        response = self.client.put(reverse('review-bulk'), payload, content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        self.run_jobs()
+        self.movies[0].refresh_from_db()
+        self.movies[1].refresh_from_db()
+        self.assertEqual((self.movies[0].number_rating, self.movies[0].avg_rating), (1, 3.0))
+        self.assertEqual((self.movies[1].number_rating, self.movies[1].avg_rating), (1, 5.0))
+
+        response = self.client.delete(
+            reverse('review-bulk'), {'ids': [first.pk, second.pk]}, content_type='application/json'
+        )
+        self.assertEqual(response.json(), {'deleted': 2})
+        self.run_jobs()
+        self.movies[1].refresh_from_db()
+        self.assertEqual(self.movies[1].number_rating, 0)
+
+    def test_malformed_ids(self):
+        review = Review.objects.create(rating=1, watchlist=self.movies[0])
+        payload = [{'id': "abc", 'rating': 2}, {'id': [review.pk], 'rating': 2}, {'id': review.pk, 'rating': 2}]
+        response = self.client.put(reverse('review-bulk'), payload, content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+        errors = response.json()
+        self.assertIn('id', errors[0])
+        self.assertIn('id', errors[1])
+
+        response = self.client.delete(
+            reverse('review-bulk'), {'ids': ["abc", review.pk]}, content_type='application/json'
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(len(response.json()['ids']), 1)
+        self.assertTrue(Review.objects.filter(pk=review.pk).exists())
+
+
+class CatalogCommandTests(TestCase):
+
+    def test_export_import_round_trip(self):
+        platform = self.create_platform()
+        movie = WatchList.objects.create(title="Movie", storyline="Storyline", platform=platform)
+        Review.objects.create(rating=4, description="Good", watchlist=movie)
+        Review.objects.create(rating=2, watchlist=movie)
+        last_year = timezone.now() - timedelta(days=365)
+        WatchList.objects.update(created=last_year)
+        Review.objects.update(created=last_year, updated=last_year)
+
+        for fmt in ('csv', 'ndjson'):
+            with tempfile.TemporaryDirectory() as directory:
+                call_command('export_catalog', directory, format=fmt, stdout=StringIO())
+                WatchList.objects.all().delete()
+                call_command('import_catalog', directory, format=fmt, batch_size=1, stdout=StringIO())
+                self.assertTrue((Path(directory) / f'reviews.{fmt}').exists())
+
+            self.assertEqual(StreamPlatform.objects.count(), 1)
+            movie = WatchList.objects.get()
+            self.assertEqual(movie.platform, platform)
+            self.assertEqual(
+                sorted(movie.reviews.values_list('rating', 'description')),
+                [(2, None), (4, "Good")],
+            )
+            self.assertEqual((movie.number_rating, movie.avg_rating), (2, 3.0))
+            self.assertEqual(movie.created, last_year)
+            self.assertEqual(set(movie.reviews.values_list('created', 'updated')), {(last_year, last_year)})
+
+    def test_failed_import_counts_imported_reviews(self):
+        platform = self.create_platform()
+        other = WatchList.objects.create(title="Other", storyline="Storyline", platform=platform)
+        movie = WatchList.objects.create(title="Movie", storyline="Storyline", platform=platform)
+        Review.objects.create(rating=4, watchlist=movie)
+        with tempfile.TemporaryDirectory() as directory:
+            call_command('export_catalog', directory, stdout=StringIO())
+            with open(Path(directory, 'reviews.ndjson'), 'a') as reviews:
+                reviews.write('{"id": 99, "rating": 5, "watchlist": 999}\n')
+            WatchList.objects.filter(pk=movie.pk).delete()
+            Review.objects.create(rating=1, watchlist=other)
+            with self.assertRaises(CommandError):
+                call_command('import_catalog', directory, batch_size=1, stdout=StringIO())
+
+        imported = WatchList.objects.get(title="Movie", pk__gt=movie.pk)
+        self.assertEqual((imported.number_rating, imported.avg_rating), (1, 4.0))
+        # Movies outside the import are left alone.
+        other.refresh_from_db()
+        self.assertEqual(other.number_rating, 0)
+
+    def test_import_rejects_unknown_movies(self):
+        with tempfile.TemporaryDirectory() as directory:
+            Path(directory, 'reviews.ndjson').write_text('{"id": 1, "rating": 5, "watchlist": 7}\n')
+            with self.assertRaisesMessage(CommandError, "Review 1 references unknown movie 7."):
+                call_command('import_catalog', directory, stdout=StringIO())
+        self.assertFalse(Review.objects.exists())
+
+
+class SearchTests(TestCase):
+
+    def setUp(self):
+        super().setUp()
+        platform = self.create_platform()
+        self.heist = WatchList.objects.create(
+            title="The Heist", storyline="A crew plans a robbery", platform=platform
+        )
+        self.drama = WatchList.objects.create(
+            title="Family Drama", storyline="A heist goes wrong at a wedding", platform=platform
+        )
+        WatchList.objects.create(title="Space", storyline="Astronauts far from home", platform=platform)
+
+    def search(self, query):
+        response = self.client.get(reverse('watch-list-search'), {'q': query})
+        return [movie['title'] for movie in response.json()['results']]
+
+    def test_ranked_results(self):
+        self.assertEqual(self.search("heist"), ["The Heist", "Family Drama"])
+        self.assertEqual(self.search("wed"), ["Family Drama"])
+        self.assertEqual(self.search('"unbalanced AND'), [])
+
+    def test_index_follows_updates_and_deletes(self):
+        self.heist.title = "The Job"
+        self.heist.save()
+        self.drama.delete()
+        self.assertEqual(self.search("heist"), [])
+        self.assertEqual(self.search("job"), ["The Job"])
+
+    def test_pagination(self):
+        response = self.client.get(reverse('watch-list-search'), {'q': "heist", 'page_size': 1})
+        data = response.json()
+        self.assertEqual([movie['title'] for movie in data['results']], ["The Heist"])
+        data = self.client.get(data['next']).json()
+        self.assertEqual([movie['title'] for movie in data['results']], ["Family Drama"])
+        self.assertIsNone(data['next'])
+
+
+class FilterOrderingTests(TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.netflix = self.create_platform()
+        prime = self.create_platform("Prime", "https://primevideo.com")
+        self.first = WatchList.objects.create(title="First", storyline="Storyline", platform=self.netflix)
+        WatchList.objects.create(title="Second", storyline="Storyline", platform=self.netflix, active=False)
+        WatchList.objects.create(title="Third", storyline="Storyline", platform=prime)
+        for rating in (1, 4, 5):
+            Review.objects.create(rating=rating, watchlist=self.first)
+
+    def titles(self, params):
+        response = self.client.get(reverse('watch-list'), params)
+        return [movie['title'] for movie in response.json()['results']]
+
+    def test_watchlist_filters(self):
+        self.assertEqual(self.titles({'platform': self.netflix.pk, 'active': 'true'}), ["First"])
+        self.assertEqual(self.titles({'ordering': 'title'}), ["First", "Second", "Third"])
+
+    def test_review_filters_and_ordering(self):
+        response = self.client.get(
+            reverse('review-list'),
+            {'watchlist': self.first.pk, 'rating__gte': 4, 'ordering': '-rating'},
+        )
+        self.assertEqual([review['rating'] for review in response.json()['results']], [5, 4])
+
+    def test_invalid_filter_value(self):
+        response = self.client.get(reverse('review-list'), {'rating__gte': 'high'})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('rating__gte', response.json())
+
+
+class PerformanceMiddlewareTests(TestCase):
+
+    def setUp(self):
+        super().setUp()
+        registry.clear()
+
+    def test_server_timing_and_metrics(self):
+        response = self.client.get(reverse('watch-list'))
+        timings = dict(
+            part.strip().split(';', 1) for part in response['Server-Timing'].split(',')
+        )
+        self.assertEqual(set(timings), {'db', 'app', 'render', 'total'})
+        self.assertIn('desc="3 queries"', timings['db'])
+
+        metrics = self.client.get(reverse('metrics')).content.decode()
+        self.assertIn('watchlist_requests_total{view="watch-list",method="GET",status="200"} 1', metrics)
+        self.assertIn('watchlist_db_queries_total{view="watch-list",method="GET",status="200"} 3', metrics)
+
+
+class PlatformSerializationTests(TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.platform = self.create_platform()
+        self.movies = [
+            WatchList.objects.create(title=f"Movie {i}", storyline="Storyline", platform=self.platform)
+            for i in range(3)
+        ]
+
+    def test_watchlist_links(self):
+        # Two Last-Modified maxima, the page and the movie ids.
+        with self.assertNumQueries(4):
+            response = self.client.get(reverse('platform-list'))
+        links = response.json()['results'][0]['watchlist']
+        self.assertEqual(
+            links,
+            ['http://testserver' + reverse('movie-detail', args=[movie.pk]) for movie in self.movies],
+        )
+
+    def test_sparse_fields_skip_relation(self):
+        url = reverse('platform-detail', args=[self.platform.pk])
+        # Last-Modified and the platform row.
+        with self.assertNumQueries(2):
+            response = self.client.get(url, {'fields': 'id,name'})
+        self.assertEqual(response.json(), {'id': self.platform.pk, 'name': "Netflix"})
+
+    def test_expand_watchlist(self):
+        url = reverse('platform-detail', args=[self.platform.pk])
+        response = self.client.get(url, {'expand': 'watchlist'})
+        self.assertEqual(
+            response.json()['watchlist'][0],
+            {'id': self.movies[0].pk, 'title': "Movie 0", 'active': True, 'avg_rating': 0.0},
+        )
+
+    def test_expanded_ratings_follow_review_writes(self):
+        urls = [
+            reverse('platform-detail', args=[self.platform.pk]),
+            reverse('platform-list'),
+        ]
+        etags = [self.client.get(url, {'expand': 'watchlist'})['ETag'] for url in urls]
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse('review-list'), {'rating': 5, 'watchlist': self.movies[0].pk})
+        for url, etag in zip(urls, etags):
+            response = self.client.get(url, {'expand': 'watchlist'}, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, 200)
+            data = response.json()
+            movies = data['watchlist'] if 'watchlist' in data else data['results'][0]['watchlist']
+            self.assertEqual(movies[0]['avg_rating'], 5.0)
+
+
+class AsyncViewTests(TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.platform = self.create_platform()
+        self.movie = WatchList.objects.create(title="Movie", storyline="Storyline", platform=self.platform)
+        Review.objects.create(rating=4, watchlist=self.movie)
+
+    async def test_async_responses_match_sync_views(self):
+        pairs = [
+            ('watch-list', 'async-watch-list', []),
+            ('movie-detail', 'async-movie-detail', [self.movie.pk]),
+            ('platform-list', 'async-platform-list', []),
+            ('platform-detail', 'async-platform-detail', [self.platform.pk]),
+            ('review-list', 'async-review-list', []),
+        ]
+        for sync_name, async_name, args in pairs:
+            expected = (await self.async_client.get(reverse(sync_name, args=args))).json()
+            response = await self.async_client.get(reverse(async_name, args=args))
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.json(), expected)
+
+    async def test_async_not_found(self):
+        response = await self.async_client.get(reverse('async-movie-detail', args=[999]))
+        self.assertEqual(response.status_code, 404)
+
+    async def test_async_conditional_get(self):
+        review = await Review.objects.aget()
+        for url in (
+            reverse('async-movie-detail', args=[self.movie.pk]),
+            reverse('async-platform-list'),
+            reverse('async-review-list'),
+            reverse('async-review-detail', args=[review.pk]),
+        ):
+            first = await self.async_client.get(url)
+            self.assertEqual(first.status_code, 200)
+            self.assertIn('Last-Modified', first)
+            response = await self.async_client.get(url, headers={'If-None-Match': first['ETag']})
+            self.assertEqual(response.status_code, 304)
+            self.assertEqual(response['ETag'], first['ETag'])
+            response = await self.async_client.get(url, headers={'If-Modified-Since': first['Last-Modified']})
+            self.assertEqual(response.status_code, 304)
+
+    async def test_async_responses_are_cached(self):
+        url = reverse('async-movie-detail', args=[self.movie.pk])
+        first = await self.async_client.get(url)
+        await WatchList.objects.filter(pk=self.movie.pk).aupdate(title="Renamed")
+        cached = await self.async_client.get(url)
+        self.assertEqual((cached.content, cached['ETag']), (first.content, first['ETag']))
+
+        cache.clear()
+        self.assertEqual((await self.async_client.get(url)).json()['title'], "Renamed")
+
+
+class ValuesSerializerTests(TestCase):
+
+    def setUp(self):
+        super().setUp()
+        platform = self.create_platform()
+        for i in range(2):
+            movie = WatchList.objects.create(title=f"Movie {i}", storyline="Storyline", platform=platform)
+            Review.objects.create(rating=3, description="Fine", watchlist=movie)
+        WatchList.objects.create(title="Unreviewed", storyline="Storyline", platform=platform)
+
+    def assertSameJSON(self, expected, actual):
+        self.assertEqual(json.loads(FastJSONRenderer().render(actual)), json.loads(json.dumps(expected)))
+
+    def test_output_matches_model_serializers(self):
+        cases = [
+            (WatchListSerializer, WatchList.objects.with_reviews().order_by('id'),
+             WatchListValuesSerializer, WatchList.objects.order_by('id')),
+            (ReviewSerializer, Review.objects.order_by('id'),
+             ReviewValuesSerializer, Review.objects.order_by('id')),
+            (StreamPlatformSerializer, StreamPlatform.objects.with_watchlist(),
+             StreamPlatformValuesSerializer, StreamPlatform.objects.all()),
+        ]
+        for model_serializer, model_rows, values_serializer, values_rows in cases:
+            expected = model_serializer(model_rows, many=True).data
+            actual = values_serializer(values_serializer.values(values_rows), many=True).data
+            self.assertSameJSON(expected, actual)
+            self.assertEqual([list(row) for row in actual], [list(row) for row in expected])
+
+
+class DatabaseRoutingTests(TestCase):
+
+    @override_settings(DATABASE_REPLICAS=['replica1'])
+    def test_router_uses_replicas_only_when_enabled(self):
+        router = ReplicaRouter()
+        self.assertEqual(router.db_for_read(WatchList), 'default')
+        with read_from_replicas():
+            self.assertEqual(router.db_for_read(WatchList), 'replica1')
+            self.assertEqual(router.db_for_write(WatchList), 'default')
+
+    @override_settings(DATABASE_REPLICAS=['replica1', 'replica2', 'replica3'])
+    def test_router_keeps_one_replica_per_block(self):
+        router = ReplicaRouter()
+        with read_from_replicas():
+            aliases = {router.db_for_read(WatchList) for _ in range(20)}
+        self.assertEqual(len(aliases), 1)
+
+        movie = WatchList(title="Movie")
+        movie._state.db = 'replica2'
+        with read_from_replicas():
+            self.assertEqual(router.db_for_read(Review, instance=movie), 'replica2')
+        self.assertEqual(router.db_for_read(Review, instance=movie), 'replica2')
+
+    @override_settings(DATABASE_REPLICAS=['replica1'])
+    def test_middleware_enables_replicas_for_safe_requests(self):
+        seen = []
+
+        def view(request):
+            seen.append(replica_alias.get())
+
+        middleware = ReplicaRoutingMiddleware(lambda request: None)
+        for method in ('get', 'post'):
+            request = getattr(RequestFactory(), method)('/')
+            def get_response(request):
+                middleware.process_view(request, view, (), {})
+                view(request)
+            middleware.get_response = get_response
+            middleware(request)
+        self.assertEqual(seen, ['replica1', None])
+        self.assertIsNone(replica_alias.get())
+
+    @override_settings(DATABASE_REPLICAS=['replica1'])
+    def test_cached_responses_are_read_from_the_primary(self):
+        platform = self.create_platform()
+        movie = WatchList.objects.create(title="Movie", storyline="Storyline", platform=platform)
+        reads = []
+
+        def db_for_read(router, model, **hints):
+            reads.append(replica_alias.get())
+            return 'default'
+
+        with patch.object(ReplicaRouter, 'db_for_read', db_for_read):
+            self.assertEqual(self.client.get(reverse('movie-detail', args=[movie.pk])).status_code, 200)
+            self.assertTrue(reads)
+            self.assertFalse(any(reads))
+
+            reads.clear()
+            self.client.get(reverse('change-feed'))
+            self.assertTrue(reads)
+            self.assertTrue(all(reads))
+
+    @skipUnless(connection.vendor == 'sqlite', "SQLite only")
+    def test_sqlite_pragmas(self):
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA busy_timeout')
+            self.assertEqual(cursor.fetchone()[0], 5000)
+
+
+@override_settings(REST_FRAMEWORK={
+    **settings.REST_FRAMEWORK,
+    'DEFAULT_THROTTLE_RATES': {'read': '5/min', 'write': '2/min'},
+})
+class ThrottlingTests(TestCase):
+
+    def setUp(self):
+        super().setUp()
+        platform = self.create_platform()
+        self.movie = WatchList.objects.create(title="Movie", storyline="Storyline", platform=platform)
+
+    def test_budget_per_client_and_endpoint(self):
+        url = reverse('movie-detail', args=[self.movie.pk])
+        for _ in range(5):
+            self.assertEqual(self.client.get(url).status_code, 200)
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 429)
+        self.assertTrue(1 <= int(response['Retry-After']) <= 60)
+
+        self.assertEqual(self.client.get(url, REMOTE_ADDR='10.0.0.2').status_code, 200)
+        self.assertEqual(self.client.get(reverse('platform-list')).status_code, 200)
+
+    def test_expensive_requests_cost_more(self):
+        url = reverse('watch-list')
+        # Two units per default page of movies with nested reviews.
+        self.assertEqual(self.client.get(url).status_code, 200)
+        self.assertEqual(self.client.get(url + '?page_size=40').status_code, 429)
+
+        payload = [{'rating': 5, 'watchlist': self.movie.pk}] * 20
+        response = self.client.post(reverse('review-bulk'), payload, content_type='application/json')
+        self.assertEqual(response.status_code, 201)
+        response = self.client.post(reverse('review-bulk'), payload, content_type='application/json')
+        self.assertEqual(response.status_code, 429)
+
+    def test_requests_above_the_budget_are_rejected(self):
+        # Streaming costs 50 units, more than a whole window of reads.
+        response = self.client.get(reverse('watch-list') + '?stream=1')
+        self.assertEqual(response.status_code, 413)
+        self.assertNotIn('Retry-After', response)
+        response = self.client.get(reverse('async-watch-list') + '?page_size=100')
+        self.assertEqual(response.status_code, 413)
+
+        payload = [{'rating': 5, 'watchlist': self.movie.pk}] * 30
+        response = self.client.post(reverse('review-bulk'), payload, content_type='application/json')
+        self.assertEqual(response.status_code, 413)
+        self.assertIn("Send at most 20 items per request.", response.json()['detail'])
+        self.assertFalse(Review.objects.exists())
+
+    async def test_async_views_are_throttled(self):
+        url = reverse('async-movie-detail', args=[self.movie.pk])
+        for _ in range(5):
+            self.assertEqual((await self.async_client.get(url)).status_code, 200)
+        response = await self.async_client.get(url)
+        self.assertEqual(response.status_code, 429)
+        self.assertTrue(1 <= int(response['Retry-After']) <= 60)
+
+        # Same cost as the sync list view: two units per default page.
+        url = reverse('async-watch-list')
+        self.assertEqual((await self.async_client.get(url)).status_code, 200)
+        self.assertEqual((await self.async_client.get(url + '?page_size=40')).status_code, 429)
+
+
+class ConditionalWriteTests(TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.platform = self.create_platform()
+        self.movie = WatchList.objects.create(title="Movie", storyline="Storyline", platform=self.platform)
+        self.url = reverse('movie-detail', args=[self.movie.pk])
+
+    def patch(self, url, data, **headers):
+        return self.client.patch(url, data, content_type='application/json', **headers)
+
+    def test_patch_saves_only_changed_columns(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.patch(self.url, {'title': "Renamed", 'storyline': "Storyline"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['title'], "Renamed")
+        updates = [q['sql'] for q in queries if q['sql'].startswith('UPDATE "watchlist_watchlist"')]
+        self.assertEqual(len(updates), 1)
+        self.assertIn('"title"', updates[0])
+        self.assertNotIn('"storyline"', updates[0])
+
+        with CaptureQueriesContext(connection) as queries:
+            self.patch(self.url, {'title': "Renamed"})
+        self.assertFalse([q for q in queries if q['sql'].startswith('UPDATE')])
+
+    def test_if_match_rejects_stale_writes(self):
+        etag = self.client.get(self.url)['ETag']
+        response = self.patch(self.url, {'title': "First"}, HTTP_IF_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+        response = self.patch(self.url, {'title': "Second"}, HTTP_IF_MATCH=etag)
+        self.assertEqual(response.status_code, 412)
+        self.movie.refresh_from_db()
+        self.assertEqual(self.movie.title, "First")
+
+        response = self.patch(self.url, {'title': "Second"}, HTTP_IF_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.client.delete(self.url, HTTP_IF_MATCH=etag).status_code, 412)
+
+    def test_prefer_return_minimal(self):
+        url = reverse('platform-detail', args=[self.platform.pk])
+        response = self.patch(url, {'about': "Films"}, HTTP_PREFER='return=minimal')
+        self.assertEqual(response.status_code, 204)
+        self.assertEqual(response.content, b'')
+        self.platform.refresh_from_db()
+        self.assertEqual(self.platform.about, "Films")
+
+    def test_patch_review(self):
+        review = Review.objects.create(rating=2, watchlist=self.movie)
+        WatchList.objects.filter(pk=self.movie.pk).recompute_ratings()
+        url = reverse('review-detail', args=[review.pk])
+        etag = self.client.get(url)['ETag']
+
+        response = self.patch(url, {'rating': 4}, HTTP_IF_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['ETag'], self.client.get(url)['ETag'])
+        self.movie.refresh_from_db()
+        self.assertEqual((self.movie.number_rating, self.movie.avg_rating), (1, 4.0))
+        self.assertEqual(self.patch(url, {'rating': 5}, HTTP_IF_MATCH=etag).status_code, 412)
+
+
+class ConditionalGetTests(TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.platform = self.create_platform()
+        self.movie = WatchList.objects.create(title="Movie", storyline="Storyline", platform=self.platform)
+        self.review = Review.objects.create(rating=3, watchlist=self.movie)
+        # Keep later changes out of the second the clients last saw.
+        past = timezone.now() - timedelta(days=1)
+        StreamPlatform.objects.update(updated=past)
+        WatchList.objects.update(updated=past)
+        Review.objects.update(updated=past)
+
+    def test_movie_detail_not_modified(self):
+        url = reverse('movie-detail', args=[self.movie.pk])
+        last_modified = self.client.get(url)['Last-Modified']
+
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified).status_code, 304)
+        cache.clear()
+        # Only the timestamp query runs; the movie is not serialized.
+        with self.assertNumQueries(1):
+            response = self.client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['Last-Modified'], last_modified)
+        # If-None-Match takes precedence over If-Modified-Since.
+        response = self.client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified, HTTP_IF_NONE_MATCH='"stale"')
+        self.assertEqual(response.status_code, 200)
+
+        Review.objects.create(rating=5, watchlist=self.movie)
+        cache.clear()
+        response = self.client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()['reviews']), 2)
+
+    def test_platform_detail_follows_moved_movies(self):
+        url = reverse('platform-detail', args=[self.platform.pk])
+        last_modified = self.client.get(url)['Last-Modified']
+        self.assertEqual(self.client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified).status_code, 304)
+
+        other = self.create_platform("Prime", "https://primevideo.com")
+        response = self.client.patch(
+            reverse('movie-detail', args=[self.movie.pk]), {'platform': other.pk},
+            content_type='application/json',
+        )
+        self.assertEqual(response.status_code, 200)
+        cache.clear()
+        response = self.client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['watchlist'], [])
+
+    def test_reviews_not_modified(self):
+        url = reverse('review-detail', args=[self.review.pk])
+        last_modified = self.client.get(url)['Last-Modified']
+        with self.assertNumQueries(1):
+            response = self.client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, 304)
+
+        url = reverse('review-list')
+        last_modified = self.client.get(url)['Last-Modified']
+        self.assertEqual(self.client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified).status_code, 304)
+        # The list was first seen this second, so change it in a later one.
+        Review.objects.filter(pk=self.review.pk).update(rating=4, updated=timezone.now() + timedelta(minutes=1))
+        self.assertEqual(self.client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified).status_code, 200)
+
+
+class BatchedDeleteTests(TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.platform = self.create_platform()
+        self.other = WatchList.objects.create(
+            title="Other", storyline="Storyline",
+            platform=self.create_platform("Prime", "https://primevideo.com"),
+        )
+        for i in range(5):
+            movie = WatchList.objects.create(title=f"Movie {i}", storyline="Storyline", platform=self.platform)
+            Review.objects.bulk_create([Review(rating=3, watchlist=movie)] * 3)
+        Review.objects.create(rating=4, watchlist=self.other)
+        WatchList.objects.recompute_ratings()
+
+    def test_platform_delete_cascades_in_batches(self):
+        with CaptureQueriesContext(connection) as queries:
+            deleted = self.platform.delete_in_batches(batch_size=2)
+        self.assertEqual(deleted['watchlist.WatchList'], 5)
+        self.assertEqual(deleted['watchlist.Review'], 15)
+        self.assertEqual(deleted['watchlist.StreamPlatform'], 1)
+        batches = [q['sql'] for q in queries if q['sql'].startswith('SELECT "watchlist_watchlist"."id" FROM')]
+        # Three batches of at most two ids, then the (empty) cascade of the platform itself.
+        self.assertEqual(len(batches), 5)
+        self.assertTrue(all(sql.endswith('LIMIT 2') for sql in batches[:4]))
+
+        self.assertEqual(list(WatchList.objects.all()), [self.other])
+        self.assertEqual(Review.objects.count(), 1)
+        self.assertEqual(RatingHistogram.objects.count(), 1)
+
+    def test_delete_views(self):
+        movie = WatchList.objects.filter(platform=self.platform).first()
+        response = self.client.delete(reverse('movie-detail', args=[movie.pk]))
+        self.assertEqual(response.status_code, 204)
+        self.assertFalse(Review.objects.filter(watchlist=movie.pk).exists())
+
+        response = self.client.delete(reverse('platform-detail', args=[self.platform.pk]))
+        self.assertEqual(response.status_code, 204)
+        self.assertEqual(WatchList.objects.count(), 1)
+        self.assertEqual(self.client.delete(reverse('platform-detail', args=[self.platform.pk])).status_code, 404)
+
+    def test_delete_rechecks_if_match_before_deleting_the_row(self):
+        movie = WatchList.objects.filter(platform=self.platform).first()
+        url = reverse('movie-detail', args=[movie.pk])
+        delete_related = WatchList.delete_related_in_batches
+
+        def concurrent_patch(movie, batch_size):
+            WatchList.objects.get(pk=movie.pk).save()
+            return delete_related(movie, batch_size)
+
+        etag = self.client.get(url)['ETag']
+        with patch.object(WatchList, 'delete_related_in_batches', concurrent_patch), \
+                self.captureOnCommitCallbacks(execute=True):
+            response = self.client.delete(url, HTTP_IF_MATCH=etag)
+        self.assertEqual(response.status_code, 412)
+        self.assertEqual(response['ETag'], self.client.get(url)['ETag'])
+        movie.refresh_from_db()
+        self.assertEqual((movie.number_rating, movie.rating_sum, movie.avg_rating, movie.trending), (0, 0, 0.0, 0))
+        self.assertFalse(RatingHistogram.objects.filter(watchlist=movie).exists())
+        summary = self.client.get(reverse('movie-review-summary', args=[movie.pk])).json()
+        self.assertEqual(summary['total'], 0)
+
+        response = self.client.delete(url, HTTP_IF_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 204)
+        self.assertFalse(WatchList.objects.filter(pk=movie.pk).exists())
+
+
+class LeaderboardTests(TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.platform = self.create_platform()
+        self.movies = [
+            WatchList.objects.create(title=f"Movie {i}", storyline="Storyline", platform=self.platform)
+            for i in range(3)
+        ]
+
+    def post_review(self, movie, rating):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(reverse('review-list'), {'rating': rating, 'watchlist': movie.pk})
+        self.assertEqual(response.status_code, 201)
+        return response.json()['id']
+
+    def leaderboard(self, name, query=''):
+        response = self.client.get(reverse(name, args=[self.platform.pk]) + query)
+        self.assertEqual(response.status_code, 200)
+        return [(row['title'], row['trending']) for row in response.json()['results']]
+
+    def test_top_rated(self):
+        self.post_review(self.movies[0], 3)
+        self.post_review(self.movies[1], 5)
+        with self.assertNumQueries(2):
+            self.assertEqual(self.leaderboard('platform-top-rated'), [("Movie 1", 1), ("Movie 0", 1)])
+        self.assertEqual(self.leaderboard('platform-top-rated', '?limit=1'), [("Movie 1", 1)])
+        self.assertEqual(self.client.get(reverse('platform-top-rated', args=[0])).status_code, 404)
+
+    def test_trending_window(self):
+        old = self.post_review(self.movies[0], 4)
+        self.post_review(self.movies[0], 4)
+        self.post_review(self.movies[1], 4)
+        self.assertEqual(self.leaderboard('platform-trending'), [("Movie 0", 2), ("Movie 1", 1)])
+
+        Review.objects.filter(pk=old).update(created=timezone.now() - timedelta(days=30))
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command('rebuild_leaderboards', stdout=StringIO())
+        self.assertEqual(self.leaderboard('platform-trending'), [("Movie 1", 1), ("Movie 0", 1)])
+
+        # Deleting a review from outside the window leaves the trending count alone.
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.delete(reverse('review-detail', args=[old]))
+        self.assertEqual(self.leaderboard('platform-trending'), [("Movie 1", 1), ("Movie 0", 1)])
+
+
+class AdminTests(TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'password'))
+        platform = self.create_platform()
+        self.movies = [
+            WatchList.objects.create(title=f"Movie {i}", storyline="Storyline", platform=platform)
+            for i in range(3)
+        ]
+
+    def changelist_queries(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(queries)
+
+    def test_review_changelist_query_count_is_constant(self):
+        url = reverse('admin:watchlist_review_changelist')
+        Review.objects.create(rating=3, watchlist=self.movies[0])
+        few = self.changelist_queries(url)
+        Review.objects.bulk_create([Review(rating=4, watchlist=movie) for movie in self.movies] * 5)
+        self.assertEqual(self.changelist_queries(url), few)
+
+    def test_review_form_does_not_list_movies(self):
+        review = Review.objects.create(rating=3, watchlist=self.movies[0])
+        response = self.client.get(reverse('admin:watchlist_review_change', args=[review.pk]))
+        self.assertNotContains(response, "Movie 2")
+
+    def test_movie_search_uses_search_index(self):
+        response = self.client.get(reverse('admin:watchlist_watchlist_changelist'), {'q': "Movie 1"})
+        self.assertEqual(list(response.context['cl'].result_list), [self.movies[1]])
+
+
+class ChangeFeedTests(TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.url = reverse('change-feed')
+        self.platform = self.create_platform()
+        self.movie = WatchList.objects.create(title="Movie", storyline="Storyline", platform=self.platform)
+        self.review = Review.objects.create(rating=3, watchlist=self.movie)
+
+    def poll(self, since=None, **headers):
+        response = self.client.get(self.url, {} if since is None else {'since': since}, **headers)
+        self.assertTrue(response.streaming)
+        return response, json.loads(b''.join(response.streaming_content))
+
+    def test_feed_since_cursor(self):
+        response, changes = self.poll()
+        self.assertEqual(changes, [])
+        cursor = response['X-Changes-Cursor']
+
+        Review.objects.filter(pk=self.review.pk).update(rating=4)
+        Review.objects.filter(pk=self.review.pk).update(description="Better")
+        # Not part of the API, so not logged.
+        WatchList.objects.filter(pk=self.movie.pk).update(trending=5)
+        other = Review.objects.create(rating=5, watchlist=self.movie)
+        response, changes = self.poll(cursor)
+        self.assertEqual(
+            [(change['model'], change['object_id'], change['deleted']) for change in changes],
+            [('review', self.review.pk, False), ('review', other.pk, False)],
+        )
+        self.assertEqual(changes[0]['data']['description'], "Better")
+        self.assertEqual(response['X-Changes-Cursor'], str(changes[-1]['cursor']))
+
+        cursor = response['X-Changes-Cursor']
+        movie_id = self.movie.pk
+        self.movie.delete()
+        response, changes = self.poll(cursor)
+        self.assertEqual(
+            {(change['model'], change['object_id']) for change in changes},
+            {('watchlist', movie_id), ('review', self.review.pk), ('review', other.pk)},
+        )
+        self.assertTrue(all(change['deleted'] and change['data'] is None for change in changes))
+        _, changes = self.poll(response['X-Changes-Cursor'])
+        self.assertEqual(changes, [])
+
+    def test_batches_and_ndjson(self):
+        Review.objects.bulk_create([Review(rating=4, watchlist=self.movie) for _ in range(4)])
+        with patch.object(ChangeFeedView, 'batch_size', 2):
+            response = self.client.get(self.url, {'since': 0}, HTTP_ACCEPT='application/x-ndjson')
+            lines = b''.join(response.streaming_content).decode().splitlines()
+        changes = [json.loads(line) for line in lines]
+        self.assertEqual([change['model'] for change in changes[:3]], ['platform', 'watchlist', 'review'])
+        self.assertEqual(len(changes), Change.objects.count())
+        self.assertEqual(changes[1]['data']['title'], "Movie")
+        self.assertNotIn('reviews', changes[1]['data'])
+
+    def test_expired_and_invalid_cursors(self):
+        self.assertEqual(self.client.get(self.url, {'since': 'x'}).status_code, 400)
+        Change.objects.update(created=timezone.now() - timedelta(days=60))
+        call_command('prune_changes', days=30, stdout=StringIO())
+        self.assertEqual(Change.objects.count(), 1)
+        self.assertEqual(self.client.get(self.url, {'since': 0}).status_code, 410)
+        response, changes = self.poll(Change.objects.get().pk)
+        self.assertEqual(changes, [])
+
+
+
+class StartupBenchmarkTests(TestCase):
+
+    def test_api_profile_loads_fewer_modules(self):
+        with tempfile.TemporaryDirectory() as directory:
+            output = Path(directory) / 'startup.json'
+            call_command('startup_benchmark', runs=1, path='/platform/', output=output, stdout=StringIO())
+            results = json.loads(output.read_text())['results']
+        base, api = results['IMDB.settings'], results['IMDB.settings_api']
+        self.assertLess(api['modules'], base['modules'])
+        self.assertGreater(api['import_ms'], 0)
+        self.assertEqual(len(api['slowest_imports']), 10)
@@ -0,0 +1,107 @@
+import math
+
+from rest_framework import status
+from rest_framework.exceptions import APIException
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.settings import api_settings
+from rest_framework.throttling import SimpleRateThrottle
+
+from watchlist.cache import get_cache
+
+
+class CostExceedsBudget(APIException):
+    status_code = status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+    default_detail = "The request costs more than the rate limit allows per window."
+    default_code = 'cost_exceeds_budget'
+
+
+class CostRateThrottle(SimpleRateThrottle):
+    """
+    Budget of cost units per client, endpoint and scope in fixed time windows.
+
+    Safe methods draw from the ``read`` rate and everything else from the
+    ``write`` rate of ``DEFAULT_THROTTLE_RATES``, unless the view sets
+    ``throttle_scope``. Each endpoint has its own budget. A request costs
+    ``view.get_throttle_cost(request)``, or ``view.throttle_cost`` (1 by
+    default), so expensive requests use up the budget faster.
+
+    A request costing more than the whole window budget could never be
+    allowed, so it is rejected with 413 instead of 429; views may explain the
+    limit with ``get_throttle_budget_detail(budget)``.
+
+    Usage is counted with atomic increments in the watchlist cache, so limits
+    hold across worker processes when that cache is shared (Redis, Memcached).
+    """
+    cache_format = 'watchlist:throttle:%(scope)s:%(view)s:%(ident)s:%(window)s'
+
+    def __init__(self):
+        # Rates are read per request so they follow settings changes.
+        self.THROTTLE_RATES = api_settings.DEFAULT_THROTTLE_RATES
+        self.wait_seconds = None
+
+    def get_scope(self, request, view):
+        scope = getattr(view, 'throttle_scope', None)
+        if scope:
+            return scope
+        return 'read' if request.method in SAFE_METHODS else 'write'
+
+    def get_cost(self, request, view):
+        get_throttle_cost = getattr(view, 'get_throttle_cost', None)
+        if get_throttle_cost is not None:
+            return get_throttle_cost(request)
+        return getattr(view, 'throttle_cost', 1)
+
+    def get_cache_key(self, request, view):
+        if request.user and request.user.is_authenticated:
+            ident = f'user-{request.user.pk}'
+        else:
+            ident = self.get_ident(request)
+        match = request.resolver_match
+        return self.cache_format % {
+            'scope': self.scope,
+            'view': match.view_name if match else type(view).__name__,
+            'ident': ident,
+            'window': int(self.now // self.duration),
+        }
+
+    def allow_request(self, request, view):
+        self.scope = self.get_scope(request, view)
+        self.rate = self.get_rate()
+        self.num_requests, self.duration = self.parse_rate(self.rate)
+        if self.rate is None:
+            return True
+
+        self.now = self.timer()
+        key = self.get_cache_key(request, view)
+        cost = self.get_cost(request, view)
+        if cost > self.num_requests:
+            detail = (
+                f"The request costs {cost} units, more than the {self.num_requests} "
+                f"the {self.scope} rate allows per window."
+            )
+            get_budget_detail = getattr(view, 'get_throttle_budget_detail', None)
+            if get_budget_detail is not None:
+                detail = f"{detail} {get_budget_detail(self.num_requests)}"
+            raise CostExceedsBudget(detail)
+        cache = get_cache()
+        cache.add(key, 0, timeout=self.duration)
+        try:
+            used = cache.incr(key, cost)
+        except ValueError:
+            # The counter expired between add() and incr().
+            cache.set(key, cost, timeout=self.duration)
+            used = cost
+        if used > self.num_requests:
+            self.wait_seconds = self.duration - self.now % self.duration
+            return False
+        return True
+
+    def wait(self):
+        return self.wait_seconds
+
+
+def page_cost(request, paginator, cost=1):
+    """
+    Scale ``cost`` by how many default-sized pages the request asks for.
+    """
+    return cost * math.ceil(paginator.get_page_size(request) / paginator.page_size)
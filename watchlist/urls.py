@@ -2,19 +2,37 @@ from django.urls import path
 from watchlist.views import (
                                 WatchListView, 
                                 MovieDetailView,
+                                MovieReviewSummaryView,
+                                WatchListSearchView,
                                 StreamPlatformListView, 
                                 StreamPlatformDetailView, 
+                                StreamPlatformSummaryView,
+                                PlatformTopRatedView,
+                                PlatformTrendingView,
                                 ReviewListView,
-                                ReviewDetailView
+                                ReviewDetailView,
+                                WatchListBulkView,
+                                ReviewBulkView,
+                                ChangeFeedView,
+                                metrics_view
                             )
 
 urlpatterns = [
     path('', WatchListView.as_view(), name = 'watch-list'),    
+    path('bulk/', WatchListBulkView.as_view(), name = 'watch-list-bulk'),    
     path('<int:pk>/', MovieDetailView.as_view(), name = 'movie-detail'),    
+    path('<int:pk>/reviews/summary/', MovieReviewSummaryView.as_view(), name = 'movie-review-summary'),
+    path('search/', WatchListSearchView.as_view(), name = 'watch-list-search'),    
     path('platform/', StreamPlatformListView.as_view(), name = 'platform-list'),    
     path('platform/<int:pk>/', StreamPlatformDetailView.as_view(), name = 'platform-detail'),    
+    path('platform/<int:pk>/summary/', StreamPlatformSummaryView.as_view(), name = 'platform-summary'),
+    path('platform/<int:pk>/top-rated/', PlatformTopRatedView.as_view(), name = 'platform-top-rated'),
+    path('platform/<int:pk>/trending/', PlatformTrendingView.as_view(), name = 'platform-trending'),
     path('review/', ReviewListView.as_view(),name = 'review-list'), 
     path('review/<int:pk>', ReviewDetailView.as_view(),name = 'review-detail'),  
+    path('review/bulk/', ReviewBulkView.as_view(),name = 'review-bulk'),  
+    path('changes/', ChangeFeedView.as_view(), name = 'change-feed'),
+    path('metrics/', metrics_view, name = 'metrics'),  
 ]
 
 
@@ -1,11 +1,34 @@
+import copy
+import math
 from rest_framework import status 
 from rest_framework import mixins 
 from rest_framework import generics
 from rest_framework.views import APIView 
 from rest_framework.response import Response
+from rest_framework.pagination import _positive_int
+from rest_framework.settings import api_settings
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import transaction
+from django.db.models import Max, OuterRef, Subquery
+from django.http import HttpResponse, StreamingHttpResponse
 from django.shortcuts import get_object_or_404
-from watchlist.models import WatchList, StreamPlatform, Review
-from watchlist.serializers import WatchListSerializer, StreamPlatformSerializer, ReviewSerializer
+from watchlist.models import WatchList, StreamPlatform, Review, RATING_COLUMNS, rating_summary, record_review_change
+from watchlist.serializers import (
+    WatchListSerializer, StreamPlatformSerializer, ReviewSerializer,
+    WatchListValuesSerializer, StreamPlatformValuesSerializer, ReviewValuesSerializer,
+)
+from watchlist.pagination import CreatedCursorPagination, IdCursorPagination, RankedPagination
+from watchlist.renderers import NDJSONRenderer, stream_ndjson, stream_json_array
+from watchlist.cache import (
+    cache_response, bump_versions, if_match_fails, representation_etag,
+    last_deletion, latest, not_modified, not_modified_since, record_deletion, set_last_modified,
+)
+from watchlist.search import search_movie_ids
+from watchlist.changes import change_bounds, read_changes
+from watchlist.jobs import enqueue
+from watchlist.filters import QueryParamFilter, StableOrderingFilter
+from watchlist.metrics import registry
+from watchlist.throttling import page_cost
 
 class WatchListView(APIView):
     """
@@ -15,22 +38,94 @@ class WatchListView(APIView):
 
     Attributes:
         serializer_class: The serializer class for Movie objects.
+        values_serializer_class: Read-only serializer of ``.values()`` rows used
+            for listing, or None to list through ``serializer_class``.
+        pagination_class: The cursor paginator used for the movie list.
+        filter_backends: Backends applying ``filter_fields`` and ``ordering``.
+        stream_chunk_size: Rows fetched per database round trip when streaming.
+        throttle_cost: Throttle cost of a default-sized page; rows nest their reviews.
+        stream_throttle_cost: Throttle cost of streaming the whole filtered catalog.
     """
     serializer_class = WatchListSerializer
+    values_serializer_class = WatchListValuesSerializer
+    pagination_class = CreatedCursorPagination
+    renderer_classes = api_settings.DEFAULT_RENDERER_CLASSES + [NDJSONRenderer]
+    filter_backends = [QueryParamFilter, StableOrderingFilter]
+    filter_fields = ['platform', 'active', 'avg_rating__gte', 'created__gte', 'created__lte']
+    ordering_fields = ['created', 'avg_rating', 'number_rating', 'title']
+    ordering = ('-created', '-id')
+    stream_chunk_size = 2000
+    throttle_cost = 2
+    stream_throttle_cost = 50
 
+    def get_throttle_cost(self, request):
+        if request.method != 'GET':
+            return 1
+        if self.is_streaming(request):
+            return self.stream_throttle_cost
+        return page_cost(request, self.pagination_class(), self.throttle_cost)
+
+    def is_streaming(self, request):
+        return (
+            request.accepted_renderer.format == NDJSONRenderer.format
+            or request.query_params.get('stream') in ('1', 'true')
+        )
+
+    def get_last_modified(self, request):
+        """
+        Latest change to any movie or review, or deletion of one. Maxima over
+        whole tables keep this to index lookups whatever the filters.
+        """
+        return latest(
+            WatchList.objects.aggregate(last=Max('updated'))['last'],
+            Review.objects.aggregate(last=Max('updated'))['last'],
+            last_deletion('watchlist'),
+        )
+
+    @cache_response('watchlist')
     def get(self, request):
         """
-        Retrieve a list of movies.
+        Retrieve a page of movies, newest first.
+
+        Filters from ``filter_fields`` and ``?ordering=`` are applied first. With
+        ``?stream=1`` or an ``application/x-ndjson`` Accept header the whole
+        result is streamed instead, as a JSON array or NDJSON respectively.
 
         Args:
             request: HTTP request object.
 
         Returns:
-            Response: Serialized movie data as a JSON response.
+            Response: Paginated movie data as a JSON response, or a streaming response.
         """
         queryset = WatchList.objects.all()
-        serializer = self.serializer_class(queryset, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        for backend in self.filter_backends:
+            queryset = backend().filter_queryset(request, queryset, self)
+        if request.accepted_renderer.format == NDJSONRenderer.format:
+            return StreamingHttpResponse(
+                stream_ndjson(self.stream_rows(queryset.with_reviews())),
+                content_type=NDJSONRenderer.media_type,
+            )
+        if request.query_params.get('stream') in ('1', 'true'):
+            return StreamingHttpResponse(
+                stream_json_array(self.stream_rows(queryset.with_reviews())),
+                content_type='application/json',
+            )
+        paginator = self.pagination_class()
+        if self.values_serializer_class is not None:
+            page = paginator.paginate_queryset(self.values_serializer_class.values(queryset), request, view=self)
+            serializer = self.values_serializer_class(page, many=True)
+        else:
+            page = paginator.paginate_queryset(queryset.with_reviews(), request, view=self)
+            serializer = self.serializer_class(page, many=True)
+        return paginator.get_paginated_response(serializer.data)
+
+    def stream_rows(self, queryset):
+        """
+        Serialize the queryset one row at a time, fetching it in chunks so
+        memory stays flat regardless of catalog size.
+        """
+        for movie in queryset.iterator(chunk_size=self.stream_chunk_size):
+            yield self.serializer_class(movie).data
 
     def post(self, request):
         """
@@ -45,21 +140,128 @@ class WatchListView(APIView):
         serializer = self.serializer_class(data=request.data)
         if serializer.is_valid():
             serializer.save()
+            bump_versions('watchlist', 'platform')
             return Response(serializer.data, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
     
 
-class MovieDetailView(APIView):
+class ConditionalWriteMixin:
+    """
+    PATCH, ``If-Match`` preconditions and ``Prefer: return=minimal`` for
+    detail views.
+
+    ``get_representation(request, pk)`` returns the data a GET of the object
+    would; its ETag is what ``If-Match`` is checked against, after the row has
+    been locked for the rest of the write's transaction.
+    """
+    def get_representation(self, request, pk):
+        raise NotImplementedError
+
+    def check_precondition(self, request, pk):
+        """
+        Return a 412 response if ``If-Match`` names a stale representation.
+        """
+        if 'HTTP_IF_MATCH' not in request.META:
+            return None
+        model = self.serializer_class.Meta.model
+        get_object_or_404(model.objects.select_for_update().only('pk'), pk=pk)
+        etag = representation_etag(self.get_representation(request, pk), request.accepted_media_type)
+        if if_match_fails(request, etag):
+            return self.precondition_failed(etag)
+        return None
+
+    def precondition_failed(self, etag):
+        return Response(
+            {'detail': "The resource has been modified."},
+            status=status.HTTP_412_PRECONDITION_FAILED, headers={'ETag': etag},
+        )
+
+    def delete_in_batches(self, request, pk, batch_size, fields=('pk',)):
+        """
+        Delete the object after its related rows, which are removed in
+        batches of ``batch_size``.
+
+        ``If-Match`` is checked before the batches. Removing related rows
+        changes the representation, so the transaction deleting the object
+        re-locks its row and checks that ``updated`` is unchanged since then.
+
+        Returns the object, or None if nothing was deleted, and a 412
+        response, or None if the object was deleted. When the object is kept,
+        :meth:`related_deleted` runs in that transaction first.
+        """
+        model = self.serializer_class.Meta.model
+        with transaction.atomic():
+            failed = self.check_precondition(request, pk)
+            if failed is not None:
+                return None, failed
+            instance = get_object_or_404(model.objects.only(*fields, 'updated'), pk=pk)
+        instance.delete_related_in_batches(batch_size)
+        with transaction.atomic():
+            current = get_object_or_404(model.objects.select_for_update().only('pk', 'updated'), pk=pk)
+            if 'HTTP_IF_MATCH' in request.META and current.updated != instance.updated:
+                self.related_deleted(pk)
+                etag = representation_etag(self.get_representation(request, pk), request.accepted_media_type)
+                return instance, self.precondition_failed(etag)
+            current.delete()
+        return instance, None
+
+    def related_deleted(self, pk):
+        """
+        Update state derived from the related rows of an object that
+        survived :meth:`delete_in_batches` without them.
+        """
+
+    def write_response(self, request, pk, data=None):
+        """
+        Respond to a successful update with 204 when the client sent
+        ``Prefer: return=minimal``, and with the fresh representation otherwise.
+        """
+        if prefers_minimal(request):
+            return Response(status=status.HTTP_204_NO_CONTENT, headers={'Preference-Applied': 'return=minimal'})
+        if data is None:
+            data = self.get_representation(request, pk)
+        etag = representation_etag(data, request.accepted_media_type)
+        return Response(data, status=status.HTTP_200_OK, headers={'ETag': etag})
+
+
+def prefers_minimal(request):
+    preferences = request.META.get('HTTP_PREFER', '').replace(';', ',').split(',')
+    return 'return=minimal' in (preference.strip() for preference in preferences)
+
+
+class MovieDetailView(ConditionalWriteMixin, APIView):
     """
     View for retrieving, updating, or deleting a movie.
 
     This view supports retrieving details, updating, and deleting a specific movie.
+    Writes accept ``If-Match`` with the ETag of a previous read and
+    ``Prefer: return=minimal`` to skip re-serializing the movie.
 
     Attributes:
         serializer_class: The serializer class for Movie objects.
+        delete_batch_size: Reviews removed per transaction when deleting a movie.
     """
     serializer_class = WatchListSerializer
+    delete_batch_size = 10000
 
+    def get_representation(self, request, pk):
+        movie = get_object_or_404(WatchList.objects.with_reviews(), pk=pk)
+        return self.serializer_class(movie).data
+
+    def related_deleted(self, pk):
+        # The batches bypass record_review_change.
+        WatchList.objects.filter(pk=pk).recompute_ratings()
+
+    def get_last_modified(self, request, pk):
+        reviews = Review.objects.filter(watchlist=OuterRef('pk')).order_by('-updated')
+        row = (
+            WatchList.objects.filter(pk=pk)
+            .values_list('updated', Subquery(reviews.values('updated')[:1]))
+            .first()
+        )
+        return latest(*row) if row else None
+
+    @cache_response('watchlist')
     def get(self, request, pk):
         """
         Retrieve details of a specific movie.
@@ -71,9 +273,7 @@ class MovieDetailView(APIView):
         Returns:
             Response: Serialized movie data as a JSON response or an error response in case of a not found exception.
         """
-        movie = get_object_or_404(WatchList, pk=pk)
-        serializer = self.serializer_class(movie)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        return Response(self.get_representation(request, pk), status=status.HTTP_200_OK)
 
     def put(self, request, pk):
         """
@@ -86,50 +286,192 @@ class MovieDetailView(APIView):
         Returns:
             Response: Serialized movie data as a JSON response after update or an error response in case of validation failure.
         """
-        movie = get_object_or_404(WatchList, pk=pk)
-        serializer = self.serializer_class(movie, data=request.data)
-        if serializer.is_valid():
-            serializer.save()
-            return Response(serializer.data, status=status.HTTP_200_OK)
-        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        return self.update(request, pk, partial=False)
+
+    def patch(self, request, pk):
+        """
+        Update the given fields of a specific movie, saving only changed columns.
+
+        Args:
+            request: HTTP request object.
+            pk: Primary key of the movie to update.
+
+        Returns:
+            Response: Serialized movie data as a JSON response after update or an error response in case of validation failure.
+        """
+        return self.update(request, pk, partial=True)
+
+    def update(self, request, pk, partial):
+        with transaction.atomic():
+            failed = self.check_precondition(request, pk)
+            if failed is not None:
+                return failed
+            movie = get_object_or_404(WatchList, pk=pk)
+            platform_id = movie.platform_id
+            serializer = self.serializer_class(movie, data=request.data, partial=partial)
+            if not serializer.is_valid():
+                return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+            movie = serializer.save()
+            if movie.platform_id != platform_id:
+                StreamPlatform.objects.filter(pk=platform_id).touch()
+            bump_versions('watchlist', 'platform')
+        return self.write_response(request, pk)
 
     def delete(self, request, pk):
         """
-        Delete a specific movie.
+        Delete a specific movie, removing its reviews in batches first.
 
         Args:
             request: HTTP request object.
             pk: Primary key of the movie to delete.
 
         Returns:
-            Response: A success response indicating the movie has been deleted.
+            Response: A success response indicating the movie has been deleted,
+            or 412 if it changed after the If-Match check; its reviews may be gone then.
         """
-        movie = get_object_or_404(WatchList, pk=pk)
-        movie.delete()
-        return Response(status=status.HTTP_204_NO_CONTENT)       
+        movie, failed = self.delete_in_batches(request, pk, self.delete_batch_size, fields=('pk', 'platform'))
+        if movie is None:
+            return failed
+        StreamPlatform.objects.filter(pk=movie.platform_id).touch()
+        record_deletion('watchlist', 'platform')
+        bump_versions('watchlist', 'platform')
+        return failed or Response(status=status.HTTP_204_NO_CONTENT)       
     
-class StreamPlatformListView(APIView):
+class MovieReviewSummaryView(APIView):
+    """
+    Rating distribution of a movie's reviews.
+
+    Counts come from the movie's rating histogram, which review writes keep up
+    to date, so the summary is a single joined lookup instead of an aggregate
+    over the Review table.
+    """
+
+    @cache_response('watchlist')
+    def get(self, request, pk):
+        """
+        Retrieve the rating summary of a specific movie.
+
+        Args:
+            request: HTTP request object.
+            pk: Primary key of the movie.
+
+        Returns:
+            Response: The review count per rating, the mean rating and the total.
+        """
+        row = get_object_or_404(WatchList.objects.with_rating_histogram().values(*RATING_COLUMNS), pk=pk)
+        return Response(rating_summary(row), status=status.HTTP_200_OK)
+
+
+class WatchListSearchView(APIView):
+    """
+    Full-text search over movie titles and storylines.
+
+    Results are ranked by relevance, with title matches weighted above
+    storyline matches, and paginated with ``page``/``page_size``.
+
+    Attributes:
+        serializer_class: The serializer class for Movie objects.
+        pagination_class: The paginator used for ranked results.
+    """
+    serializer_class = WatchListSerializer
+    pagination_class = RankedPagination
+    throttle_cost = 2
+
+    def get_throttle_cost(self, request):
+        return page_cost(request, self.pagination_class(), self.throttle_cost)
+
+    @cache_response('watchlist')
+    def get(self, request):
+        """
+        Search movies matching the ``q`` query parameter.
+
+        Args:
+            request: HTTP request object.
+
+        Returns:
+            Response: A page of matching movies, best match first.
+        """
+        query = request.query_params.get('q', '')
+        paginator = self.pagination_class()
+        ids = paginator.paginate_ranked(
+            lambda limit, offset: search_movie_ids(query, limit, offset), request
+        )
+        movies = WatchList.objects.with_reviews().in_bulk(ids)
+        serializer = self.serializer_class([movies[pk] for pk in ids if pk in movies], many=True)
+        return paginator.get_paginated_response(serializer.data)
+
+
+class SparsePlatformMixin:
+    """
+    Reads ``?fields=`` and ``?expand=`` for the platform endpoints and only
+    prefetches the watchlist relation when it is part of the response.
+    """
+
+    def get_serializer_context(self, request):
+        def split(param):
+            value = request.query_params.get(param, '')
+            return {name.strip() for name in value.split(',') if name.strip()}
+
+        return {'request': request, 'fields': split('fields'), 'expand': split('expand')}
+
+    def get_queryset(self, context):
+        queryset = StreamPlatform.objects.all()
+        if context['fields'] and 'watchlist' not in context['fields']:
+            return queryset
+        if 'watchlist' in context['expand']:
+            return queryset.with_watchlist('id', 'title', 'active', 'avg_rating')
+        return queryset.with_watchlist()
+
+
+class StreamPlatformListView(SparsePlatformMixin, APIView):
     """
     API endpoint for listing and creating stream platforms.
 
     GET:
-    Retrieve a list of all stream platforms.
+    Retrieve a list of all stream platforms. ``?fields=`` limits the
+    returned fields and ``?expand=watchlist`` nests movie summaries
+    instead of links.
 
     POST:
     Create a new stream platform.
     """
     serializer_class = StreamPlatformSerializer
+    values_serializer_class = StreamPlatformValuesSerializer
+    pagination_class = IdCursorPagination
+
+    def get_throttle_cost(self, request):
+        if request.method != 'GET':
+            return 1
+        return page_cost(request, self.pagination_class())
+
+    def get_last_modified(self, request):
+        """
+        Latest change to any platform or movie, or deletion of one.
+        """
+        return latest(
+            StreamPlatform.objects.aggregate(last=Max('updated'))['last'],
+            WatchList.objects.aggregate(last=Max('updated'))['last'],
+            last_deletion('platform'),
+        )
 
+    @cache_response('platform', 'watchlist')
     def get(self, request):
         """
-        Retrieve a list of all stream platforms.
+        Retrieve a page of stream platforms.
 
         Returns:
-            Response: A JSON response containing a list of stream platforms.
+            Response: A JSON response containing a paginated list of stream platforms.
         """
-        queryset = StreamPlatform.objects.all()
-        serializer = self.serializer_class(queryset, many=True, context={'request': request})
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        context = self.get_serializer_context(request)
+        paginator = self.pagination_class()
+        if self.values_serializer_class is not None and not (context['fields'] or context['expand']):
+            queryset = self.values_serializer_class.values(StreamPlatform.objects.all())
+            page = paginator.paginate_queryset(queryset, request, view=self)
+            serializer = self.values_serializer_class(page, many=True, context=context)
+        else:
+            page = paginator.paginate_queryset(self.get_queryset(context), request, view=self)
+            serializer = self.serializer_class(page, many=True, context=context)
+        return paginator.get_paginated_response(serializer.data)
 
     def post(self, request):
         """
@@ -144,24 +486,45 @@ class StreamPlatformListView(APIView):
         serializer = self.serializer_class(data=request.data)
         if serializer.is_valid():
             serializer.save()
+            bump_versions('platform')
             return Response(serializer.data, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
-class StreamPlatformDetailView(APIView):
+class StreamPlatformDetailView(SparsePlatformMixin, ConditionalWriteMixin, APIView):
     """
     API endpoint for retrieving, updating, and deleting a specific stream platform.
 
     GET:
-    Retrieve a specific stream platform.
+    Retrieve a specific stream platform, accepting ``?fields=`` and ``?expand=``.
 
-    PUT:
-    Update a specific stream platform.
+    PUT, PATCH:
+    Update a specific stream platform, fully or partially.
 
     DELETE:
     Delete a specific stream platform.
+
+    Writes accept ``If-Match`` and ``Prefer: return=minimal``. Deleting
+    removes the platform's movies ``delete_batch_size`` at a time, each batch
+    in its own transaction, so memory and lock times stay bounded.
     """
     serializer_class = StreamPlatformSerializer
+    delete_batch_size = 1000
+
+    def get_representation(self, request, pk):
+        context = self.get_serializer_context(request)
+        platform = get_object_or_404(self.get_queryset(context), pk=pk)
+        return self.serializer_class(platform, context=context).data
+
+    def get_last_modified(self, request, pk):
+        movies = WatchList.objects.filter(platform=OuterRef('pk')).order_by('-updated')
+        row = (
+            StreamPlatform.objects.filter(pk=pk)
+            .values_list('updated', Subquery(movies.values('updated')[:1]))
+            .first()
+        )
+        return latest(*row) if row else None
 
+    @cache_response('platform', 'watchlist')
     def get(self, request, pk):
         """
         Retrieve a specific stream platform.
@@ -173,9 +536,7 @@ class StreamPlatformDetailView(APIView):
         Returns:
             Response: A JSON response containing the stream platform details.
         """
-        platform = get_object_or_404(StreamPlatform, pk=pk)
-        serializer = self.serializer_class(platform,context={'request': request})
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        return Response(self.get_representation(request, pk), status=status.HTTP_200_OK)
 
     def put(self, request, pk):
         """
@@ -188,12 +549,33 @@ class StreamPlatformDetailView(APIView):
         Returns:
             Response: A JSON response with the updated stream platform or validation errors.
         """
-        platform = get_object_or_404(StreamPlatform, pk=pk)
-        serializer = self.serializer_class(platform,data=request.data)
-        if serializer.is_valid():
+        return self.update(request, pk, partial=False)
+
+    def patch(self, request, pk):
+        """
+        Update the given fields of a specific stream platform.
+
+        Args:
+            request: The HTTP request object.
+            pk: The primary key of the stream platform.
+
+        Returns:
+            Response: A JSON response with the updated stream platform or validation errors.
+        """
+        return self.update(request, pk, partial=True)
+
+    def update(self, request, pk, partial):
+        with transaction.atomic():
+            failed = self.check_precondition(request, pk)
+            if failed is not None:
+                return failed
+            platform = get_object_or_404(StreamPlatform, pk=pk)
+            serializer = self.serializer_class(platform, data=request.data, partial=partial)
+            if not serializer.is_valid():
+                return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
             serializer.save()
-            return Response(serializer.data, status=status.HTTP_200_OK)
-        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+            bump_versions('platform')
+        return self.write_response(request, pk)
 
     def delete(self, request, pk):
         """
@@ -204,11 +586,107 @@ class StreamPlatformDetailView(APIView):
             pk: The primary key of the stream platform.
 
         Returns:
-            Response: An empty JSON response with a 204 No Content status.
+            Response: An empty JSON response with a 204 No Content status, or 412 if
+            the platform changed after the If-Match check; its movies may be gone then.
+        """
+        platform, failed = self.delete_in_batches(request, pk, self.delete_batch_size)
+        if platform is None:
+            return failed
+        record_deletion('watchlist', 'platform')
+        bump_versions('watchlist', 'platform')
+        return failed or Response(status=status.HTTP_204_NO_CONTENT)
+
+class StreamPlatformSummaryView(APIView):
+    """
+    Rating distribution of the reviews of every movie on a platform, summed
+    from the movies' rating histograms in one grouped query.
+    """
+
+    @cache_response('watchlist')
+    def get(self, request, pk):
         """
-        platform = get_object_or_404(StreamPlatform, pk=pk)
-        platform.delete()
-        return Response(status=status.HTTP_204_NO_CONTENT)
+        Retrieve the rating summary of a specific stream platform.
+
+        Args:
+            request: The HTTP request object.
+            pk: The primary key of the stream platform.
+
+        Returns:
+            Response: The review count per rating, the mean rating and the total.
+        """
+        queryset = StreamPlatform.objects.with_rating_histogram().values(*RATING_COLUMNS)
+        row = get_object_or_404(queryset, pk=pk)
+        return Response(rating_summary(row), status=status.HTTP_200_OK)
+
+
+class PlatformLeaderboardView(APIView):
+    """
+    Base view for the top movies of a platform by a materialized ranking
+    column of the movie table.
+
+    Reads walk a ``(platform, <column>, id)`` index in order, skipping
+    inactive movies, so their cost grows with ``?limit=`` rather than with
+    the size of the catalog.
+
+    Attributes:
+        ordering: Order of the leaderboard, best first.
+        default_limit: Number of movies returned without ``?limit=``.
+        max_limit: Largest accepted ``?limit=``.
+    """
+    ordering = ()
+    default_limit = 10
+    max_limit = 100
+    fields = ('id', 'title', 'avg_rating', 'number_rating', 'trending')
+
+    def get_queryset(self, pk):
+        return WatchList.objects.filter(platform=pk, active=True)
+
+    def get_limit(self, request):
+        try:
+            return _positive_int(request.query_params['limit'], strict=True, cutoff=self.max_limit)
+        except (KeyError, ValueError):
+            return self.default_limit
+
+    @cache_response('watchlist')
+    def get(self, request, pk):
+        """
+        Retrieve the leaderboard of a specific stream platform.
+
+        Args:
+            request: The HTTP request object.
+            pk: The primary key of the stream platform.
+
+        Returns:
+            Response: The ranked movies of the platform.
+        """
+        get_object_or_404(StreamPlatform.objects.only('pk'), pk=pk)
+        movies = self.get_queryset(pk).order_by(*self.ordering).values(*self.fields)
+        return Response({'results': list(movies[:self.get_limit(request)])}, status=status.HTTP_200_OK)
+
+
+class PlatformTopRatedView(PlatformLeaderboardView):
+    """
+    Highest rated active movies of a platform.
+    """
+    ordering = ('-avg_rating', '-id')
+
+    def get_queryset(self, pk):
+        return super().get_queryset(pk).filter(avg_rating__gt=0)
+
+
+class PlatformTrendingView(PlatformLeaderboardView):
+    """
+    Active movies of a platform with the most reviews in the last
+    ``WATCHLIST_TRENDING_DAYS`` days.
+
+    Counts are kept up to date by review writes; ``rebuild_leaderboards``
+    drops reviews that have left the window and should run periodically.
+    """
+    ordering = ('-trending', '-id')
+
+    def get_queryset(self, pk):
+        return super().get_queryset(pk).filter(trending__gt=0)
+
 
 class ReviewListView(
     mixins.ListModelMixin,
@@ -218,19 +696,43 @@ class ReviewListView(
     """
     A view for listing and creating review objects.
 
-    Supports GET (list) and POST (create) requests.
+    Supports GET (list) and POST (create) requests. The list can be
+    filtered by the lookups in ``filter_fields`` and sorted with ``?ordering=``.
     """
     queryset = Review.objects.all()
     serializer_class = ReviewSerializer
+    values_serializer_class = ReviewValuesSerializer
+    pagination_class = CreatedCursorPagination
+    filter_backends = [QueryParamFilter, StableOrderingFilter]
+    filter_fields = ['watchlist', 'active', 'rating', 'rating__gte', 'rating__lte', 'created__gte', 'created__lte']
+    ordering_fields = ['created', 'rating', 'updated']
+    ordering = ('-created', '-id')
+
+    def get_throttle_cost(self, request):
+        if request.method != 'GET':
+            return 1
+        return page_cost(request, self.pagination_class())
+
+    def get_last_modified(self, request):
+        """
+        Latest change to any review, or deletion of one.
+        """
+        return latest(
+            Review.objects.aggregate(last=Max('updated'))['last'],
+            last_deletion('watchlist'),
+        )
 
     def get(self, request, *args, **kwargs):
         """
         Handle GET request to list reviews.
 
         :param request: The incoming GET request.
-        :return: List of review objects.
+        :return: List of review objects, or 304 if unchanged since ``If-Modified-Since``.
         """
-        return self.list(request, *args, **kwargs)
+        last_modified = self.get_last_modified(request)
+        if not_modified_since(request, last_modified):
+            return not_modified(last_modified=last_modified)
+        return set_last_modified(self.list(request, *args, **kwargs), last_modified)
 
     def post(self, request, *args, **kwargs):
         """
@@ -241,7 +743,28 @@ class ReviewListView(
         """
         return self.create(request, *args, **kwargs)
 
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.request.method == 'GET' and self.values_serializer_class is not None:
+            return self.values_serializer_class.values(queryset)
+        return queryset
+
+    def get_serializer_class(self):
+        if self.request.method == 'GET' and self.values_serializer_class is not None:
+            return self.values_serializer_class
+        return super().get_serializer_class()
+
+    def perform_create(self, serializer):
+        """
+        Save the review and fold its rating into the movie's aggregates.
+        """
+        with transaction.atomic():
+            review = serializer.save()
+            bump_versions('watchlist')
+            record_review_change(new=(review.watchlist_id, review.rating), created=review.created)
+
 class ReviewDetailView(
+    ConditionalWriteMixin,
     mixins.RetrieveModelMixin,
     mixins.UpdateModelMixin,
     mixins.DestroyModelMixin,
@@ -250,19 +773,28 @@ class ReviewDetailView(
     """
     A view for retrieving, updating, and deleting a single review object.
 
-    Supports GET (retrieve), PUT (update), and DELETE (delete) requests.
+    Supports GET (retrieve), PUT and PATCH (update), and DELETE (delete)
+    requests. Writes accept ``If-Match`` and ``Prefer: return=minimal``.
     """
     queryset = Review.objects.all()
     serializer_class = ReviewSerializer
 
+    def get_representation(self, request, pk):
+        return self.serializer_class(get_object_or_404(Review, pk=pk)).data
+
     def get(self, request, *args, **kwargs):
         """
         Handle GET request to retrieve a single review.
 
         :param request: The incoming GET request.
-        :return: Retrieved review object.
+        :return: Retrieved review object with its ETag, or 304 if unchanged since ``If-Modified-Since``.
         """
-        return self.retrieve(request, *args, **kwargs)
+        review = self.get_object()
+        if not_modified_since(request, review.updated):
+            return not_modified(last_modified=review.updated)
+        data = self.get_serializer(review).data
+        response = Response(data, headers={'ETag': representation_etag(data, request.accepted_media_type)})
+        return set_last_modified(response, review.updated)
 
     def put(self, request, *args, **kwargs):
         """
@@ -273,6 +805,15 @@ class ReviewDetailView(
         """
         return self.update(request, *args, **kwargs)
 
+    def patch(self, request, *args, **kwargs):
+        """
+        Handle PATCH request to update the given fields of a review.
+
+        :param request: The incoming PATCH request.
+        :return: Updated review object.
+        """
+        return self.partial_update(request, *args, **kwargs)
+
     def delete(self, request, *args, **kwargs):
         """
         Handle DELETE request to delete a review.
@@ -280,4 +821,257 @@ class ReviewDetailView(
         :param request: The incoming DELETE request.
         :return: HTTP 204 No Content on successful deletion.
         """
-        return self.destroy(request, *args, **kwargs)
\ No newline at end of file
+        return self.destroy(request, *args, **kwargs)
+
+    def update(self, request, *args, **kwargs):
+        with transaction.atomic():
+            failed = self.check_precondition(request, kwargs['pk'])
+            if failed is not None:
+                return failed
+            response = super().update(request, *args, **kwargs)
+        return self.write_response(request, kwargs['pk'], response.data)
+
+    def destroy(self, request, *args, **kwargs):
+        with transaction.atomic():
+            failed = self.check_precondition(request, kwargs['pk'])
+            if failed is not None:
+                return failed
+            return super().destroy(request, *args, **kwargs)
+
+    def perform_update(self, serializer):
+        """
+        Save the review and move its rating between movie aggregates if needed.
+        """
+        old = (serializer.instance.watchlist_id, serializer.instance.rating)
+        with transaction.atomic():
+            review = serializer.save()
+            bump_versions('watchlist')
+            record_review_change(old=old, new=(review.watchlist_id, review.rating), created=review.created)
+
+    def perform_destroy(self, instance):
+        """
+        Delete the review and remove its rating from the movie's aggregates.
+        """
+        with transaction.atomic():
+            instance.delete()
+            record_deletion('watchlist')
+            bump_versions('watchlist')
+            record_review_change(old=(instance.watchlist_id, instance.rating), created=instance.created)
+
+def parse_pks(model, values):
+    """
+    Split payload ids into parsed primary keys of ``model`` and the values
+    that are not valid primary keys.
+    """
+    pks, invalid = [], []
+    pk_field = model._meta.pk
+    for value in values:
+        try:
+            if isinstance(value, bool):
+                raise DjangoValidationError("Booleans are not ids.")
+            pk = pk_field.to_python(value)
+        except DjangoValidationError:
+            invalid.append(value)
+            continue
+        if pk is None:
+            invalid.append(value)
+        else:
+            pks.append(pk)
+    return pks, invalid
+
+
+class BulkWriteView(APIView):
+    """
+    Base view for bulk writes of a list payload in a single transaction.
+
+    POST creates every item, PUT updates every item by its ``id`` and DELETE
+    removes the objects listed in ``{"ids": [...]}``. Validation is
+    all-or-nothing: if any item is invalid nothing is written and the
+    response holds one error object per item, in payload order.
+
+    Attributes:
+        serializer_class: The serializer class whose list serializer performs the writes.
+        throttle_items_per_cost: Items written per unit of throttle cost. A payload
+            may hold at most this many items per unit of the write rate (1200 at the
+            default 120/min); larger ones get 413 and must be split.
+        deletion_namespaces: Cache namespaces whose lists a bulk delete changes.
+    """
+    serializer_class = None
+    throttle_items_per_cost = 10
+    deletion_namespaces = ()
+
+    def get_throttle_cost(self, request):
+        items = request.data.get('ids') if isinstance(request.data, dict) else request.data
+        count = len(items) if isinstance(items, list) else 0
+        return max(1, math.ceil(count / self.throttle_items_per_cost))
+
+    def get_throttle_budget_detail(self, budget):
+        return f"Send at most {budget * self.throttle_items_per_cost} items per request."
+
+    def after_write(self, objs):
+        """
+        Hook for side effects of a bulk write, run inside the transaction.
+        For updates ``objs`` holds the objects both before and after the write.
+        """
+
+    def post(self, request):
+        """
+        Create all items of the payload.
+
+        Args:
+            request: HTTP request object with a list payload.
+
+        Returns:
+            Response: The ids of the created objects, or per-item validation errors.
+        """
+        serializer = self.serializer_class(data=request.data, many=True)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        with transaction.atomic():
+            objs = serializer.save()
+            self.after_write(objs)
+        return Response({'ids': [obj.pk for obj in objs]}, status=status.HTTP_201_CREATED)
+
+    def put(self, request):
+        """
+        Update all items of the payload, matched by their ``id``.
+
+        Args:
+            request: HTTP request object with a list payload.
+
+        Returns:
+            Response: The ids of the updated objects, or per-item validation errors.
+        """
+        model = self.serializer_class.Meta.model
+        ids = []
+        if isinstance(request.data, list):
+            # Unparseable ids match no object; the serializer reports them per item.
+            ids, _ = parse_pks(model, [item['id'] for item in request.data if isinstance(item, dict) and 'id' in item])
+        with transaction.atomic():
+            instances = model.objects.select_for_update().in_bulk(ids)
+            serializer = self.serializer_class(instances, data=request.data, many=True)
+            if not serializer.is_valid():
+                return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+            previous = [copy.copy(obj) for obj in instances.values()]
+            objs = serializer.save()
+            self.after_write(previous + objs)
+        return Response({'ids': [obj.pk for obj in objs]}, status=status.HTTP_200_OK)
+
+    def delete(self, request):
+        """
+        Delete the objects listed in ``ids``.
+
+        Args:
+            request: HTTP request object with an ``{"ids": [...]}`` payload.
+
+        Returns:
+            Response: The number of deleted objects with a 200 status.
+        """
+        ids = request.data.get('ids') if isinstance(request.data, dict) else None
+        if not isinstance(ids, list):
+            return Response({'ids': ["Expected a list of ids."]}, status=status.HTTP_400_BAD_REQUEST)
+        model = self.serializer_class.Meta.model
+        ids, invalid = parse_pks(model, ids)
+        if invalid:
+            return Response({'ids': [f"Invalid id: {value!r}." for value in invalid]},
+                            status=status.HTTP_400_BAD_REQUEST)
+        with transaction.atomic():
+            objs = list(model.objects.filter(pk__in=ids))
+            model.objects.filter(pk__in=[obj.pk for obj in objs]).delete()
+            self.after_write(objs)
+            record_deletion(*self.deletion_namespaces)
+        return Response({'deleted': len(objs)}, status=status.HTTP_200_OK)
+
+
+class WatchListBulkView(BulkWriteView):
+    """
+    Bulk create, update and delete of movies.
+    """
+    serializer_class = WatchListSerializer
+    deletion_namespaces = ('watchlist', 'platform')
+
+    def after_write(self, objs):
+        # Covers the platforms that movies were moved off or deleted from.
+        StreamPlatform.objects.filter(pk__in={movie.platform_id for movie in objs}).touch()
+        bump_versions('watchlist', 'platform')
+
+
+class ReviewBulkView(BulkWriteView):
+    """
+    Bulk create, update and delete of reviews.
+
+    Rating aggregates of every affected movie are rebuilt in the background
+    by a ``refresh_ratings`` job, coalesced per movie, so the response does
+    not wait for them.
+    """
+    serializer_class = ReviewSerializer
+    deletion_namespaces = ('watchlist',)
+
+    def after_write(self, objs):
+        movie_ids = {review.watchlist_id for review in objs}
+        # The movies change now; their aggregates catch up with the job.
+        WatchList.objects.filter(pk__in=movie_ids).touch()
+        enqueue('refresh_ratings', movie_ids)
+        bump_versions('watchlist')
+
+
+class ChangeFeedView(APIView):
+    """
+    Feed of created, updated and deleted movies, reviews and platforms since
+    a cursor, so replicas of the catalog only fetch what changed.
+
+    A replica reads the ``X-Changes-Cursor`` header once without ``since``,
+    copies the catalog, and then polls with ``?since=<cursor>``, passing the
+    header of each response to the next poll. Changes are streamed as a JSON
+    array, or as NDJSON for an ``application/x-ndjson`` Accept header.
+
+    Attributes:
+        batch_size: Change log rows read per database round trip.
+        throttle_cost: Throttle cost of one poll.
+    """
+    renderer_classes = api_settings.DEFAULT_RENDERER_CLASSES + [NDJSONRenderer]
+    cursor_header = 'X-Changes-Cursor'
+    batch_size = 1000
+    throttle_cost = 10
+
+    def get(self, request):
+        """
+        Stream the changes after ``?since=``, oldest first.
+
+        Args:
+            request: HTTP request object.
+
+        Returns:
+            StreamingHttpResponse: The changes, with the next cursor in ``X-Changes-Cursor``.
+            Response: 400 for a malformed cursor, 410 for one older than the retained log.
+        """
+        oldest, newest = change_bounds()
+        since = request.query_params.get('since')
+        if since is None:
+            changes = iter(())
+            cursor = newest or 0
+        else:
+            try:
+                since = _positive_int(since)
+            except ValueError:
+                return Response({'since': ["Expected a cursor from the X-Changes-Cursor header."]},
+                                status=status.HTTP_400_BAD_REQUEST)
+            if oldest is not None and since < oldest - 1:
+                return Response({'detail': "The cursor is older than the retained changes; copy the catalog again."},
+                                status=status.HTTP_410_GONE)
+            cursor = max(since, newest or 0)
+            changes = read_changes(since, cursor, self.batch_size)
+        if request.accepted_renderer.format == NDJSONRenderer.format:
+            response = StreamingHttpResponse(stream_ndjson(changes), content_type=NDJSONRenderer.media_type)
+        else:
+            response = StreamingHttpResponse(stream_json_array(changes), content_type='application/json')
+        response[self.cursor_header] = str(cursor)
+        return response
+
+
+def metrics_view(request):
+    """
+    Expose request metrics collected by PerformanceMiddleware in the
+    Prometheus text format.
+    """
+    return HttpResponse(registry.render(), content_type='text/plain; version=0.0.4; charset=utf-8')